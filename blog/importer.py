@@ -0,0 +1,237 @@
+"""
+Bulk import of Markdown posts with front matter.
+
+Files are streamed from disk and written in batches: each batch resolves its
+categories and tags with one lookup-or-create per model, inserts its posts
+and tag links with ``bulk_create`` and commits, so memory stays flat however
+many files there are. ``bulk_create`` skips ``Post.save`` and signals, so
+the importer does their work once per batch: slug and excerpt defaults, the
+search index, the denormalized post counts and the feeds and sitemap.
+
+Front matter is a block of ``key: value`` lines between ``---`` fences::
+
+    ---
+    title: Keyset pagination in Django
+    tags: [django, performance]
+    category: Engineering
+    status: published
+    published_at: 2024-03-01T09:30:00Z
+    ---
+    Body in Markdown...
+
+``tags`` may also be comma separated or a ``- item`` list. ``slug`` and
+``excerpt`` are optional.
+"""
+import datetime
+import os
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.text import slugify
+
+from core.response_cache import response_cache
+from . import post_counts, search, syndication
+from .models import Category, Post, Tag
+
+STATUSES = {value for value, _ in Post.STATUS_CHOICES}
+
+
+class InvalidPostFile(ValueError):
+    pass
+
+
+@dataclass
+class ImportResult:
+    imported: int = 0
+    skipped: int = 0
+    errors: list = field(default_factory=list)
+
+
+def markdown_files(root):
+    """Yield ``.md`` paths under ``root`` in a stable order, one directory at a time."""
+    with os.scandir(root) as entries:
+        entries = sorted(entries, key=lambda entry: entry.name)
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            yield from markdown_files(entry.path)
+        elif entry.name.endswith('.md') and entry.is_file():
+            yield entry.path
+
+
+def _unquote(value):
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in '"\'':
+        return value[1:-1]
+    return value
+
+
+def parse_front_matter(text):
+    """Split ``text`` into ``(metadata, body)``."""
+    lines = text.splitlines()
+    if not lines or lines[0].strip() != '---':
+        raise InvalidPostFile("missing front matter")
+    meta = {}
+    key = None
+    for number, line in enumerate(lines[1:], start=1):
+        stripped = line.strip()
+        if stripped == '---':
+            return meta, '\n'.join(lines[number + 1:]).strip('\n')
+        if not stripped or stripped.startswith('#'):
+            continue
+        if stripped.startswith('- ') and key is not None:
+            meta.setdefault(key, [])
+            if not isinstance(meta[key], list):
+                raise InvalidPostFile(f"line {number + 1}: '{key}' mixes a value and a list")
+            meta[key].append(_unquote(stripped[2:]))
+            continue
+        if ':' not in line:
+            raise InvalidPostFile(f"line {number + 1}: expected 'key: value'")
+        key, value = line.split(':', 1)
+        key, value = key.strip().lower(), value.strip()
+        if value.startswith('[') and value.endswith(']'):
+            meta[key] = [_unquote(item) for item in value[1:-1].split(',') if item.strip()]
+        elif value:
+            meta[key] = _unquote(value)
+    raise InvalidPostFile("unterminated front matter")
+
+
+def parse_published_at(value):
+    published_at = parse_datetime(value)
+    if published_at is None:
+        day = parse_date(value)
+        if day is None:
+            raise InvalidPostFile(f"invalid published_at '{value}'")
+        published_at = datetime.datetime.combine(day, datetime.time())
+    if timezone.is_naive(published_at):
+        published_at = timezone.make_aware(published_at)
+    return published_at
+
+
+def build_post(path, author):
+    """Read one file into an unsaved Post plus its tag and category names."""
+    with open(path, encoding='utf-8') as handle:
+        meta, body = parse_front_matter(handle.read())
+    title = meta.get('title')
+    if not title or isinstance(title, list):
+        raise InvalidPostFile("'title' is required")
+    status = meta.get('status', 'draft')
+    if status not in STATUSES:
+        raise InvalidPostFile(f"unknown status '{status}'")
+    tags = meta.get('tags', [])
+    if isinstance(tags, str):
+        tags = [tag.strip() for tag in tags.split(',')]
+    tags = [tag for tag in dict.fromkeys(tags) if tag and slugify(tag)]
+    if any(len(tag) > Tag._meta.get_field('name').max_length for tag in tags):
+        raise InvalidPostFile("tag name too long")
+    category = meta.get('category') or None
+    if category and len(category) > Category._meta.get_field('name').max_length:
+        raise InvalidPostFile("category name too long")
+
+    post = Post(
+        author=author,
+        title=title[:Post._meta.get_field('title').max_length],
+        slug=slugify(meta.get('slug') or title)[:Post._meta.get_field('slug').max_length],
+        excerpt=meta.get('excerpt', ''),
+        content=body,
+        status=status,
+        published_at=parse_published_at(meta['published_at']) if meta.get('published_at') else None,
+    )
+    if not post.slug:
+        raise InvalidPostFile("title does not produce a slug")
+    # What Post.save would have filled in.
+    if not post.excerpt and post.content:
+        post.excerpt = post.content[:297] + '...'
+    return post, tags, category
+
+
+def lookup_or_create(model, names):
+    """Return ``{name: instance}``, creating missing rows in one ``bulk_create``."""
+    names = set(names)
+    if not names:
+        return {}
+    found = {obj.name: obj for obj in model.objects.filter(name__in=names)}
+    missing = names - found.keys()
+    if missing:
+        model.objects.bulk_create(
+            [model(name=name, slug=slugify(name)) for name in missing], ignore_conflicts=True
+        )
+        found.update((obj.name, obj) for obj in model.objects.filter(name__in=missing))
+        # A different name may already own the slug ("C++" and "C"): reuse that row.
+        unresolved = defaultdict(list)
+        for name in missing - found.keys():
+            unresolved[slugify(name)].append(name)
+        for obj in model.objects.filter(slug__in=unresolved):
+            found.update((name, obj) for name in unresolved[obj.slug])
+    return found
+
+
+def import_batch(batch):
+    """Write ``[(post, tag names, category name)]`` in one transaction; return the post count."""
+    slugs = [post.slug for post, _, _ in batch]
+    existing = set(Post.objects.filter(slug__in=slugs).values_list('slug', flat=True))
+    rows = []
+    for row in batch:
+        if row[0].slug not in existing:
+            existing.add(row[0].slug)
+            rows.append(row)
+    if not rows:
+        return 0
+
+    with transaction.atomic():
+        categories = lookup_or_create(Category, {category for _, _, category in rows if category})
+        tags = lookup_or_create(Tag, {tag for _, names, _ in rows for tag in names})
+        for post, _, category in rows:
+            post.category = categories.get(category)
+        posts = Post.objects.bulk_create([post for post, _, _ in rows])
+        Post.tags.through.objects.bulk_create(
+            Post.tags.through(post_id=post.pk, tag_id=tag_id)
+            for post, names, _ in rows
+            for tag_id in {tags[name].pk for name in names if name in tags}
+        )
+        if search.is_available():
+            search.index_posts(post.pk for post in posts)
+        # Same adjustment the post_save/m2m_changed receivers would make, grouped by delta.
+        tag_deltas, category_deltas = Counter(), Counter()
+        for post, names, _ in rows:
+            if post.status == post_counts.PUBLISHED:
+                tag_deltas.update({tags[name].pk for name in names if name in tags})
+                if post.category_id:
+                    category_deltas[post.category_id] += 1
+        for model, deltas in ((Tag, tag_deltas), (Category, category_deltas)):
+            by_delta = defaultdict(list)
+            for pk, delta in deltas.items():
+                by_delta[delta].append(pk)
+            for delta, ids in by_delta.items():
+                post_counts.adjust(model, ids, delta)
+        syndication.posts_changed(post.pk for post in posts)
+    return len(posts)
+
+
+def import_directory(root, author, batch_size=500, progress=None):
+    result = ImportResult()
+    batch = []
+
+    def flush():
+        imported = import_batch(batch)
+        result.imported += imported
+        result.skipped += len(batch) - imported
+        batch.clear()
+        if progress is not None:
+            progress(result)
+
+    for path in markdown_files(root):
+        try:
+            batch.append(build_post(path, author))
+        except (InvalidPostFile, UnicodeDecodeError) as e:
+            result.errors.append((path, str(e)))
+            continue
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+
+    response_cache.purge('post-list', 'tag-list', 'category-list')
+    return result
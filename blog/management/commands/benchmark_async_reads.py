@@ -0,0 +1,79 @@
+import asyncio
+
+from django.core.management.base import BaseCommand
+from django.test import AsyncClient, Client, override_settings
+from django.urls import reverse
+
+from blog.view_counter import view_counter
+from core.benchmark import benchmark_database, run_async_concurrently, run_concurrently, seed_posts
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare throughput and tail latency of the public read endpoints "
+        "under WSGI worker threads, ASGI with the sync DRF views, and ASGI "
+        "with the async read views."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8, help="WSGI worker threads")
+        parser.add_argument('--concurrency', type=int, default=64, help="Concurrent ASGI requests")
+        parser.add_argument('--requests', type=int, default=2000, help="Total requests per run")
+        parser.add_argument('--posts', type=int, default=200)
+        parser.add_argument(
+            '--response-cache', action='store_true',
+            help="Leave the response cache on (by default every request reaches the database)",
+        )
+
+    def handle(self, *args, **options):
+        total = options['requests']
+        threads = options['threads']
+        concurrency = options['concurrency']
+        cache = {} if options['response_cache'] else {'RESPONSE_CACHE': {'ENABLED': False}}
+
+        with benchmark_database(), override_settings(BLOG_VIEW_COUNT_FLUSH_INTERVAL=3600, **cache):
+            urls = self.create_data(options['posts'])
+
+            def url(worker, iteration):
+                return urls[(worker * 7 + iteration) % len(urls)]
+
+            def check(response):
+                if response.status_code != 200:
+                    raise RuntimeError(f"HTTP {response.status_code}")
+
+            clients = [Client() for _ in range(threads)]
+
+            def wsgi_fetch(worker, iteration):
+                check(clients[worker].get(url(worker, iteration)))
+
+            async_client = AsyncClient()
+
+            async def asgi_fetch(worker, iteration):
+                check(await async_client.get(url(worker, iteration)))
+
+            runs = [
+                ('wsgi, sync views', 'portfolio.urls', None),
+                ('asgi, sync views', 'portfolio.urls', asgi_fetch),
+                ('asgi, async views', 'portfolio.urls_asgi', asgi_fetch),
+            ]
+            for label, urlconf, fetch in runs:
+                view_counter.clear()
+                with override_settings(ROOT_URLCONF=urlconf):
+                    if fetch is None:
+                        result = run_concurrently(wsgi_fetch, threads, max(1, total // threads))
+                    else:
+                        result = asyncio.run(
+                            run_async_concurrently(fetch, concurrency, max(1, total // concurrency))
+                        )
+                self.stdout.write(
+                    f"{label:>17}: {result['throughput']:8.1f} req/s  "
+                    f"p50 {result['p50_ms']:7.2f} ms  p95 {result['p95_ms']:7.2f} ms  "
+                    f"p99 {result['p99_ms']:7.2f} ms  errors {result['errors']}"
+                )
+            view_counter.clear()
+
+    def create_data(self, count):
+        slugs = seed_posts(count).values_list('slug', flat=True)[:20]
+        urls = [reverse('post-list-create'), reverse('site-settings'), reverse('skill-list')]
+        urls += [reverse('post-detail', kwargs={'slug': slug}) for slug in slugs]
+        return urls
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from blog.models import Post
+from blog.view_counter import view_counter
+from core.benchmark import benchmark_database, run_concurrently, seed_posts
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark GET throughput on the post detail endpoint with per-request "
+        "view-count writes versus the buffered write-behind counter."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--requests', type=int, default=200, help="Requests per thread")
+        parser.add_argument('--posts', type=int, default=20)
+
+    def handle(self, *args, **options):
+        threads = options['threads']
+        iterations = options['requests']
+
+        with benchmark_database():
+            # Seed extra posts: some synthetic ones are drafts.
+            published = seed_posts(options['posts'] * 2)
+            slugs = list(published.values_list('slug', flat=True)[:options['posts']])
+            urls = [reverse('post-detail', kwargs={'slug': slug}) for slug in slugs]
+            clients = [Client() for _ in range(threads)]
+
+            def fetch(worker, iteration):
+                response = clients[worker].get(urls[(worker + iteration) % len(urls)])
+                if response.status_code != 200:
+                    raise RuntimeError(f"HTTP {response.status_code}")
+
+            for label, buffered in (('write-through', False), ('buffered', True)):
+                Post.objects.update(views_count=0)
+                view_counter.clear()
+                with override_settings(BLOG_VIEW_COUNT_BUFFERED=buffered):
+                    result = run_concurrently(fetch, threads, iterations)
+                view_counter.flush()
+                counted = sum(Post.objects.values_list('views_count', flat=True))
+                self.stdout.write(
+                    f"{label:>13}: {result['throughput']:8.1f} req/s  "
+                    f"p50 {result['p50_ms']:6.2f} ms  p99 {result['p99_ms']:6.2f} ms  "
+                    f"errors {result['errors']}  views counted {counted}/{result['requests']}"
+                )
@@ -0,0 +1,67 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from blog.models import Category, Post, Tag
+from blog.serializers import PostListSerializer
+from core.benchmark import benchmark_database
+from core.renderers import ORJSONRenderer, MessagePackRenderer, msgpack
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = "Compare renderer throughput on a large PostListSerializer payload."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=1000)
+        parser.add_argument('--repeat', type=int, default=50)
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            data = self.build_payload(options['posts'])
+
+        renderers = [('drf json', JSONRenderer()), ('orjson', ORJSONRenderer())]
+        if msgpack is not None:
+            renderers.append(('msgpack', MessagePackRenderer()))
+
+        self.stdout.write(f"Payload: {options['posts']} posts, {options['repeat']} renders each")
+        baseline = None
+        for label, renderer in renderers:
+            renderer.render(data)
+            started = time.perf_counter()
+            for _ in range(options['repeat']):
+                body = renderer.render(data)
+            elapsed = time.perf_counter() - started
+            per_render = elapsed / options['repeat']
+            baseline = baseline or per_render
+            self.stdout.write(
+                f"{label:>9}: {per_render * 1000:8.2f} ms/render  "
+                f"{len(body) / per_render / 1e6:8.1f} MB/s  "
+                f"{len(body) / 1024:8.1f} KiB  x{baseline / per_render:.1f}"
+            )
+
+    def build_payload(self, count):
+        author = User.objects.create_user(email='bench@example.com', password='bench', full_name='Bench Author')
+        category = Category.objects.create(name='Benchmarks')
+        tags = [Tag.objects.create(name=f"tag-{i}") for i in range(5)]
+        now = timezone.now()
+        posts = Post.objects.bulk_create(
+            Post(
+                author=author,
+                category=category,
+                title=f"Benchmark post {i}",
+                slug=f"benchmark-post-{i}",
+                excerpt="Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 4,
+                content="",
+                status='published',
+                views_count=i,
+                published_at=now,
+            )
+            for i in range(count)
+        )
+        Post.tags.through.objects.bulk_create(
+            Post.tags.through(post_id=post.pk, tag_id=tag.pk) for post in posts for tag in tags[:3]
+        )
+        return PostListSerializer(Post.objects.for_list(), many=True).data
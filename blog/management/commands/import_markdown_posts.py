@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.importer import import_directory
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = "Import a directory of Markdown posts with front matter in batched bulk inserts."
+
+    def add_arguments(self, parser):
+        parser.add_argument('directory')
+        parser.add_argument('--author', required=True, help="Email of the user the posts are attributed to")
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        try:
+            author = User.objects.get(email=options['author'])
+        except User.DoesNotExist:
+            raise CommandError(f"No user with email {options['author']}")
+
+        started = time.perf_counter()
+
+        def progress(result):
+            if options['verbosity'] > 1:
+                self.stdout.write(f"{result.imported} imported, {result.skipped} skipped...")
+
+        try:
+            result = import_directory(options['directory'], author, options['batch_size'], progress)
+        except FileNotFoundError as e:
+            raise CommandError(str(e))
+
+        for path, error in result.errors:
+            self.stderr.write(f"{path}: {error}")
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {result.imported} posts in {elapsed:.1f}s "
+            f"({result.skipped} already present, {len(result.errors)} invalid)."
+        ))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from blog import search
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index for blog posts from scratch."
+
+    def handle(self, *args, **options):
+        if not search.is_available():
+            raise CommandError("Full-text search requires the SQLite FTS5 backend.")
+        with transaction.atomic():
+            count = search.rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} posts."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from blog import syndication
+
+
+class Command(BaseCommand):
+    help = (
+        "Regenerate every blog feed and sitemap file and remove those for "
+        "deleted tags, categories and empty shards. Unchanged files are left alone."
+    )
+
+    def handle(self, *args, **options):
+        written = syndication.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rewrote {written} feed and sitemap files."))
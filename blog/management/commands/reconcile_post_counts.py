@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog import post_counts
+
+
+class Command(BaseCommand):
+    help = "Recompute Tag.post_count and Category.post_count from the posts table."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            fixed = post_counts.recount()
+        self.stdout.write(self.style.SUCCESS(f"Corrected {fixed} counts."))
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:13
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_post_counts(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    Tag = apps.get_model('blog', 'Tag')
+    Category = apps.get_model('blog', 'Category')
+    links = (
+        Post.tags.through.objects.filter(tag_id=OuterRef('pk'), post__status='published')
+        .order_by().values('tag_id').annotate(n=Count('post_id')).values('n')
+    )
+    Tag.objects.update(post_count=Coalesce(Subquery(links), Value(0)))
+    posts = (
+        Post.objects.filter(category_id=OuterRef('pk'), status='published')
+        .order_by().values('category_id').annotate(n=Count('pk')).values('n')
+    )
+    Category.objects.update(post_count=Coalesce(Subquery(posts), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0002_post_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='post_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='tag',
+            name='post_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_post_counts, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,6 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, IntegerField, OuterRef, Prefetch, Q, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.utils.text import slugify
 from users.models import User
 
@@ -6,6 +8,8 @@ class Category(models.Model):
     name = models.CharField(max_length=100, unique=True)
     slug = models.SlugField(max_length=100, unique=True, blank=True)
     description = models.TextField(blank=True)
+    # Published posts; maintained by blog.post_counts.
+    post_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
@@ -23,6 +27,8 @@ class Category(models.Model):
 class Tag(models.Model):
     name = models.CharField(max_length=50, unique=True)
     slug = models.SlugField(max_length=50, unique=True, blank=True)
+    # Published posts; maintained by blog.post_counts.
+    post_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
@@ -36,6 +42,57 @@ class Tag(models.Model):
     def __str__(self):
         return self.name
 
+# Approved comments embedded in the post detail payload; the rest are paged
+# through CommentListCreateView.
+EMBEDDED_COMMENTS = 10
+
+
+class PostQuerySet(models.QuerySet):
+    def with_comment_count(self):
+        approved = (
+            Comment.objects.filter(post=OuterRef('pk'), is_approved=True)
+            .order_by()
+            .values('post')
+            .annotate(total=Count('pk'))
+            .values('total')
+        )
+        return self.annotate(
+            approved_comment_count=Coalesce(Subquery(approved, output_field=IntegerField()), Value(0))
+        )
+
+    def with_tags(self):
+        return self.prefetch_related('tags')
+
+    def for_list(self):
+        """Everything PostListSerializer reads, in a fixed number of queries."""
+        return (
+            self.select_related('author', 'category')
+            .with_tags()
+            .with_comment_count()
+            .defer('content')
+        )
+
+    def with_comment_page(self, size=EMBEDDED_COMMENTS):
+        """
+        Prefetch the newest ``size + 1`` approved top-level comments of each
+        post into ``comment_page``; the extra row tells whether there is a
+        next page.
+        """
+        comments = (
+            Comment.objects.roots().filter(is_approved=True)
+            .select_related('author').order_by('-created_at', '-pk')
+        )
+        return self.prefetch_related(Prefetch('comments', queryset=comments[:size + 1], to_attr='comment_page'))
+
+    def for_detail(self):
+        return (
+            self.select_related('author', 'category')
+            .with_tags()
+            .with_comment_count()
+            .with_comment_page()
+        )
+
+
 class Post(models.Model):
     STATUS_CHOICES = [
         ('draft', 'Draft'),
@@ -60,9 +117,26 @@ class Post(models.Model):
     published_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    objects = PostQuerySet.as_manager()
     
     class Meta:
         ordering = ['-published_at', '-created_at']
+        # Keyset pages of the list views: filter columns, then the ordering
+        # with the pk tie-breaker. SQLite compares booleans as bare columns
+        # (WHERE "is_featured"), which only a partial index can match; the
+        # few featured posts are filtered by status inside it, so it also
+        # serves authenticated lists, which include drafts.
+        indexes = [
+            models.Index(fields=['status', '-published_at', '-created_at', '-id'], name='blog_post_status_pub_idx'),
+            models.Index(fields=['-published_at', '-created_at', '-id'], name='blog_post_pub_idx'),
+            models.Index(
+                fields=['-published_at', '-created_at', '-id'],
+                condition=Q(is_featured=True),
+                name='blog_post_featured_pub_idx',
+            ),
+            models.Index(fields=['author', '-published_at', '-created_at', '-id'], name='blog_post_author_pub_idx'),
+        ]
     
     def save(self, *args, **kwargs):
         if not self.slug:
@@ -74,17 +148,73 @@ class Post(models.Model):
     def __str__(self):
         return self.title
 
+class CommentQuerySet(models.QuerySet):
+    def roots(self):
+        return self.filter(parent__isnull=True)
+
+    def threads(self, roots, max_depth=None):
+        """
+        Replies below ``roots``, in tree order, from one query: a ``path``
+        range per root, served by the ``(post, path)`` index.
+        """
+        ranges = Q(pk__in=[])
+        for root in roots:
+            path = root.tree_path
+            # Every descendant path is "<root path>/...", and "/" sorts just below "0".
+            ranges |= Q(post_id=root.post_id, path__gt=f"{path}/", path__lt=f"{path}0")
+        replies = self.filter(ranges)
+        if max_depth is not None:
+            replies = replies.filter(depth__lte=max_depth)
+        return replies.order_by('path')
+
+
 class Comment(models.Model):
+    # Replies nest at most this deep (roots are depth 0).
+    MAX_DEPTH = 8
+    PATH_SEGMENT = 10
+
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='comments')
+    parent = models.ForeignKey('self', on_delete=models.CASCADE, related_name='replies', null=True, blank=True)
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='comments', null=True, blank=True)
     name = models.CharField(max_length=100)
     email = models.EmailField()
     content = models.TextField()
     is_approved = models.BooleanField(default=False)
+    # Materialized path: zero-padded ids from the root down to this comment,
+    # joined by "/", so sorting by path gives depth-first tree order.
+    path = models.CharField(max_length=255, blank=True, editable=False)
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = CommentQuerySet.as_manager()
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['post', 'path'], name='blog_comment_post_path_idx'),
+            models.Index(
+                fields=['post', '-created_at', '-id'], condition=Q(is_approved=True), name='blog_comment_approved_idx'
+            ),
+        ]
     
+    @classmethod
+    def path_segment(cls, pk):
+        return str(pk).zfill(cls.PATH_SEGMENT)
+
+    @property
+    def tree_path(self):
+        # Roots inserted with bulk_create have no stored path; theirs is just their id.
+        return self.path or self.path_segment(self.pk)
+
+    def save(self, *args, **kwargs):
+        if self.pk is not None and self.path:
+            return super().save(*args, **kwargs)
+        with transaction.atomic():
+            self.depth = self.parent.depth + 1 if self.parent_id else 0
+            super().save(*args, **kwargs)
+            segment = self.path_segment(self.pk)
+            self.path = f"{self.parent.tree_path}/{segment}" if self.parent_id else segment
+            Comment.objects.filter(pk=self.pk).update(path=self.path, depth=self.depth)
+
     def __str__(self):
-        return f"Comment by {self.name} on {self.post.title}"
\ No newline at end of file
+        return f"Comment by {self.name} on {self.post.title}"
@@ -0,0 +1,140 @@
+"""
+Denormalized published-post counts on Tag and Category.
+
+``Tag.post_count`` and ``Category.post_count`` are adjusted with relative
+``F()`` updates from the signal receivers in ``blog.signals`` whenever a post
+is published or unpublished, moves category, gains or loses tags, or is
+deleted. Writes that bypass signals (``QuerySet.update()``, ``bulk_create``,
+raw SQL, fixtures) leave them stale until ``recount()`` or
+``manage.py reconcile_post_counts`` runs.
+"""
+from django.db.models import Count, F
+
+from .models import Category, Post, Tag
+
+PUBLISHED = 'published'
+
+
+def adjust(model, ids, delta):
+    ids = [pk for pk in ids if pk is not None]
+    if ids and delta:
+        model.objects.filter(pk__in=ids).update(post_count=F('post_count') + delta)
+
+
+def counted_state(post):
+    """``(is_published, category_id)`` as last loaded or saved, or None if deferred."""
+    values = post.__dict__
+    if 'status' not in values or 'category_id' not in values:
+        return None
+    return values['status'] == PUBLISHED, values['category_id']
+
+
+def remember_state(post):
+    post._counted_state = counted_state(post)
+
+
+def post_saved(post, created):
+    old = (False, None) if created else getattr(post, '_counted_state', None)
+    if old is None:
+        # Loaded without status/category: nothing to diff against.
+        recount_post(post)
+        remember_state(post)
+        return
+    was_published, old_category = old
+    now_published, new_category = post.status == PUBLISHED, post.category_id
+
+    if (was_published, old_category) != (now_published, new_category):
+        if was_published:
+            adjust(Category, [old_category], -1)
+        if now_published:
+            adjust(Category, [new_category], 1)
+    if was_published != now_published and not created:
+        tag_ids = Post.tags.through.objects.filter(post_id=post.pk).values_list('tag_id', flat=True)
+        adjust(Tag, list(tag_ids), 1 if now_published else -1)
+    remember_state(post)
+
+
+def is_published(post):
+    state = getattr(post, '_counted_state', None)
+    return state[0] if state is not None else post.status == PUBLISHED
+
+
+def tags_changed(instance, action, reverse, pk_set):
+    """Apply an ``m2m_changed`` event on ``Post.tags``, from either side."""
+    if action == 'pre_clear':
+        # pk_set is empty for clears; remember what is about to go.
+        if reverse:
+            instance._cleared_post_count = instance.posts.filter(status=PUBLISHED).count()
+        elif is_published(instance):
+            instance._cleared_tag_ids = list(instance.tags.values_list('pk', flat=True))
+        return
+    if action == 'post_clear':
+        if reverse:
+            adjust(Tag, [instance.pk], -instance.__dict__.pop('_cleared_post_count', 0))
+        else:
+            adjust(Tag, instance.__dict__.pop('_cleared_tag_ids', []), -1)
+        return
+    if action not in ('post_add', 'post_remove') or not pk_set:
+        return
+    sign = 1 if action == 'post_add' else -1
+    if reverse:
+        published = Post.objects.filter(pk__in=pk_set, status=PUBLISHED).count()
+        adjust(Tag, [instance.pk], sign * published)
+    elif is_published(instance):
+        adjust(Tag, pk_set, sign)
+
+
+def post_deleted(post):
+    """Call before the post's tag links are removed."""
+    if not is_published(post):
+        return
+    adjust(Category, [post.category_id], -1)
+    tag_ids = Post.tags.through.objects.filter(post_id=post.pk).values_list('tag_id', flat=True)
+    adjust(Tag, list(tag_ids), -1)
+
+
+def recount_post(post):
+    recount(
+        tag_ids=Post.tags.through.objects.filter(post_id=post.pk).values_list('tag_id', flat=True),
+        category_ids=[post.category_id] if post.category_id else [],
+    )
+
+
+def recount(tag_ids=None, category_ids=None):
+    """
+    Recompute counts from scratch with one GROUP BY per model, writing only
+    the rows that drifted. Limited to ``tag_ids`` / ``category_ids`` when
+    given. Returns the number of rows corrected.
+    """
+    fixed = 0
+    links = Post.tags.through.objects.filter(post__status=PUBLISHED)
+    tags = Tag.objects.only('pk', 'post_count')
+    if tag_ids is not None:
+        tag_ids = list(tag_ids)
+        links = links.filter(tag_id__in=tag_ids)
+        tags = tags.filter(pk__in=tag_ids)
+    tag_counts = dict(links.values('tag_id').annotate(n=Count('post_id')).values_list('tag_id', 'n'))
+    fixed += _apply(Tag, tags, tag_counts)
+
+    posts = Post.objects.filter(status=PUBLISHED, category__isnull=False)
+    categories = Category.objects.only('pk', 'post_count')
+    if category_ids is not None:
+        category_ids = list(category_ids)
+        posts = posts.filter(category_id__in=category_ids)
+        categories = categories.filter(pk__in=category_ids)
+    category_counts = dict(
+        posts.order_by().values('category_id').annotate(n=Count('pk')).values_list('category_id', 'n')
+    )
+    fixed += _apply(Category, categories, category_counts)
+    return fixed
+
+
+def _apply(model, queryset, counts):
+    stale = []
+    for obj in queryset.iterator(chunk_size=2000):
+        count = counts.get(obj.pk, 0)
+        if obj.post_count != count:
+            obj.post_count = count
+            stale.append(obj)
+    model.objects.bulk_update(stale, ['post_count'], batch_size=500)
+    return len(stale)
@@ -0,0 +1,147 @@
+"""
+Full-text search over posts backed by an SQLite FTS5 index.
+
+The ``blog_post_fts`` table mirrors each post's title, excerpt and content
+under the post's id as rowid. It is kept current by the signal handlers in
+``blog.signals`` and can be rebuilt with ``manage.py rebuild_search_index``.
+"""
+import re
+from functools import reduce
+from operator import and_, or_
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from rest_framework import filters
+
+FTS_TABLE = 'blog_post_fts'
+
+# bm25() column weights: title, excerpt, content.
+RANK_WEIGHTS = (10.0, 5.0, 1.0)
+
+
+def is_available():
+    return connection.vendor == 'sqlite'
+
+
+def search_terms(text):
+    return re.findall(r'\w+', text or '')
+
+
+def build_match_query(text):
+    """
+    Turn free text into an FTS5 query that matches posts containing every
+    term. Terms are quoted so user input can never be parsed as FTS syntax.
+    """
+    return ' '.join(f'"{term}"' for term in search_terms(text))
+
+
+def index_post(post):
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [post.pk])
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, title, excerpt, content) VALUES (%s, %s, %s, %s)",
+            [post.pk, post.title, post.excerpt, post.content],
+        )
+
+
+def index_posts(post_ids):
+    """Re-index a batch of posts straight from the post table."""
+    post_ids = list(post_ids)
+    if not post_ids:
+        return
+    placeholders = ', '.join(['%s'] * len(post_ids))
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})", post_ids)
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, title, excerpt, content) "
+            f"SELECT id, title, excerpt, content FROM blog_post WHERE id IN ({placeholders})",
+            post_ids,
+        )
+
+
+def remove_post(post_id):
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [post_id])
+
+
+def rebuild_index():
+    """Re-create every index entry from the post table, returning the row count."""
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, title, excerpt, content) "
+            f"SELECT id, title, excerpt, content FROM blog_post"
+        )
+        cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')")
+        cursor.execute(f"SELECT COUNT(*) FROM {FTS_TABLE}")
+        return cursor.fetchone()[0]
+
+
+def matching_ids_sql(match):
+    return f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match]
+
+
+def search_posts(text, queryset, limit=20, offset=0):
+    """
+    Rank the posts in ``queryset`` that match ``text`` by BM25 and return
+    ``(total, hits)``, where ``hits`` is a list of ``(post_id, rank, snippet)``
+    for the requested slice, best match first. Filtering already applied to
+    ``queryset`` (status, visibility, ...) is preserved.
+
+    Without FTS5 the posts containing every term are returned in the
+    queryset's order, unranked and with the excerpt as snippet.
+    """
+    if not is_available():
+        return search_posts_unindexed(text, queryset, limit, offset)
+    match = build_match_query(text)
+    if not match:
+        return 0, []
+
+    visible_sql, visible_params = queryset.order_by().values('pk').query.sql_with_params()
+    weights = ', '.join(str(weight) for weight in RANK_WEIGHTS)
+    where = f"{FTS_TABLE} MATCH %s AND rowid IN ({visible_sql})"
+    params = [match, *visible_params]
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT COUNT(*) FROM {FTS_TABLE} WHERE {where}", params)
+        total = cursor.fetchone()[0]
+        cursor.execute(
+            f"SELECT rowid, bm25({FTS_TABLE}, {weights}) AS score, "
+            f"snippet({FTS_TABLE}, -1, '<mark>', '</mark>', '…', 16) "
+            f"FROM {FTS_TABLE} WHERE {where} ORDER BY score LIMIT %s OFFSET %s",
+            [*params, limit, offset],
+        )
+        hits = cursor.fetchall()
+    return total, hits
+
+
+def search_posts_unindexed(text, queryset, limit=20, offset=0):
+    terms = search_terms(text)
+    if not terms:
+        return 0, []
+    queryset = queryset.filter(reduce(and_, (
+        reduce(or_, (Q(**{f'{field}__icontains': term}) for field in ('title', 'excerpt', 'content')))
+        for term in terms
+    )))
+    total = queryset.count()
+    hits = [(post_id, None, excerpt) for post_id, excerpt in queryset.values_list('pk', 'excerpt')[offset:offset + limit]]
+    return total, hits
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """
+    Drop-in replacement for ``SearchFilter`` that resolves ``?search=`` through
+    the FTS index instead of ``LIKE '%term%'`` scans. Ordering is left to the
+    view; use the search endpoint for relevance-ranked results. Falls back to
+    the stock behaviour on databases without FTS5.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, '')
+        if not is_available() or not text.strip():
+            return super().filter_queryset(request, queryset, view)
+        match = build_match_query(text)
+        if not match:
+            return queryset
+        return queryset.filter(pk__in=RawSQL(*matching_ids_sql(match)))
@@ -1,21 +1,20 @@
+from django.urls import reverse
 from rest_framework import serializers
-from .models import Post, Category, Tag, Comment
+from core.fields import ImageSrcsetField
+from core.pagination import KeysetPagination
+from .models import EMBEDDED_COMMENTS, Post, Category, Tag, Comment
 
 class CategorySerializer(serializers.ModelSerializer):
-    post_count = serializers.SerializerMethodField
     class Meta:
         model = Category
-        fields = ['id', 'name', 'slug', 'despcription', 'post_count', 'created_at']
-
-        def get_post_count(self, obj):
-            return obj.posts.filter(status='published').count
+        fields = ['id', 'name', 'slug', 'description', 'post_count', 'created_at']
+        read_only_fields = ['post_count']
 
 class TagSerializer(serializers.ModelSerializer):
-    post_count = serializers.SerializerMethodField()
-
     class Meta:
         model = Tag
         fields = ['id', 'name', 'slug', 'post_count', 'created_at']
+        read_only_fields = ['post_count']
 
 
 class CommentSerializer(serializers.ModelSerializer):
@@ -24,12 +23,16 @@ class CommentSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Comment
-        fields = ['id', 'post', 'author', 'author_name', 'name', 'email', 'content', 'is_approved', 'created_at']
-        read_only_fields = ['id', 'author', 'is_approved', 'created_at']
+        fields = [
+            'id', 'post', 'parent', 'depth', 'author', 'author_name',
+            'name', 'email', 'content', 'is_approved', 'created_at'
+        ]
+        read_only_fields = ['id', 'post', 'depth', 'author', 'is_approved', 'created_at']
     
 
 class PostListSerializer(serializers.ModelSerializer):
     author_name = serializers.CharField(source='author.full_name', read_only=True)
+    featured_image_srcset = ImageSrcsetField(source='featured_image')
     category_name = serializers.CharField(source='category.name', read_only=True)
     tags = TagSerializer(many=True, read_only=True)
     comment_count = serializers.SerializerMethodField()
@@ -37,63 +40,91 @@ class PostListSerializer(serializers.ModelSerializer):
     class Meta:
         model = Post
         fields = [
-            'id', 'title', 'slug', 'excerpt', 'featured_image',
+            'id', 'title', 'slug', 'excerpt', 'featured_image', 'featured_image_srcset',
             'author', 'author_name', 'category', 'category_name', 
             'tags', 'status', 'is_featured', 'views_count', 
             'comment_count', 'published_at', 'created_at'
         ]
     
     def get_comment_count(self, obj):
+        if hasattr(obj, 'approved_comment_count'):
+            return obj.approved_comment_count
         return obj.comments.filter(is_approved=True).count()
 
 
+class PostSearchResultSerializer(PostListSerializer):
+    rank = serializers.FloatField(source='search_rank', read_only=True)
+    snippet = serializers.CharField(source='search_snippet', read_only=True)
+
+    class Meta(PostListSerializer.Meta):
+        fields = PostListSerializer.Meta.fields + ['rank', 'snippet']
+
+
 class PostDetailSerializer(serializers.ModelSerializer):
-   author_name = serializers.CharField(source='author.full_name', read_only=True)
-   Category_name = serializers.CharField(source='category.name', read_only = True)
-   tags = TagSerializer(many=True, read_only=True)
-   tag_ids = serializers.PrimaryKeyRelatedField(
-       querset=Tag.objects.all(),
-       many=True,
-       write_only=True,
-       required=False
-   )
-   comments = CommentSerializer(many=True, read_only=True)
-   comment_count = serializers.SerializerMethodField()
-   class Meta:
-       model = Post
-       fields = [
-            'id', 'title', 'slug', 'excerpt', 'content', 'featured_image',
+    author_name = serializers.CharField(source='author.full_name', read_only=True)
+    featured_image_srcset = ImageSrcsetField(source='featured_image')
+    category_name = serializers.CharField(source='category.name', read_only=True)
+    tags = TagSerializer(many=True, read_only=True)
+    tag_ids = serializers.PrimaryKeyRelatedField(
+        queryset=Tag.objects.all(),
+        many=True,
+        write_only=True,
+        required=False
+    )
+    comments = serializers.SerializerMethodField()
+    comment_count = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Post
+        fields = [
+            'id', 'title', 'slug', 'excerpt', 'content', 'featured_image', 'featured_image_srcset',
             'author', 'author_name', 'category', 'category_name',
-            'tags', 'tag_ids', 'status', 'is_featured', 'views_count', 
-            'comments', 'comment_count', 'published_at', 
+            'tags', 'tag_ids', 'status', 'is_featured', 'views_count',
+            'comments', 'comment_count', 'published_at',
             'created_at', 'updated_at'
-       ]
-       read_only_fields = ['id', 'author', 'slug', 'views_count', 'created_at', 'updated_at']
-
-       def get_comment_count(self, obj):
-           return obj.comments.filter(is_approved=True).count()
-       def create(self, validated_data):
-           tag_ids = validated_data.pop('tag_ids', [])
-           user = self.context['request'].user
-           post = Post.objects.create(author=user, **validated_data)
-           post.tags.set(tag_ids)
-           return post
-       def update(self, instance, validated_data):
+        ]
+        read_only_fields = ['id', 'author', 'slug', 'views_count', 'created_at', 'updated_at']
+
+    def get_comment_count(self, obj):
+        if hasattr(obj, 'approved_comment_count'):
+            return obj.approved_comment_count
+        return obj.comments.filter(is_approved=True).count()
+
+    def get_comments(self, obj):
+        """First page of approved top-level comments, continued by ``next`` on the comment list."""
+        page = getattr(obj, 'comment_page', None)
+        if page is None:
+            page = list(
+                obj.comments.roots().filter(is_approved=True).select_related('author')
+                .order_by('-created_at', '-pk')[:EMBEDDED_COMMENTS + 1]
+            )
+        next_link = None
+        if len(page) > EMBEDDED_COMMENTS:
+            page = page[:EMBEDDED_COMMENTS]
+            url = reverse('comment-list-create', kwargs={'post_id': obj.pk})
+            request = self.context.get('request')
+            if request is not None:
+                url = request.build_absolute_uri(url)
+            next_link = KeysetPagination().link_after(page[-1], url)
+        return {
+            'next': next_link,
+            'results': CommentSerializer(page, many=True, context=self.context).data,
+        }
+
+    def create(self, validated_data):
+        tag_ids = validated_data.pop('tag_ids', [])
+        validated_data.setdefault('author', self.context['request'].user)
+        post = Post.objects.create(**validated_data)
+        post.tags.set(tag_ids)
+        return post
+
+    def update(self, instance, validated_data):
         tag_ids = validated_data.pop('tag_ids', None)
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
         instance.save()
-        
+
         if tag_ids is not None:
             instance.tags.set(tag_ids)
-        
-        return instance
-     
-        
 
-
-
-    
-
-
-    
+        return instance
@@ -0,0 +1,160 @@
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from core.response_cache import response_cache
+from users.models import User
+from . import post_counts, search, syndication
+from .models import Category, Comment, Post, Tag
+
+
+@receiver(post_save, sender=Post)
+def index_saved_post(sender, instance, raw=False, **kwargs):
+    if raw or not search.is_available():
+        return
+    search.index_post(instance)
+
+
+@receiver(post_delete, sender=Post)
+def unindex_deleted_post(sender, instance, **kwargs):
+    if search.is_available():
+        search.remove_post(instance.pk)
+
+
+@receiver(post_init, sender=Post)
+def remember_counted_state(sender, instance, **kwargs):
+    post_counts.remember_state(instance)
+
+
+@receiver(post_save, sender=Post)
+def count_saved_post(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        post_counts.post_saved(instance, created)
+
+
+@receiver(pre_delete, sender=Post)
+def uncount_deleted_post(sender, instance, **kwargs):
+    # Runs inside the delete's transaction, before the tag links go.
+    post_counts.post_deleted(instance)
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def count_post_tags(sender, instance, action, reverse, pk_set, **kwargs):
+    post_counts.tags_changed(instance, action, reverse, pk_set)
+
+
+# Feeds and sitemap shards are regenerated after commit, only those the
+# change shows up in; see blog.syndication.
+
+@receiver(pre_save, sender=Post)
+def remember_syndicated_state(sender, instance, raw=False, **kwargs):
+    if not raw:
+        instance._syndicated_state = syndication.previous_state(instance)
+
+
+@receiver(post_save, sender=Post)
+def syndicate_saved_post(sender, instance, raw=False, **kwargs):
+    if not raw:
+        syndication.post_saved(instance, instance.__dict__.pop('_syndicated_state', (False, None)))
+
+
+@receiver(pre_delete, sender=Post)
+def unsyndicate_deleted_post(sender, instance, **kwargs):
+    syndication.post_deleted(instance)
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def syndicate_post_tags(sender, instance, action, reverse, pk_set, **kwargs):
+    syndication.tags_changed(instance, action, reverse, pk_set)
+
+
+@receiver(pre_save, sender=User)
+def remember_author_name(sender, instance, raw=False, update_fields=None, **kwargs):
+    # Logins only write last_login; skip the lookup for them.
+    if raw or instance.pk is None or (update_fields is not None and 'full_name' not in update_fields):
+        return
+    instance._syndicated_name = (
+        User.objects.using(DEFAULT_DB_ALIAS).filter(pk=instance.pk).values_list('full_name', flat=True).first()
+    )
+
+
+@receiver(post_save, sender=User)
+def syndicate_renamed_author(sender, instance, raw=False, **kwargs):
+    old_name = instance.__dict__.pop('_syndicated_name', None)
+    if not raw and old_name is not None and old_name != instance.full_name:
+        syndication.author_renamed(instance.pk)
+
+
+# Cached anonymous responses are tagged in blog.views; each change purges
+# exactly the tags whose payload it alters.
+
+@receiver(post_init, sender=Post)
+def remember_loaded_slug(sender, instance, **kwargs):
+    instance._loaded_slug = instance.__dict__.get('slug')
+
+
+@receiver(pre_save, sender=Post)
+def remember_previous_slug(sender, instance, raw=False, **kwargs):
+    # Loaded with the slug deferred: read the stored one before it is overwritten.
+    if not raw and instance._loaded_slug is None and not instance._state.adding:
+        instance._loaded_slug = (
+            Post.objects.using(DEFAULT_DB_ALIAS).filter(pk=instance.pk).values_list('slug', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def purge_post_responses(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    # Lists embed the post; tag and category lists show published counts.
+    tags = [f'post:{instance.slug}', 'post-list', 'tag-list', 'category-list']
+    # A renamed slug leaves the old detail URL cached under the old tag.
+    if instance._loaded_slug and instance._loaded_slug != instance.slug:
+        tags.append(f'post:{instance._loaded_slug}')
+    instance._loaded_slug = instance.slug
+    response_cache.purge_on_commit(*tags)
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def purge_post_tag_responses(sender, instance, action, reverse, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if reverse:
+        response_cache.purge_on_commit('post-list', 'post-detail', 'tag-list')
+    else:
+        response_cache.purge_on_commit(f'post:{instance.slug}', 'post-list', 'tag-list')
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def purge_comment_responses(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    slug = Post.objects.filter(pk=instance.post_id).values_list('slug', flat=True).first()
+    tags = [f'comments:{instance.post_id}', 'post-list']
+    if slug is not None:
+        tags.append(f'post:{slug}')
+    response_cache.purge_on_commit(*tags)
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def purge_tag_responses(sender, raw=False, **kwargs):
+    if not raw:
+        response_cache.purge_on_commit('tag-list', 'post-list', 'post-detail')
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def purge_category_responses(sender, raw=False, **kwargs):
+    if not raw:
+        response_cache.purge_on_commit('category-list', 'post-list', 'post-detail')
+
+
+@receiver(post_save, sender=User)
+def purge_author_responses(sender, update_fields=None, raw=False, **kwargs):
+    # Logins only touch last_login, which no cached payload shows.
+    if raw or (update_fields is not None and set(update_fields) <= {'last_login'}):
+        return
+    response_cache.purge_on_commit('authors')
@@ -0,0 +1,487 @@
+"""
+Static RSS/Atom feeds and a sharded XML sitemap for the blog.
+
+Every feed (site-wide, per category, per tag; RSS and Atom each) and every
+sitemap file is written to ``default_storage`` under ``syndication/``, so
+the web server can serve them without Django. Sitemap shard ``n`` lists the
+published posts with ids ``(n - 1) * SITEMAP_SHARD_SIZE + 1`` to
+``n * SITEMAP_SHARD_SIZE``; the index lists the shards.
+
+Nothing is built per request. The receivers in ``blog.signals`` call
+``schedule`` with what a post change touches: the site feed, the old and
+new category, the post's tags and its shard (an author's rename touches
+the feeds of their posts). After commit, ``flush`` hands the changes to a
+single background thread, which regenerates just those files from the
+primary; changes queued while it works are coalesced into its next run.
+A file is only rewritten when its bytes change, so its modification time
+is when its content last changed. That time is the ``Last-Modified``
+served by ``blog.views.syndication_file`` and the ``<lastmod>`` of a shard
+in the index.
+
+Bulk writers that skip signals call ``posts_changed`` (``blog.importer``)
+or ``rebuild`` (``core.synthetic_data``). Renamed or deleted tags and
+categories leave their old feeds behind until ``manage.py
+rebuild_syndication``.
+"""
+import logging
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import DEFAULT_DB_ALIAS, connection, transaction
+from django.utils import feedgenerator
+
+from core.db import use_primary
+from . import post_counts
+from .models import Category, Post, Tag
+
+logger = logging.getLogger(__name__)
+
+PUBLISHED = 'published'
+PREFIX = 'syndication/'
+EMPTY_FEED_DATE = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class StableDateMixin:
+    def latest_post_date(self):
+        # feedgenerator dates an empty feed now(), which would rewrite it every time.
+        return super().latest_post_date() if self.items else EMPTY_FEED_DATE
+
+
+class RssFeed(StableDateMixin, feedgenerator.Rss201rev2Feed):
+    pass
+
+
+class AtomFeed(StableDateMixin, feedgenerator.Atom1Feed):
+    pass
+
+
+FORMATS = {'rss': RssFeed, 'atom': AtomFeed}
+SITEMAP_INDEX = 'sitemap.xml'
+SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+# Every file there can be, relative to PREFIX; nothing else is served.
+NAME_RE = re.compile(
+    r'^(?:sitemap\.xml'
+    r'|sitemap-posts-(?P<shard>[1-9][0-9]*)\.xml'
+    r'|feeds/(?:(?P<kind>category|tag)/(?P<slug>[-a-zA-Z0-9_]+)\.)?(?P<fmt>rss|atom)\.xml)$'
+)
+
+DEFAULTS = {
+    # Where the public site lives; feed and sitemap links point there.
+    'SITE_URL': 'http://localhost:8000',
+    'BLOG_PATH': '/blog/',
+    'POST_PATH': '/blog/{slug}/',
+    'TITLE': 'Blog',
+    'DESCRIPTION': 'Latest posts',
+    'ITEMS': 20,
+    # The sitemap protocol allows 50,000 URLs per file.
+    'SITEMAP_SHARD_SIZE': 10000,
+    # Regenerate in a background thread after commit; False runs it inline.
+    'ASYNC': True,
+}
+
+
+def syndication_setting(name):
+    return getattr(settings, 'BLOG_SYNDICATION', {}).get(name, DEFAULTS[name])
+
+
+def absolute(path):
+    return syndication_setting('SITE_URL').rstrip('/') + path
+
+
+def post_url(slug):
+    return absolute(syndication_setting('POST_PATH').format(slug=slug))
+
+
+def feed_name(fmt, kind=None, slug=None):
+    """``feeds/rss.xml`` or ``feeds/<kind>/<slug>.<fmt>.xml``, relative to ``PREFIX``."""
+    if kind is None:
+        return f"feeds/{fmt}.xml"
+    return f"feeds/{kind}/{slug}.{fmt}.xml"
+
+
+def parse_name(name):
+    """The ``NAME_RE`` match for a feed or sitemap file name, or None."""
+    return NAME_RE.match(name)
+
+
+def shard_name(shard):
+    return f"sitemap-posts-{shard}.xml"
+
+
+def shard_of(post_id):
+    return (post_id - 1) // syndication_setting('SITEMAP_SHARD_SIZE') + 1
+
+
+def write(name, content):
+    """Replace ``PREFIX + name`` if ``content`` differs; return whether it did."""
+    path = default_storage.path(PREFIX + name)
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == content:
+                return False
+    except FileNotFoundError:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    partial = f"{path}.{os.getpid()}.{threading.get_ident()}.part"
+    with open(partial, 'wb') as f:
+        f.write(content)
+    os.replace(partial, path)
+    return True
+
+
+def remove(name):
+    try:
+        os.remove(default_storage.path(PREFIX + name))
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def modified_time(name):
+    """Modification time of ``PREFIX + name`` as an aware datetime, or None."""
+    try:
+        mtime = os.path.getmtime(default_storage.path(PREFIX + name))
+    except FileNotFoundError:
+        return None
+    return datetime.fromtimestamp(mtime, timezone.utc)
+
+
+# Feeds
+
+def feed_posts(kind=None, instance=None):
+    posts = Post.objects.filter(status=PUBLISHED)
+    if kind == 'category':
+        posts = posts.filter(category=instance)
+    elif kind == 'tag':
+        posts = posts.filter(tags=instance)
+    posts = posts.select_related('author', 'category').with_tags().defer('content')
+    return posts.order_by('-published_at', '-created_at', '-id')[:syndication_setting('ITEMS')]
+
+
+def render_feed(fmt, kind=None, instance=None):
+    title = syndication_setting('TITLE')
+    if instance is not None:
+        title = f"{title}: {instance.name}"
+    feed = FORMATS[fmt](
+        title=title,
+        link=absolute(syndication_setting('BLOG_PATH')),
+        description=syndication_setting('DESCRIPTION'),
+        feed_url=absolute(f"/{feed_name(fmt, kind, instance.slug if instance else None)}"),
+        language=settings.LANGUAGE_CODE,
+    )
+    for post in feed_posts(kind, instance):
+        link = post_url(post.slug)
+        feed.add_item(
+            title=post.title,
+            link=link,
+            unique_id=link,
+            description=post.excerpt,
+            author_name=post.author.full_name,
+            pubdate=post.published_at or post.created_at,
+            updateddate=post.updated_at,
+            categories=[tag.name for tag in post.tags.all()],
+        )
+    return feed.writeString('utf-8').encode()
+
+
+def write_feeds(kind=None, instance=None):
+    written = 0
+    for fmt in FORMATS:
+        written += write(feed_name(fmt, kind, instance.slug if instance else None), render_feed(fmt, kind, instance))
+    return written
+
+
+# Sitemap
+
+def render_shard(shard):
+    """The urlset for ``shard``, or None when it holds no published post."""
+    size = syndication_setting('SITEMAP_SHARD_SIZE')
+    rows = (
+        Post.objects.filter(status=PUBLISHED, pk__gt=(shard - 1) * size, pk__lte=shard * size)
+        .order_by('pk').values_list('slug', 'updated_at')
+    )
+    urls = [
+        f"<url><loc>{escape(post_url(slug))}</loc><lastmod>{updated_at.isoformat(timespec='seconds')}</lastmod></url>"
+        for slug, updated_at in rows.iterator(chunk_size=2000)
+    ]
+    if not urls:
+        return None
+    return (
+        f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="{SITEMAP_NS}">\n'
+        + '\n'.join(urls) + '\n</urlset>\n'
+    ).encode()
+
+
+def write_shard(shard):
+    content = render_shard(shard)
+    if content is None:
+        return remove(shard_name(shard))
+    return write(shard_name(shard), content)
+
+
+def all_shards():
+    """Every shard number up to the one holding the newest post."""
+    last = Post.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+    return set(range(1, shard_of(last) + 1)) if last else set()
+
+
+def existing_shards():
+    try:
+        _, files = default_storage.listdir(PREFIX)
+    except FileNotFoundError:
+        return []
+    shards = []
+    for name in files:
+        if name.startswith('sitemap-posts-') and name.endswith('.xml'):
+            number = name[len('sitemap-posts-'):-len('.xml')]
+            if number.isdigit():
+                shards.append(int(number))
+    return sorted(shards)
+
+
+def write_sitemap_index():
+    entries = []
+    for shard in existing_shards():
+        lastmod = modified_time(shard_name(shard))
+        entries.append(
+            f"<sitemap><loc>{escape(absolute('/' + shard_name(shard)))}</loc>"
+            f"<lastmod>{lastmod.isoformat(timespec='seconds')}</lastmod></sitemap>"
+        )
+    return write(SITEMAP_INDEX, (
+        f'<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="{SITEMAP_NS}">\n'
+        + ''.join(entry + '\n' for entry in entries) + '</sitemapindex>\n'
+    ).encode())
+
+
+# Incremental regeneration
+
+@dataclass
+class Changes:
+    site: bool = False
+    categories: set = field(default_factory=set)
+    tags: set = field(default_factory=set)
+    shards: set = field(default_factory=set)
+
+    def __bool__(self):
+        return bool(self.site or self.categories or self.tags or self.shards)
+
+    def update(self, other):
+        self.site |= other.site
+        self.categories |= other.categories
+        self.tags |= other.tags
+        self.shards |= other.shards
+
+
+_pending = threading.local()
+_queued = Changes()
+_queued_lock = threading.Lock()
+_executor = None
+
+
+def schedule(site=False, categories=(), tags=(), shards=()):
+    """Regenerate these feeds and sitemap shards once the current transaction commits."""
+    changes = getattr(_pending, 'changes', None)
+    if changes is None:
+        changes = _pending.changes = Changes()
+    changes.site |= site
+    changes.categories.update(pk for pk in categories if pk is not None)
+    changes.tags.update(tags)
+    changes.shards.update(shards)
+    # Every call registers a flush; the first to run takes all the changes.
+    # Changes from a rolled-back transaction go out with the next commit.
+    transaction.on_commit(flush)
+
+
+def flush():
+    changes = getattr(_pending, 'changes', None)
+    if not changes:
+        return None
+    _pending.changes = None
+    if not syndication_setting('ASYNC'):
+        return regenerate(changes)
+    with _queued_lock:
+        _queued.update(changes)
+    return get_executor().submit(regenerate_queued)
+
+
+def get_executor():
+    global _executor
+    with _queued_lock:
+        if _executor is None:
+            # One worker: files are never regenerated concurrently, and a
+            # burst of commits is coalesced into the next run.
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='syndication')
+        return _executor
+
+
+def regenerate_queued():
+    global _queued
+    with _queued_lock:
+        changes, _queued = _queued, Changes()
+    if not changes:
+        return 0
+    try:
+        return regenerate(changes)
+    except Exception:
+        logger.exception("Regenerating feeds and sitemaps failed; run manage.py rebuild_syndication")
+        return 0
+    finally:
+        connection.close()
+
+
+def regenerate(changes):
+    """Rewrite what ``changes`` names; return the number of files that changed."""
+    with use_primary():
+        return _regenerate(changes)
+
+
+def _regenerate(changes):
+    written = 0
+    if changes.site:
+        written += write_feeds()
+    for category in Category.objects.filter(pk__in=changes.categories):
+        written += write_feeds('category', category)
+    for tag in Tag.objects.filter(pk__in=changes.tags):
+        written += write_feeds('tag', tag)
+    shards_changed = sum(write_shard(shard) for shard in sorted(changes.shards))
+    if shards_changed or not default_storage.exists(PREFIX + SITEMAP_INDEX):
+        written += shards_changed + write_sitemap_index()
+    return written
+
+
+def previous_state(post):
+    """``(published, category_id)`` before the save about to happen; for ``pre_save``."""
+    if post._state.adding:
+        return False, None
+    state = getattr(post, '_counted_state', None)
+    if state is None:
+        row = Post.objects.using(DEFAULT_DB_ALIAS).filter(pk=post.pk).values_list('status', 'category_id').first()
+        state = (row[0] == PUBLISHED, row[1]) if row else (False, None)
+    return state
+
+
+def post_saved(post, old_state):
+    was_published, old_category = old_state
+    if not (was_published or post.status == PUBLISHED):
+        return
+    tag_ids = Post.tags.through.objects.filter(post_id=post.pk).values_list('tag_id', flat=True)
+    schedule(
+        site=True, categories={old_category, post.category_id}, tags=list(tag_ids), shards={shard_of(post.pk)},
+    )
+
+
+def post_deleted(post):
+    """Call before the post's tag links are removed."""
+    if post_counts.is_published(post):
+        tag_ids = Post.tags.through.objects.filter(post_id=post.pk).values_list('tag_id', flat=True)
+        schedule(site=True, categories={post.category_id}, tags=list(tag_ids), shards={shard_of(post.pk)})
+
+
+def tags_changed(instance, action, reverse, pk_set):
+    """Apply an ``m2m_changed`` event on ``Post.tags``, from either side."""
+    if action not in ('pre_clear', 'post_add', 'post_remove'):
+        return
+    if reverse:
+        posts = instance.posts.all() if action == 'pre_clear' else Post.objects.filter(pk__in=pk_set or ())
+        if posts.filter(status=PUBLISHED).exists():
+            schedule(site=True, tags={instance.pk})
+    elif post_counts.is_published(instance):
+        tag_ids = instance.tags.values_list('pk', flat=True) if action == 'pre_clear' else pk_set or ()
+        schedule(site=True, tags=list(tag_ids))
+
+
+def schedule_published(posts, shards=True):
+    published = posts.using(DEFAULT_DB_ALIAS).filter(status=PUBLISHED)
+    rows = list(published.values_list('pk', 'category_id'))
+    if not rows:
+        return
+    schedule(
+        site=True,
+        categories={category_id for _, category_id in rows},
+        tags=set(
+            Post.tags.through.objects.using(DEFAULT_DB_ALIAS)
+            .filter(post__in=published).values_list('tag_id', flat=True)
+        ),
+        shards={shard_of(pk) for pk, _ in rows} if shards else (),
+    )
+
+
+def posts_changed(post_ids):
+    """Schedule everything the published posts among ``post_ids`` appear in; for bulk writes."""
+    schedule_published(Post.objects.filter(pk__in=list(post_ids)))
+
+
+def author_renamed(user_id):
+    """Schedule the feeds showing the author's posts; sitemaps do not name authors."""
+    schedule_published(Post.objects.filter(author_id=user_id), shards=False)
+
+
+# Full rebuild and on-demand generation
+
+def rebuild():
+    """Regenerate every feed and shard and drop the stale ones; return the number of files written."""
+    with use_primary():
+        return _rebuild()
+
+
+def _rebuild():
+    changes = Changes(
+        site=True,
+        categories=set(Category.objects.values_list('pk', flat=True)),
+        tags=set(Tag.objects.values_list('pk', flat=True)),
+        shards=all_shards(),
+    )
+    for shard in existing_shards():
+        if shard not in changes.shards:
+            remove(shard_name(shard))
+    for kind, model in (('category', Category), ('tag', Tag)):
+        live = set(model.objects.values_list('slug', flat=True))
+        try:
+            _, files = default_storage.listdir(f"{PREFIX}feeds/{kind}")
+        except FileNotFoundError:
+            continue
+        for name in files:
+            slug = name.split('.', 1)[0]
+            if slug not in live:
+                remove(f"feeds/{kind}/{name}")
+    written = _regenerate(changes)
+    written += write_sitemap_index()
+    return written
+
+
+def ensure(name):
+    """
+    Make sure ``PREFIX + name`` exists, generating it if a post change has
+    not yet. Return False if ``name`` is not a feed or sitemap file there
+    could be; such a name is never looked up in storage.
+    """
+    match = parse_name(name)
+    if match is None:
+        return False
+    if default_storage.exists(PREFIX + name):
+        return True
+    with use_primary():
+        if name == SITEMAP_INDEX:
+            # The index lists the shard files, so a fresh deploy needs them first.
+            for shard in sorted(all_shards()):
+                write_shard(shard)
+            write_sitemap_index()
+        elif match['shard']:
+            if not write_shard(int(match['shard'])):
+                return False
+            write_sitemap_index()
+        elif match['kind'] is None:
+            write_feeds()
+        else:
+            model = Category if match['kind'] == 'category' else Tag
+            instance = model.objects.filter(slug=match['slug']).first()
+            if instance is None:
+                return False
+            write_feeds(match['kind'], instance)
+    return default_storage.exists(PREFIX + name)
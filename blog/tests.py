@@ -1,3 +1,855 @@
-from django.test import TestCase
+import io
+import os
+import shutil
+import tempfile
+import time
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.management import call_command
+from django.db import OperationalError, connection
+from django.db.models import QuerySet
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from users.models import User
+from . import syndication
+from .models import EMBEDDED_COMMENTS, Category, Comment, Post, Tag
+from .views import PostDetailView, PostListCreateView
+from core.response_cache import response_cache
+from .view_counter import ViewCountBuffer, view_counter
+
+
+@override_settings(
+    BLOG_VIEW_COUNT_FLUSH_INTERVAL=3600,
+    BLOG_VIEW_COUNT_FLUSH_THRESHOLD=10 ** 6,
+    RESPONSE_CACHE={'ENABLED': False},
+)
+class QueryCountTests(TestCase):
+    """
+    Each blog endpoint must build its rows with a fixed number of queries,
+    so the count for a small page has to match the count for a larger one.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.author = User.objects.create_user(
+            email='author@example.com', password='secret', full_name='Post Author'
+        )
+        self.commenter = User.objects.create_user(
+            email='reader@example.com', password='secret', full_name='Reader'
+        )
+        self.created = 0
+        self.addCleanup(view_counter.clear)
+
+    def create_posts(self, count):
+        for _ in range(count):
+            self.created += 1
+            n = self.created
+            category = Category.objects.create(name=f"Category {n}")
+            post = Post.objects.create(
+                author=self.author,
+                category=category,
+                title=f"Post {n}",
+                content="Body " * 100,
+                status='published',
+                is_featured=True,
+            )
+            post.tags.add(
+                Tag.objects.create(name=f"tag-{n}-a"),
+                Tag.objects.create(name=f"tag-{n}-b"),
+            )
+            self.add_comments(post, 2)
+
+    def add_comments(self, post, count):
+        Comment.objects.bulk_create(
+            Comment(
+                post=post,
+                author=self.commenter,
+                name='Reader',
+                email='reader@example.com',
+                content='Nice post',
+                is_approved=True,
+            )
+            for _ in range(count)
+        )
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        return len(context.captured_queries)
+
+    def assertConstantQueries(self, url, grow=None):
+        grow = grow or self.create_posts
+        grow(2)
+        small = self.count_queries(url)
+        grow(8)
+        large = self.count_queries(url)
+        self.assertEqual(small, large, f"{url} issued {small} queries for a small page, {large} for a large one")
+
+    def test_post_list(self):
+        self.assertConstantQueries(reverse('post-list-create'))
+
+    def test_post_list_authenticated(self):
+        self.client.force_authenticate(self.author)
+        self.assertConstantQueries(reverse('post-list-create'))
+
+    def test_featured_posts(self):
+        self.assertConstantQueries(reverse('featured-posts'))
+
+    def test_my_posts(self):
+        self.client.force_authenticate(self.author)
+        self.assertConstantQueries(reverse('my-posts'))
+
+    def test_category_list(self):
+        self.assertConstantQueries(reverse('category-list'))
+
+    def test_tag_list(self):
+        self.assertConstantQueries(reverse('tag-list'))
+
+    def test_post_detail(self):
+        self.create_posts(1)
+        post = Post.objects.get()
+        url = reverse('post-detail', kwargs={'slug': post.slug})
+        self.assertConstantQueries(url, grow=lambda n: self.add_comments(post, n))
+
+    def test_post_detail_embeds_one_page_of_approved_comments(self):
+        self.create_posts(1)
+        post = Post.objects.get()
+        self.add_comments(post, EMBEDDED_COMMENTS + 3)
+        Comment.objects.create(post=post, name='Spam', email='s@example.com', content='Spam')
+        comments = self.client.get(reverse('post-detail', kwargs={'slug': post.slug})).json()['comments']
+        self.assertEqual(len(comments['results']), EMBEDDED_COMMENTS)
+
+        rest = self.client.get(comments['next']).json()
+        self.assertIsNone(rest['next'])
+        seen = [c['id'] for c in comments['results'] + rest['results']]
+        approved = Comment.objects.filter(post=post, is_approved=True).order_by('-created_at', '-pk')
+        self.assertEqual(seen, list(approved.values_list('pk', flat=True)))
+
+    def test_comment_list(self):
+        self.create_posts(1)
+        post = Post.objects.get()
+        url = reverse('comment-list-create', kwargs={'post_id': post.pk})
+        self.assertConstantQueries(url, grow=lambda n: self.add_comments(post, n))
+
+
+class ViewCountBufferTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(
+            email='author@example.com', password='secret', full_name='Post Author'
+        )
+        self.posts = [
+            Post.objects.create(author=self.author, title=f"Post {n}", content='Body', status='published')
+            for n in range(3)
+        ]
+        self.addCleanup(view_counter.clear)
+
+    def views(self):
+        return [post.views_count for post in Post.objects.order_by('pk')]
+
+    def test_posts_with_the_same_delta_share_an_update(self):
+        buffer = ViewCountBuffer(flush_interval=3600, flush_threshold=100)
+        for post, views in zip(self.posts, (2, 2, 1)):
+            buffer.record(post.pk, views)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(buffer.flush(), 5)
+        self.assertEqual(len([q for q in queries if q['sql'].startswith('UPDATE')]), 2)
+        self.assertEqual(self.views(), [2, 2, 1])
+        self.assertEqual(buffer.pending(), 0)
+
+    def test_threshold_and_interval_trigger_a_flush(self):
+        buffer = ViewCountBuffer(flush_interval=3600, flush_threshold=3)
+        buffer.record(self.posts[0].pk, 2)
+        self.assertEqual(self.views(), [0, 0, 0])
+        buffer.record(self.posts[1].pk)
+        self.assertEqual(self.views(), [2, 1, 0])
+
+        buffer = ViewCountBuffer(flush_interval=10, flush_threshold=100)
+        buffer.record(self.posts[2].pk)
+        self.assertEqual(buffer.pending(), 1)
+        later = time.monotonic() + 11
+        with mock.patch('blog.view_counter.time.monotonic', return_value=later):
+            buffer.record(self.posts[2].pk)
+        self.assertEqual(self.views(), [2, 1, 2])
+
+    @override_settings(BLOG_VIEW_COUNT_FLUSH_INTERVAL=3600, BLOG_VIEW_COUNT_FLUSH_THRESHOLD=1, RESPONSE_CACHE={'ENABLED': False})
+    def test_a_failed_flush_keeps_the_views_and_the_read_succeeds(self):
+        url = reverse('post-detail', kwargs={'slug': self.posts[0].slug})
+        locked = mock.patch.object(QuerySet, 'update', side_effect=OperationalError('database is locked'))
+        with locked, self.assertLogs('blog.view_counter', 'WARNING'):
+            self.assertEqual(APIClient().get(url).status_code, 200)
+        self.assertEqual(view_counter.pending(self.posts[0].pk), 1)
+        # No retry on every read while the database is busy.
+        with locked as update:
+            self.assertEqual(APIClient().get(url).status_code, 200)
+        update.assert_not_called()
+        self.assertEqual(view_counter.flush(), 2)
+        self.assertEqual(self.views(), [2, 0, 0])
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.author = User.objects.create_user(
+            email='author@example.com', password='secret', full_name='Post Author'
+        )
+
+    def create_post(self, title, content, status='published'):
+        return Post.objects.create(author=self.author, title=title, content=content, status=status)
+
+    def search(self, **params):
+        response = self.client.get(reverse('post-search'), params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_results_are_ranked_and_highlighted(self):
+        body = self.create_post('Cooking notes', 'Some thoughts on django deployment.')
+        title = self.create_post('Django tips', 'Assorted tips.')
+        data = self.search(q='django')
+        self.assertEqual(data['count'], 2)
+        self.assertEqual([r['id'] for r in data['results']], [title.pk, body.pk])
+        self.assertIn('<mark>', data['results'][0]['snippet'])
+
+    def test_index_follows_updates_and_deletes(self):
+        post = self.create_post('Original title', 'Body text.')
+        post.title = 'Renamed entry'
+        post.save()
+        self.assertEqual(self.search(q='original')['count'], 0)
+        self.assertEqual(self.search(q='renamed')['count'], 1)
+        post.delete()
+        self.assertEqual(self.search(q='renamed')['count'], 0)
+
+    def test_drafts_are_hidden_from_anonymous_users(self):
+        self.create_post('Draft about sqlite', 'Body.', status='draft')
+        self.assertEqual(self.search(q='sqlite')['count'], 0)
+        self.client.force_authenticate(self.author)
+        self.assertEqual(self.search(q='sqlite')['count'], 1)
+
+    def test_falls_back_to_substring_matching_without_fts(self):
+        self.create_post('Django tips', 'Assorted tips.')
+        self.create_post('Cooking notes', 'Some thoughts on django deployment.')
+        self.create_post('Draft about django', 'Body.', status='draft')
+        with mock.patch('blog.search.is_available', return_value=False), CaptureQueriesContext(connection) as queries:
+            data = self.search(q='DJANGO tips')
+            self.assertEqual(data['count'], 1)
+            self.assertEqual(data['results'][0]['title'], 'Django tips')
+            self.assertIsNone(data['results'][0]['rank'])
+            self.assertEqual(self.search(q='django', limit=1, offset=1)['count'], 2)
+        self.assertFalse([query for query in queries if 'blog_post_fts' in query['sql']])
+
+    def test_list_search_parameter_uses_the_index(self):
+        self.create_post('Search me', 'Body.')
+        self.create_post('Other', 'Body.')
+        response = self.client.get(reverse('post-list-create'), {'search': 'search'})
+        self.assertEqual([p['title'] for p in response.json()['results']], ['Search me'])
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.author = User.objects.create_user(
+            email='author@example.com', password='secret', full_name='Post Author'
+        )
+        self.client.force_authenticate(self.author)
+        now = timezone.now()
+        # Drafts without published_at and posts sharing a timestamp exercise
+        # NULL handling and the primary-key tie-breaker.
+        for i in range(12):
+            published_at = None if i % 4 == 0 else now - timedelta(days=i // 3)
+            Post.objects.create(
+                author=self.author,
+                title=f"Post {i}",
+                content="Body",
+                status='published' if published_at else 'draft',
+                published_at=published_at,
+            )
+        self.expected = [
+            p.pk for p in Post.objects.order_by('-published_at', '-created_at', '-pk')
+        ]
+
+    def walk(self, url):
+        ids, pages = [], []
+        while url:
+            data = self.client.get(url).json()
+            pages.append(data)
+            ids.extend(p['id'] for p in data['results'])
+            url = data['next']
+        return ids, pages
+
+    def test_forward_walk_matches_model_ordering(self):
+        ids, pages = self.walk(reverse('post-list-create') + '?page_size=5')
+        self.assertEqual(ids, self.expected)
+        self.assertEqual([len(p['results']) for p in pages], [5, 5, 2])
+        self.assertIsNone(pages[0]['previous'])
+
+    def test_previous_link_returns_to_the_prior_page(self):
+        _, pages = self.walk(reverse('post-list-create') + '?page_size=5')
+        previous = self.client.get(pages[2]['previous']).json()
+        self.assertEqual(previous['results'], pages[1]['results'])
+        first = self.client.get(previous['previous']).json()
+        self.assertEqual(first['results'], pages[0]['results'])
+        self.assertIsNone(first['previous'])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse('post-list-create') + '?cursor=bogus')
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(RESPONSE_CACHE={'ENABLED': False})
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.author = User.objects.create_user(
+            email='author@example.com', password='secret', full_name='Post Author'
+        )
+        self.post = Post.objects.create(
+            author=self.author, title='Cached', content='Body', status='published'
+        )
+        view_counter.clear()
+        self.addCleanup(view_counter.clear)
+
+    def assertRevalidates(self, url, change, validator_queries):
+        etag = self.client.get(url)['ETag']
+        # Only the validator aggregates run; nothing is fetched or serialized.
+        with self.assertNumQueries(validator_queries):
+            not_modified = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.content, b'')
+        change()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_post_list(self):
+        def add_comment():
+            Comment.objects.create(
+                post=self.post, name='Reader', email='r@example.com', content='Hi', is_approved=True
+            )
+        self.assertRevalidates(reverse('post-list-create'), add_comment, 2)
+
+    def test_post_detail(self):
+        def edit():
+            self.post.title = 'Edited'
+            self.post.save()
+        self.assertRevalidates(reverse('post-detail', kwargs={'slug': self.post.slug}), edit, 2)
+
+    def test_unpublishing_changes_the_list_validator(self):
+        def unpublish():
+            Post.objects.filter(pk=self.post.pk).update(status='draft')
+        self.assertRevalidates(reverse('post-list-create'), unpublish, 2)
+
+    def test_last_modified(self):
+        url = reverse('post-detail', kwargs={'slug': self.post.slug})
+        last_modified = self.client.get(url)['Last-Modified']
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    @override_settings(BLOG_VIEW_COUNT_FLUSH_INTERVAL=3600, BLOG_VIEW_COUNT_FLUSH_THRESHOLD=10 ** 6)
+    def test_revalidated_post_views_are_counted(self):
+        url = reverse('post-detail', kwargs={'slug': self.post.slug})
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(view_counter.pending(self.post.pk), 1)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(view_counter.pending(self.post.pk), 2)
+
+    @override_settings(
+        ROOT_URLCONF='portfolio.urls_asgi', BLOG_VIEW_COUNT_FLUSH_INTERVAL=3600, BLOG_VIEW_COUNT_FLUSH_THRESHOLD=10 ** 6
+    )
+    async def test_revalidated_post_views_are_counted_async(self):
+        url = reverse('post-detail', kwargs={'slug': self.post.slug})
+        etag = (await self.async_client.get(url))['ETag']
+        response = await self.async_client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(view_counter.pending(self.post.pk), 2)
+
+
+@override_settings(BLOG_VIEW_COUNT_FLUSH_INTERVAL=3600, BLOG_VIEW_COUNT_FLUSH_THRESHOLD=10 ** 6)
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        response_cache.clear()
+        self.addCleanup(response_cache.clear)
+        self.addCleanup(view_counter.clear)
+        self.client = APIClient()
+        self.author = User.objects.create_user(
+            email='author@example.com', password='secret', full_name='Post Author'
+        )
+        self.post = Post.objects.create(
+            author=self.author, title='Cached', content='Body', status='published'
+        )
+        self.other = Post.objects.create(
+            author=self.author, title='Other', content='Body', status='published'
+        )
+
+    def detail_url(self, post):
+        return reverse('post-detail', kwargs={'slug': post.slug})
+
+    def assertCached(self, url):
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'HIT')
+        return response
+
+    def test_anonymous_hits_skip_the_database(self):
+        response = self.assertCached(reverse('post-list-create'))
+        self.assertEqual(response.json()['results'][0]['title'], 'Other')
+        self.assertCached(reverse('tag-list'))
+
+    def test_hits_still_count_views(self):
+        self.assertCached(self.detail_url(self.post))
+        self.assertEqual(view_counter.pending(self.post.pk), 2)
+
+    def test_saving_a_post_purges_only_its_tags(self):
+        self.assertCached(self.detail_url(self.post))
+        self.assertCached(self.detail_url(self.other))
+        self.post.title = 'Edited'
+        self.post.save()
+        self.assertEqual(self.client.get(self.detail_url(self.post)).json()['title'], 'Edited')
+        self.assertEqual(self.client.get(self.detail_url(self.other))['X-Cache'], 'HIT')
+
+    def test_changing_the_slug_purges_the_old_url(self):
+        old_url = self.detail_url(self.post)
+        self.assertCached(old_url)
+        self.post.slug = 'renamed'
+        self.post.save()
+        self.assertEqual(self.client.get(old_url).status_code, 404)
+        self.assertEqual(self.client.get(self.detail_url(self.post)).json()['slug'], 'renamed')
+
+        post = Post.objects.only('pk', 'title').get(pk=self.post.pk)
+        self.assertCached(self.detail_url(self.post))
+        post.slug = 'renamed-again'
+        post.save()
+        self.assertEqual(self.client.get(reverse('post-detail', kwargs={'slug': 'renamed'})).status_code, 404)
+
+    def test_new_comment_purges_the_post(self):
+        url = reverse('comment-list-create', kwargs={'post_id': self.post.pk})
+        self.assertCached(url)
+        self.assertCached(self.detail_url(self.post))
+        Comment.objects.create(
+            post=self.post, name='Reader', email='r@example.com', content='Hi', is_approved=True
+        )
+        self.assertEqual(len(self.client.get(url).json()['results']), 1)
+        self.assertEqual(len(self.client.get(self.detail_url(self.post)).json()['comments']['results']), 1)
+
+    def test_authenticated_requests_bypass_the_cache(self):
+        url = reverse('post-list-create')
+        self.client.get(url)
+        self.client.force_authenticate(self.author)
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer token')
+        self.assertFalse(self.client.get(url).has_header('X-Cache'))
+
+    def test_cached_etag_still_answers_304(self):
+        url = self.detail_url(self.post)
+        etag = self.assertCached(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+
+class PostCountTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(
+            email='author@example.com', password='secret', full_name='Post Author'
+        )
+        self.news = Category.objects.create(name='News')
+        self.notes = Category.objects.create(name='Notes')
+        self.python = Tag.objects.create(name='python')
+        self.django = Tag.objects.create(name='django')
+
+    def create_post(self, title, status='published', category=None):
+        return Post.objects.create(
+            author=self.author, title=title, content='Body', status=status, category=category or self.news
+        )
+
+    def assertCounts(self, **expected):
+        objects = {'news': self.news, 'notes': self.notes, 'python': self.python, 'django': self.django}
+        actual = {}
+        for name in expected:
+            obj = objects[name]
+            obj.refresh_from_db()
+            actual[name] = obj.post_count
+        self.assertEqual(actual, expected)
+
+    def test_status_and_category_changes(self):
+        post = self.create_post('First', status='draft')
+        post.tags.add(self.python)
+        self.assertCounts(news=0, python=0)
+        post.status = 'published'
+        post.save()
+        self.assertCounts(news=1, python=1)
+        post.category = self.notes
+        post.save()
+        self.assertCounts(news=0, notes=1, python=1)
+        post.status = 'archived'
+        post.save()
+        self.assertCounts(notes=0, python=0)
+
+    def test_tag_changes_from_both_sides(self):
+        first = self.create_post('First')
+        second = self.create_post('Second')
+        draft = self.create_post('Draft', status='draft')
+        first.tags.set([self.python, self.django])
+        self.django.posts.add(second, draft)
+        self.assertCounts(python=1, django=2)
+        first.tags.remove(self.python)
+        self.django.posts.remove(second)
+        self.assertCounts(python=0, django=1)
+        first.tags.clear()
+        self.assertCounts(django=0)
+        self.django.posts.add(first, second)
+        self.django.posts.clear()
+        self.assertCounts(django=0)
+
+    def test_delete(self):
+        post = self.create_post('First')
+        post.tags.add(self.python)
+        post.delete()
+        self.assertCounts(news=0, python=0)
+
+    def test_reconcile_command_repairs_drift(self):
+        post = self.create_post('First')
+        post.tags.add(self.python)
+        Post.objects.filter(pk=post.pk).update(status='draft')
+        Tag.objects.filter(pk=self.django.pk).update(post_count=7)
+        out = io.StringIO()
+        call_command('reconcile_post_counts', stdout=out)
+        self.assertIn('Corrected 3 counts', out.getvalue())
+        self.assertCounts(news=0, python=0, django=0)
+
+
+class ThreadedCommentTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.author = User.objects.create_user(
+            email='author@example.com', password='secret', full_name='Post Author'
+        )
+        self.post = Post.objects.create(
+            author=self.author, title='Threads', content='Body', status='published'
+        )
+        self.url = reverse('comment-list-create', kwargs={'post_id': self.post.pk})
+
+    def comment(self, parent=None, approved=True):
+        return Comment.objects.create(
+            post=self.post, parent=parent, name='Reader', email='r@example.com',
+            content='Hi', is_approved=approved,
+        )
+
+    def chain(self, root, length):
+        node = root
+        for _ in range(length):
+            node = self.comment(parent=node)
+        return node
+
+    def ids(self, **params):
+        return [c['id'] for c in self.client.get(self.url, params).json()['results']]
+
+    def test_threads_are_returned_in_tree_order(self):
+        older = self.comment()
+        newer = self.comment()
+        a = self.comment(parent=older)
+        b = self.comment(parent=older)
+        a1 = self.comment(parent=a)
+        hidden = self.comment(parent=newer, approved=False)
+        self.comment(parent=hidden)
+        self.assertEqual(self.ids(), [newer.pk, older.pk, a.pk, a1.pk, b.pk])
+        self.assertEqual(a1.path, f"{older.path}/{a.path[-10:]}/{a1.path[-10:]}")
+        self.assertEqual(a1.depth, 2)
+
+    def test_depth_limit_and_root_pagination(self):
+        first = self.comment()
+        self.chain(first, 3)
+        second = self.comment()
+        reply = self.comment(parent=second)
+        self.assertEqual(self.ids(depth=1, page_size=1), [second.pk, reply.pk])
+        page = self.client.get(self.url, {'depth': 0, 'page_size': 1}).json()
+        self.assertEqual(self.client.get(page['next']).json()['results'][0]['id'], first.pk)
+
+    @override_settings(RESPONSE_CACHE={'ENABLED': False})
+    def test_query_count_does_not_depend_on_depth(self):
+        root = self.comment()
+        self.chain(root, 1)
+        with CaptureQueriesContext(connection) as shallow:
+            self.client.get(self.url)
+        self.chain(root, Comment.MAX_DEPTH - 1)
+        self.chain(self.comment(), 4)
+        with CaptureQueriesContext(connection) as deep:
+            self.client.get(self.url)
+        self.assertEqual(len(shallow), len(deep))
+
+    def test_replies_are_validated(self):
+        leaf = self.chain(self.comment(), Comment.MAX_DEPTH)
+        data = {'name': 'Reader', 'email': 'r@example.com', 'content': 'Reply'}
+        response = self.client.post(self.url, {**data, 'parent': leaf.pk})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post(self.url, {**data, 'parent': leaf.parent_id})
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.json()['depth'], Comment.MAX_DEPTH)
+
+
+class MarkdownImportTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(
+            email='author@example.com', password='secret', full_name='Post Author'
+        )
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        Tag.objects.create(name='django')
+
+    def write(self, name, text):
+        path = os.path.join(self.directory, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as handle:
+            handle.write(text)
+
+    def run_import(self):
+        out, err = io.StringIO(), io.StringIO()
+        call_command(
+            'import_markdown_posts', self.directory, author='author@example.com',
+            batch_size=2, stdout=out, stderr=err,
+        )
+        return out.getvalue(), err.getvalue()
+
+    def test_import(self):
+        self.write('one.md', (
+            "---\ntitle: Keyset pagination\ntags: [django, performance]\ncategory: Engineering\n"
+            "status: published\npublished_at: 2024-03-01T09:30:00Z\n---\nFast deep pages.\n"
+        ))
+        self.write('nested/two.md', (
+            "---\ntitle: \"Drafting\"\ntags:\n  - performance\n  - sqlite\n---\nNot yet.\n"
+        ))
+        self.write('nested/three.md', "---\ntitle: Notes\ncategory: Engineering\nstatus: published\n---\nMore.\n")
+        self.write('broken.md', "no front matter\n")
+
+        out, err = self.run_import()
+        self.assertIn('Imported 3 posts', out)
+        self.assertIn('broken.md: missing front matter', err)
+
+        post = Post.objects.get(slug='keyset-pagination')
+        self.assertEqual(post.published_at.isoformat(), '2024-03-01T09:30:00+00:00')
+        self.assertEqual(post.excerpt, 'Fast deep pages....')
+        self.assertEqual(sorted(post.tags.values_list('name', flat=True)), ['django', 'performance'])
+        self.assertEqual(Post.objects.get(slug='drafting').status, 'draft')
+        self.assertEqual(Tag.objects.get(name='django').post_count, 1)
+        self.assertEqual(Tag.objects.get(name='performance').post_count, 1)
+        self.assertEqual(Category.objects.get(name='Engineering').post_count, 2)
+        hits = APIClient().get(reverse('post-search'), {'q': 'deep pages'}).json()['results']
+        self.assertEqual([hit['slug'] for hit in hits], ['keyset-pagination'])
+
+        out, _ = self.run_import()
+        self.assertIn('Imported 0 posts', out)
+        self.assertIn('3 already present', out)
+
+
+@override_settings(
+    ROOT_URLCONF='portfolio.urls_asgi',
+    BLOG_VIEW_COUNT_FLUSH_INTERVAL=3600,
+    BLOG_VIEW_COUNT_FLUSH_THRESHOLD=10 ** 6,
+    RESPONSE_CACHE={'ENABLED': False},
+)
+class AsyncReadPathTests(TestCase):
+    def setUp(self):
+        self.addCleanup(view_counter.clear)
+        self.author = User.objects.create_user(
+            email='author@example.com', password='secret', full_name='Post Author'
+        )
+        tag = Tag.objects.create(name='django')
+        for n in range(3):
+            post = Post.objects.create(
+                author=self.author, title=f"Post {n}", content='Body', status='published'
+            )
+            post.tags.add(tag)
+        self.post = post
+        Comment.objects.create(
+            post=post, name='Reader', email='r@example.com', content='Hi', is_approved=True
+        )
+
+    def not_dispatched(self, view):
+        return mock.patch.object(view, 'dispatch', side_effect=AssertionError('fell back to DRF'))
+
+    async def drf_response(self, url):
+        with override_settings(ROOT_URLCONF='portfolio.urls'):
+            return await self.async_client.get(url)
+
+    async def test_post_list_matches_the_drf_view(self):
+        url = reverse('post-list-create') + '?page_size=2&ordering=title'
+        with self.not_dispatched(PostListCreateView):
+            response = await self.async_client.get(url)
+        expected = await self.drf_response(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, expected.content)
+        self.assertEqual(response['ETag'], expected['ETag'])
+        self.assertEqual(response['Vary'], expected['Vary'])
+        self.assertIsNotNone(response.json()['next'])
+
+    async def test_post_detail_matches_and_counts_views(self):
+        url = reverse('post-detail', kwargs={'slug': self.post.slug})
+        with self.not_dispatched(PostDetailView):
+            response = await self.async_client.get(url)
+        expected = await self.drf_response(url)
+        self.assertEqual(response.content, expected.content)
+        self.assertEqual(response.json()['views_count'], 1)
+        self.assertEqual(len(response.json()['comments']['results']), 1)
+        self.assertEqual(view_counter.pending(self.post.pk), 2)
+
+    async def test_not_modified(self):
+        url = reverse('post-detail', kwargs={'slug': self.post.slug})
+        etag = (await self.async_client.get(url))['ETag']
+        response = await self.async_client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+
+    async def test_other_requests_fall_back_to_drf(self):
+        url = reverse('post-list-create')
+        category = await Category.objects.acreate(name='Django')
+        with mock.patch.object(PostListCreateView, 'dispatch', autospec=True,
+                               side_effect=PostListCreateView.dispatch) as dispatch:
+            await self.async_client.get(f"{url}?category={category.pk}")
+            await self.async_client.get(url, headers={'Accept': 'application/msgpack'})
+            await self.async_client.post(url, {'title': 'Anonymous'}, content_type='application/json')
+        self.assertEqual(dispatch.call_count, 3)
+
+        missing = await self.async_client.get(reverse('post-detail', kwargs={'slug': 'missing'}))
+        self.assertEqual(missing.status_code, 404)
+        featured = await self.async_client.get(reverse('featured-posts'))
+        self.assertEqual(featured.status_code, 200)
+
+    @override_settings(RESPONSE_CACHE={'ENABLED': True})
+    async def test_shares_the_response_cache(self):
+        response_cache.clear()
+        self.addCleanup(response_cache.clear)
+        url = reverse('post-list-create')
+        self.assertEqual((await self.async_client.get(url))['X-Cache'], 'MISS')
+        with override_settings(ROOT_URLCONF='portfolio.urls'):
+            self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+
+
+
+@override_settings(BLOG_SYNDICATION={'SITE_URL': 'https://example.com', 'SITEMAP_SHARD_SIZE': 2, 'ASYNC': False})
+class SyndicationTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.author = User.objects.create_user(
+            email='author@example.com', password='secret', full_name='Post Author'
+        )
+        self.category = Category.objects.create(name='Engineering')
+        self.django = Tag.objects.create(name='django')
+        self.sqlite = Tag.objects.create(name='sqlite')
+
+    def path(self, name):
+        return os.path.join(self.media_root, 'syndication', name)
+
+    def read(self, name):
+        with open(self.path(name), encoding='utf-8') as handle:
+            return handle.read()
+
+    def publish(self, title, tags=(), status='published'):
+        with self.captureOnCommitCallbacks(execute=True):
+            post = Post.objects.create(
+                author=self.author, title=title, content='Body', status=status, category=self.category,
+                published_at=timezone.now(),
+            )
+            post.tags.add(*tags)
+        return post
+
+    def test_publishing_writes_only_the_affected_files(self):
+        self.publish('Sqlite notes', [self.sqlite])
+        sqlite_feed = self.path('feeds/tag/sqlite.rss.xml')
+        os.utime(sqlite_feed, (0, 0))
+
+        self.publish('Draft', [self.django], status='draft')
+        self.assertFalse(os.path.exists(self.path('feeds/tag/django.rss.xml')))
+        post = self.publish('Keyset pagination', [self.django])
+
+        for name in ('feeds/rss.xml', 'feeds/atom.xml', 'feeds/category/engineering.rss.xml',
+                     'feeds/tag/django.atom.xml'):
+            self.assertIn('https://example.com/blog/keyset-pagination/', self.read(name))
+        self.assertNotIn('/blog/draft/', self.read('feeds/rss.xml'))
+        self.assertEqual(os.path.getmtime(sqlite_feed), 0)
+        # Ids 1-2 in shard 1, id 3 in shard 2.
+        self.assertIn('/blog/sqlite-notes/', self.read('sitemap-posts-1.xml'))
+        self.assertIn('/blog/keyset-pagination/', self.read('sitemap-posts-2.xml'))
+        self.assertIn('https://example.com/sitemap-posts-2.xml', self.read('sitemap.xml'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            post.status = 'archived'
+            post.save()
+        self.assertNotIn('keyset-pagination', self.read('feeds/tag/django.rss.xml'))
+        self.assertFalse(os.path.exists(self.path('sitemap-posts-2.xml')))
+        self.assertNotIn('sitemap-posts-2.xml', self.read('sitemap.xml'))
+        self.assertEqual(os.path.getmtime(sqlite_feed), 0)
+
+    def test_files_are_served_with_last_modified(self):
+        self.publish('Sqlite notes', [self.sqlite])
+        url = reverse('feed', kwargs={'name': 'tag/sqlite.atom.xml'})
+        response = self.client.get(url)
+        self.assertEqual(response['Content-Type'], 'application/atom+xml; charset=utf-8')
+        self.assertIn(b'Sqlite notes', b''.join(response.streaming_content))
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+
+        # A missing file is generated on request; a feed for nothing is a 404.
+        shutil.rmtree(os.path.join(self.media_root, 'syndication'))
+        self.assertEqual(self.client.get(reverse('sitemap-shard', kwargs={'shard': 1})).status_code, 200)
+        self.assertEqual(self.client.get(reverse('feed', kwargs={'name': 'tag/django.rss.xml'})).status_code, 200)
+        self.assertEqual(self.client.get(reverse('feed', kwargs={'name': 'tag/missing.rss.xml'})).status_code, 404)
+        self.assertEqual(self.client.get(reverse('sitemap-shard', kwargs={'shard': 9})).status_code, 404)
+
+    def test_missing_sitemap_index_lists_existing_posts(self):
+        # Posts from before the first deploy: their on-commit writes never ran.
+        Post.objects.create(author=self.author, title='Old post', content='Body', status='published')
+        self.assertFalse(os.path.exists(self.path('sitemap.xml')))
+        response = self.client.get(reverse('sitemap'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'/sitemap-posts-1.xml</loc>', b''.join(response.streaming_content))
+        self.assertIn('/blog/old-post', self.read('sitemap-posts-1.xml'))
+
+    def test_only_feed_and_sitemap_names_are_served(self):
+        self.publish('Sqlite notes', [self.sqlite])
+        os.makedirs(os.path.join(self.media_root, 'blog'))
+        with open(os.path.join(self.media_root, 'blog', 'secret.txt'), 'w') as handle:
+            handle.write('secret')
+        for path in ('/feeds/category', '/feeds/..%2F..%2Fblog%2Fsecret.txt', '/feeds/tag/../rss.xml',
+                     '/feeds/tag/sqlite.txt.xml', '/sitemap-posts-0.xml'):
+            with self.subTest(path=path):
+                self.assertEqual(self.client.get(path).status_code, 404)
+
+    def test_renaming_an_author_rewrites_their_feeds(self):
+        self.publish('Sqlite notes', [self.sqlite])
+        sitemap = self.path('sitemap-posts-1.xml')
+        os.utime(sitemap, (0, 0))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.author.full_name = 'Renamed Author'
+            self.author.save()
+        for name in ('feeds/rss.xml', 'feeds/category/engineering.atom.xml', 'feeds/tag/sqlite.rss.xml'):
+            self.assertIn('Renamed Author', self.read(name))
+        self.assertEqual(os.path.getmtime(sitemap), 0)
+
+    def test_regeneration_runs_in_the_background(self):
+        jobs = []
+        with override_settings(BLOG_SYNDICATION={'ASYNC': True}), \
+                mock.patch.object(syndication, 'get_executor') as get_executor:
+            get_executor.return_value.submit.side_effect = jobs.append
+            self.publish('Sqlite notes', [self.sqlite])
+            self.publish('Keyset pagination', [self.django])
+        self.assertEqual(len(jobs), 2)
+        self.assertFalse(os.path.exists(self.path('feeds/rss.xml')))
+        # The first job takes both commits' changes; the second finds nothing left.
+        with mock.patch.object(syndication, 'connection'):
+            written = [job() for job in jobs]
+        self.assertGreater(written[0], 0)
+        self.assertEqual(written[1], 0)
+        self.assertIn('keyset-pagination', self.read('feeds/tag/django.rss.xml'))
+        self.assertIn('sqlite-notes', self.read('feeds/rss.xml'))
+
+    def test_rebuild_removes_stale_files(self):
+        self.publish('Sqlite notes', [self.sqlite])
+        self.sqlite.delete()
+        out = io.StringIO()
+        call_command('rebuild_syndication', stdout=out)
+        self.assertIn('Rewrote', out.getvalue())
+        self.assertFalse(os.path.exists(self.path('feeds/tag/sqlite.rss.xml')))
+        self.assertTrue(os.path.exists(self.path('feeds/tag/django.rss.xml')))
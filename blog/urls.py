@@ -4,6 +4,7 @@ from .views import (
     TagListView,
     PostListCreateView,
     PostDetailView,
+    PostSearchView,
     FeaturedPostsView,
     CommentListCreateView,
     MyPostsView
@@ -20,6 +21,7 @@ urlpatterns = [
     path('posts/', PostListCreateView.as_view(), name='post-list-create'),
     path('posts/my-posts/', MyPostsView.as_view(), name='my-posts'),
     path('posts/featured/', FeaturedPostsView.as_view(), name='featured-posts'),
+    path('posts/search/', PostSearchView.as_view(), name='post-search'),
     path('posts/<slug:slug>/', PostDetailView.as_view(), name='post-detail'),
     
     # Comments
@@ -0,0 +1,166 @@
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.db.models import F
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCountBuffer:
+    """
+    Write-behind buffer for Post.views_count.
+
+    Views are counted in memory and written back as relative
+    ``views_count = views_count + n`` updates, so every worker process can
+    keep its own buffer without losing increments made by the others.
+
+    A flush is due after ``flush_interval`` seconds or ``flush_threshold``
+    views. ``record`` runs a due flush inline; if it fails (e.g. the
+    database is locked) the error is logged, the views stay buffered and
+    the next attempt waits another interval, so the request still succeeds.
+    Once ``start_background_flush`` has been called, a daemon thread also
+    flushes every interval, so an idle worker does not sit on its views.
+    """
+
+    def __init__(self, flush_interval=None, flush_threshold=None):
+        self._flush_interval = flush_interval
+        self._flush_threshold = flush_threshold
+        self._lock = threading.Lock()
+        self._pending = Counter()
+        self._pending_total = 0
+        self._last_flush = time.monotonic()
+        self._retry_at = 0.0
+        self._background = False
+        self._flusher_pid = None
+
+    @property
+    def flush_interval(self):
+        if self._flush_interval is not None:
+            return self._flush_interval
+        return getattr(settings, 'BLOG_VIEW_COUNT_FLUSH_INTERVAL', 5)
+
+    @property
+    def flush_threshold(self):
+        if self._flush_threshold is not None:
+            return self._flush_threshold
+        return getattr(settings, 'BLOG_VIEW_COUNT_FLUSH_THRESHOLD', 500)
+
+    def record(self, post_id, count=1):
+        now = time.monotonic()
+        with self._lock:
+            self._pending[post_id] += count
+            self._pending_total += count
+            due = now >= self._retry_at and (
+                self._pending_total >= self.flush_threshold
+                or now - self._last_flush >= self.flush_interval
+            )
+        if self._background:
+            self._ensure_flusher()
+        if due:
+            self.try_flush()
+
+    def pending(self, post_id=None):
+        with self._lock:
+            if post_id is None:
+                return self._pending_total
+            return self._pending.get(post_id, 0)
+
+    def flush(self):
+        """Write buffered views to the database, returning the number flushed."""
+        from .models import Post
+
+        with self._lock:
+            pending = self._pending
+            self._pending = Counter()
+            self._pending_total = 0
+            self._last_flush = time.monotonic()
+        if not pending:
+            return 0
+
+        # Posts that received the same number of views share one UPDATE.
+        by_delta = defaultdict(list)
+        for post_id, delta in pending.items():
+            by_delta[delta].append(post_id)
+        try:
+            with transaction.atomic():
+                for delta, post_ids in by_delta.items():
+                    Post.objects.filter(pk__in=post_ids).update(
+                        views_count=F('views_count') + delta
+                    )
+        except DatabaseError:
+            # Keep the views for the next flush instead of dropping them.
+            with self._lock:
+                self._pending.update(pending)
+                self._pending_total += sum(pending.values())
+                self._retry_at = time.monotonic() + self.flush_interval
+            raise
+        return sum(pending.values())
+
+    def try_flush(self):
+        """``flush``, logging a database error instead of raising it."""
+        try:
+            return self.flush()
+        except DatabaseError:
+            logger.warning(
+                "Could not flush %d buffered post views; keeping them for the next flush",
+                self.pending(), exc_info=True,
+            )
+            return 0
+
+    def start_background_flush(self):
+        """Flush from a daemon thread every ``flush_interval`` in each process that records views."""
+        self._background = True
+
+    def _ensure_flusher(self):
+        # Threads do not survive a fork: start one per worker process.
+        pid = os.getpid()
+        if self._flusher_pid == pid:
+            return
+        with self._lock:
+            if self._flusher_pid == pid:
+                return
+            self._flusher_pid = pid
+        threading.Thread(target=self._flush_periodically, name='view-count-flush', daemon=True).start()
+
+    def _flush_periodically(self):
+        while True:
+            time.sleep(self.flush_interval)
+            if not self.pending() or time.monotonic() < self._retry_at:
+                continue
+            try:
+                self.try_flush()
+            finally:
+                connection.close()
+
+    def clear(self):
+        with self._lock:
+            self._pending.clear()
+            self._pending_total = 0
+            self._retry_at = 0.0
+
+
+view_counter = ViewCountBuffer()
+
+
+def record_view(post):
+    """Count one view of ``post``, buffered or written straight through."""
+    if getattr(settings, 'BLOG_VIEW_COUNT_BUFFERED', True):
+        view_counter.record(post.pk)
+    else:
+        type(post).objects.filter(pk=post.pk).update(views_count=F('views_count') + 1)
+
+
+def _flush_at_exit():
+    try:
+        view_counter.try_flush()
+    except Exception:
+        pass
+
+
+atexit.register(_flush_at_exit)
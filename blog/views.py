@@ -1,10 +1,24 @@
+from collections import defaultdict
+
+from asgiref.sync import sync_to_async
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404
 from django.shortcuts import render
+from django.views.decorators.http import condition, require_safe
 from rest_framework import generics, permissions, filters, status
+from rest_framework.exceptions import ParseError, ValidationError
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from core.async_views import AsyncDetailView, AsyncListView
+from core.conditional import ConditionalGetMixin
+from core.metrics import SerializerTimingMixin
+from core.response_cache import CachedResponseMixin
 from .models import Post, Category, Tag, Comment
+from . import search, syndication
+from .view_counter import record_view
 from .serializers import(
     PostListSerializer,
+    PostSearchResultSerializer,
     CategorySerializer,
     PostDetailSerializer,
     TagSerializer,
@@ -18,29 +32,52 @@ class IsAuthorOrReadOnly(permissions.BasePermission):
             return True
         return obj.author == request.user
 
-class CategoryListView(generics.ListAPIView):
+class PostListConditionalMixin(ConditionalGetMixin):
+    def get_validator_querysets(self):
+        # comment_count follows the approved comments on the listed posts.
+        [(posts, field)] = super().get_validator_querysets()
+        comments = Comment.objects.filter(is_approved=True, post__in=posts.order_by().values('pk'))
+        return [(posts, field), (comments, 'created_at')]
+
+class CategoryListView(SerializerTimingMixin, CachedResponseMixin, ConditionalGetMixin, generics.ListAPIView):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = [permissions.AllowAny]
+    cache_tags = ['category-list']
+    page_size = 100
+    last_modified_field = 'created_at'
+
+    def get_validator_querysets(self):
+        # post_count follows the published posts.
+        published = Post.objects.filter(status='published')
+        return super().get_validator_querysets() + [(published, 'updated_at')]
 
 
-class TagListView(generics.ListAPIView):
+class TagListView(SerializerTimingMixin, CachedResponseMixin, ConditionalGetMixin, generics.ListAPIView):
     queryset = Tag.objects.all()
     serializer_class = TagSerializer
     permission_classes = [permissions.AllowAny]
+    cache_tags = ['tag-list']
+    page_size = 100
+    last_modified_field = 'created_at'
 
+    def get_validator_querysets(self):
+        published = Post.objects.filter(status='published')
+        return super().get_validator_querysets() + [(published, 'updated_at')]
 
-class PostListCreateView(generics.ListCreateAPIView):
+
+class PostListCreateView(SerializerTimingMixin, CachedResponseMixin, PostListConditionalMixin, generics.ListCreateAPIView):
     serializer_class = PostListSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    cache_tags = ['post-list', 'authors']
+    filter_backends = [DjangoFilterBackend, search.FullTextSearchFilter, filters.OrderingFilter]
     filterset_fields = ['status', 'is_featured', 'category', 'tags', 'author']
     search_fields = ['title', 'content', 'excerpt']
     ordering_fields = ['created_at', 'published_at', 'views_count', 'title']
     ordering = ['-published_at', '-created_at']
     
     def get_queryset(self):
-        queryset = Post.objects.all()
+        queryset = Post.objects.for_list()
         # Only show published posts to non-authenticated users
         if not self.request.user.is_authenticated:
             queryset = queryset.filter(status='published')
@@ -54,42 +91,209 @@ class PostListCreateView(generics.ListCreateAPIView):
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
 
-class PostDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Post.objects.all()
+class PostSearchView(SerializerTimingMixin, generics.ListAPIView):
+    """
+    BM25-ranked full-text search with highlighted snippets; unranked
+    substring matches on databases without FTS5 (see ``search.search_posts``).
+    """
+    serializer_class = PostSearchResultSerializer
+    permission_classes = [permissions.AllowAny]
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['status', 'is_featured', 'category', 'tags', 'author']
+    default_limit = 20
+    max_limit = 50
+
+    def get_queryset(self):
+        queryset = Post.objects.all()
+        # Only show published posts to non-authenticated users
+        if not self.request.user.is_authenticated:
+            queryset = queryset.filter(status='published')
+        return queryset
+
+    def get_int_param(self, name, default, maximum=None):
+        try:
+            value = int(self.request.query_params.get(name, default))
+        except ValueError:
+            raise ParseError(f"'{name}' must be an integer.")
+        if value < 0:
+            raise ParseError(f"'{name}' must not be negative.")
+        return min(value, maximum) if maximum is not None else value
+
+    def list(self, request, *args, **kwargs):
+        limit = self.get_int_param('limit', self.default_limit, self.max_limit)
+        offset = self.get_int_param('offset', 0)
+        total, hits = search.search_posts(
+            request.query_params.get('q', ''),
+            self.filter_queryset(self.get_queryset()),
+            limit=limit,
+            offset=offset,
+        )
+        posts = Post.objects.for_list().in_bulk([post_id for post_id, _, _ in hits])
+        results = []
+        for post_id, rank, snippet in hits:
+            post = posts.get(post_id)
+            if post is not None:
+                post.search_rank = rank
+                post.search_snippet = snippet
+                results.append(post)
+        serializer = self.get_serializer(results, many=True)
+        return Response({'count': total, 'results': serializer.data})
+
+class PostDetailView(SerializerTimingMixin, CachedResponseMixin, ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
+    queryset = Post.objects.for_detail()
     serializer_class = PostDetailSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     lookup_field = 'slug'
+    cache_tags = ['post:{slug}', 'post-detail', 'authors']
     
+    def get_validator_querysets(self):
+        # The payload embeds the first page of approved comments and their count.
+        comments = Comment.objects.filter(post__slug=self.kwargs['slug'], is_approved=True)
+        return super().get_validator_querysets() + [(comments, 'created_at')]
+
     def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
-        instance.views_count +=1
-        instance.save(update_fields=['views_count'])
+        instance = self.object = self.get_object()
+        record_view(instance)
+        # Reflect this view in the response without waiting for the flush.
+        instance.views_count += 1
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
+
+    def get_cache_meta(self):
+        return self.object.pk
+
+    def cache_hit(self, request, post_id):
+        # Cached hits still count; the embedded views_count catches up when
+        # the entry expires or the post changes.
+        record_view(Post(pk=post_id))
+
+    def not_modified(self, request):
+        # So do revalidations answered with 304.
+        post_id = self.validator_aggregates[0]['pk']
+        if post_id is not None:
+            record_view(Post(pk=post_id))
+
     def get_permissions(self):
         if self.request.method in ['PUT', 'PATCH', 'DELETE']:
             return [permissions.IsAuthenticated(), IsAuthorOrReadOnly()]
         return [permissions.AllowAny()]
-class MyPostsView(generics.ListAPIView):
+class MyPostsView(SerializerTimingMixin, PostListConditionalMixin, generics.ListAPIView):
     serializer_class = PostListSerializer
     permission_classes =[permissions.IsAuthenticated]
     def get_queryset(self):
-        return Post.objects.filter(author=self.request.user)
-class FeaturedPostsView(generics.ListAPIView):
-    queryset = Post.objects.filter(is_featured=True,status='published')
+        return Post.objects.for_list().filter(author=self.request.user)
+class FeaturedPostsView(SerializerTimingMixin, CachedResponseMixin, PostListConditionalMixin, generics.ListAPIView):
+    queryset = Post.objects.for_list().filter(is_featured=True, status='published')
     serializer_class = PostListSerializer
     permission_classes = [permissions.AllowAny]
-class CommentListCreateView(generics.ListCreateAPIView):
+    cache_tags = ['post-list', 'authors']
+class CommentListCreateView(SerializerTimingMixin, CachedResponseMixin, ConditionalGetMixin, generics.ListCreateAPIView):
+    """
+    Approved comments of a post as threads: each page holds ``page_size``
+    top-level comments, each followed by its replies in tree order down to
+    ``?depth=`` levels. Two queries regardless of thread depth.
+    """
     serializer_class = CommentSerializer
     permission_classes = [permissions.AllowAny]
+    cache_tags = ['comments:{post_id}', 'authors']
+    page_size = 50
+    last_modified_field = 'created_at'
+
     def get_queryset(self):
         post_id = self.kwargs.get('post_id')
-        return Comment.objects.filter(post_id=post_id, is_approved=True)
+        return Comment.objects.filter(post_id=post_id, is_approved=True).select_related('author')
+
+    def get_validator_querysets(self):
+        return [(self.get_queryset(), self.last_modified_field)]
+
+    def get_max_depth(self):
+        try:
+            depth = int(self.request.query_params.get('depth', Comment.MAX_DEPTH))
+        except ValueError:
+            raise ParseError("'depth' must be an integer.")
+        return max(0, min(depth, Comment.MAX_DEPTH))
+
+    def list(self, request, *args, **kwargs):
+        comments = self.filter_queryset(self.get_queryset())
+        roots = self.paginate_queryset(comments.roots())
+        replies = comments.threads(roots, self.get_max_depth())
+
+        by_root = defaultdict(list)
+        for reply in replies:
+            by_root[reply.path[:Comment.PATH_SEGMENT]].append(reply)
+        thread = []
+        for root in roots:
+            shown = {root.pk}
+            thread.append(root)
+            for reply in by_root[root.tree_path]:
+                # Parents come first in tree order; skip replies under a hidden comment.
+                if reply.parent_id in shown:
+                    shown.add(reply.pk)
+                    thread.append(reply)
+        serializer = self.get_serializer(thread, many=True)
+        return self.get_paginated_response(serializer.data)
+
     def perform_create(self, serializer):
         post_id = self.kwargs.get('post_id')
+        parent = serializer.validated_data.get('parent')
+        if parent is not None:
+            if parent.post_id != post_id or not parent.is_approved:
+                raise ValidationError({'parent': ["Reply to an approved comment on this post."]})
+            if parent.depth >= Comment.MAX_DEPTH:
+                raise ValidationError({'parent': [f"Replies cannot nest deeper than {Comment.MAX_DEPTH} levels."]})
         if self.request.user.is_authenticated:
             serializer.save(post_id=post_id, author=self.request.user)
         else:
             serializer.save(post_id=post_id)
 
-        
\ No newline at end of file
+
+# Async read path (ASGI, see portfolio.urls_asgi). FK filters stay on the
+# sync views: their choice fields validate against the database.
+
+class PostListAsyncView(AsyncListView):
+    drf_view = PostListCreateView
+    async_params = AsyncListView.async_params | {'status', 'is_featured', 'ordering', 'search'}
+
+
+class PostDetailAsyncView(AsyncDetailView):
+    drf_view = PostDetailView
+
+    async def get_object(self, drf):
+        instance = await super().get_object(drf)
+        await sync_to_async(record_view)(instance)
+        instance.views_count += 1
+        return instance
+
+
+# Feeds and sitemaps are static files (see blog.syndication); a web server
+# can serve MEDIA_ROOT/syndication directly. These views serve them from
+# Django, generating any that are missing, with the file's modification
+# time as Last-Modified. Names that are not a feed or sitemap are a 404
+# before storage is touched.
+
+SYNDICATION_CONTENT_TYPES = {
+    'rss': 'application/rss+xml; charset=utf-8',
+    'atom': 'application/atom+xml; charset=utf-8',
+}
+
+
+def syndication_modified(request, name):
+    if not syndication.ensure(name):
+        raise Http404("No such feed or sitemap")
+    return syndication.modified_time(name)
+
+
+@require_safe
+@condition(last_modified_func=syndication_modified)
+def syndication_file(request, name):
+    fmt = syndication.parse_name(name)['fmt']
+    content_type = SYNDICATION_CONTENT_TYPES.get(fmt, 'application/xml; charset=utf-8')
+    return FileResponse(default_storage.open(syndication.PREFIX + name), content_type=content_type)
+
+
+def sitemap_shard(request, shard):
+    return syndication_file(request, syndication.shard_name(shard))
+
+
+def feed(request, name):
+    return syndication_file(request, f"feeds/{name}")
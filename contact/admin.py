@@ -1,4 +1,5 @@
 from django.contrib import admin
+from .export import export_response
 from .models import ContactMessage
 
 @admin.register(ContactMessage)
@@ -23,14 +24,23 @@ class ContactMessageAdmin(admin.ModelAdmin):
 
         }),
         ('Timestamps', {
-            'fields':('createc_at', 'updated_at')
+            'fields':('created_at', 'updated_at')
 
         }),
     )
-    def mark_as_read(self. request, queryset):
+    def mark_as_read(self, request, queryset):
+        queryset.update(status='read', is_read=True)
+    mark_as_read.short_description = "Mark selected as read"
+    def mark_as_replied(self, request, queryset):
         queryset.update(status='replied')
     mark_as_replied.short_description = "Mark selected as replied"
-    actions = [mark_as_read, mark_as_replied]
+    def export_csv(self, request, queryset):
+        return export_response(queryset, 'csv')
+    export_csv.short_description = "Export selected as CSV"
+    def export_ndjson(self, request, queryset):
+        return export_response(queryset, 'ndjson')
+    export_ndjson.short_description = "Export selected as NDJSON"
+    actions = [mark_as_read, mark_as_replied, export_csv, export_ndjson]
         
 
 # Register your models here.
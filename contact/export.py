@@ -0,0 +1,101 @@
+"""
+Streaming CSV / NDJSON export of contact messages.
+
+Rows are read with ``values_list().iterator(chunk_size=...)`` and encoded one
+at a time into a ``StreamingHttpResponse``, so a worker holds a single chunk
+of rows however large the table is.
+"""
+import csv
+import datetime
+
+import orjson
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import ContactMessage
+
+FIELDS = ['id', 'name', 'email', 'phone', 'subject', 'message', 'status', 'is_read', 'created_at', 'updated_at']
+CHUNK_SIZE = 2000
+
+FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+class Echo:
+    """File-like object whose ``write`` hands the line back to the caller."""
+
+    def write(self, value):
+        return value
+
+
+def parse_bound(value, end=False):
+    """Parse a ``since`` / ``until`` value; a bare date covers that whole day."""
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f"Invalid date '{value}'.")
+        if end:
+            day += datetime.timedelta(days=1)
+        moment = datetime.datetime.combine(day, datetime.time())
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def filter_messages(queryset, status=None, since=None, until=None):
+    """Apply the export filters; raises ValueError on bad input."""
+    if status:
+        statuses = [value for value, _ in ContactMessage.STATUS_CHOICES]
+        if status not in statuses:
+            raise ValueError(f"Unknown status '{status}'.")
+        queryset = queryset.filter(status=status)
+    if since:
+        queryset = queryset.filter(created_at__gte=parse_bound(since))
+    if until:
+        bound = parse_bound(until, end=True)
+        # A bare date includes the whole day; a timestamp is inclusive.
+        lookup = 'created_at__lt' if parse_datetime(until) is None else 'created_at__lte'
+        queryset = queryset.filter(**{lookup: bound})
+    return queryset
+
+
+def ordered(queryset):
+    return queryset.order_by('created_at', 'id').values_list(*FIELDS)
+
+
+def rows(queryset):
+    return ordered(queryset).iterator(chunk_size=CHUNK_SIZE)
+
+
+def csv_value(value):
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    if isinstance(value, str) and value[:1] in ('=', '+', '-', '@', '\t', '\r'):
+        # Submitted by the public: keep spreadsheets from evaluating it as a formula.
+        return "'" + value
+    return value
+
+
+def csv_lines(queryset):
+    writer = csv.writer(Echo())
+    yield writer.writerow(FIELDS)
+    for row in rows(queryset):
+        yield writer.writerow(csv_value(value) for value in row)
+
+
+def ndjson_lines(queryset):
+    for row in rows(queryset):
+        yield orjson.dumps(dict(zip(FIELDS, row)), option=orjson.OPT_UTC_Z | orjson.OPT_APPEND_NEWLINE)
+
+
+def export_response(queryset, export_format):
+    lines = csv_lines(queryset) if export_format == 'csv' else ndjson_lines(queryset)
+    response = StreamingHttpResponse(lines, content_type=FORMATS[export_format])
+    stamp = timezone.now().strftime('%Y%m%d-%H%M%S')
+    response['Content-Disposition'] = f'attachment; filename="contact-messages-{stamp}.{export_format}"'
+    response['Cache-Control'] = 'no-store'
+    return response
@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from contact.outbox import process_outbox
+
+
+class Command(BaseCommand):
+    help = "Deliver queued outbox emails, retrying failures with exponential backoff."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Process one batch and exit")
+        parser.add_argument('--interval', type=float, default=5.0, help="Seconds to sleep when the outbox is idle")
+
+    def handle(self, *args, **options):
+        while True:
+            close_old_connections()
+            sent, failed = process_outbox()
+            if sent or failed:
+                self.stdout.write(f"Sent {sent} email(s), {failed} failed.")
+            if options['once']:
+                return
+            if not (sent or failed):
+                time.sleep(options['interval'])
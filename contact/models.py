@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 
 class ContactMessage(models.Model):
     STATUS_CHOICES = [
@@ -19,8 +20,51 @@ class ContactMessage(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     class Meta:
         ordering = ['-created_at']
+        # The status index also serves the export, which reads it backwards.
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='contact_msg_created_idx'),
+            models.Index(fields=['status', '-created_at', '-id'], name='contact_msg_status_idx'),
+        ]
         verbose_name = 'Contact Message'
         verbose_name_plural = 'contact messages'
     def __str__(self):
         return f"{self.name} - {self.subject}"        
+
+class OutboxEmail(models.Model):
+    """An email waiting to be sent by the ``send_outbox`` worker."""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+    contact_message = models.ForeignKey(
+        ContactMessage, on_delete=models.SET_NULL, null=True, blank=True, related_name='outbox_emails'
+    )
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254, blank=True)
+    to = models.TextField(help_text="Comma-separated recipient addresses")
+    digestible = models.BooleanField(
+        default=False, help_text="May be merged with other notifications into one digest email"
+    )
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    claimed_by = models.CharField(max_length=32, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    class Meta:
+        ordering = ['next_attempt_at', 'id']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='contact_outbox_due_idx'),
+        ]
+    def __str__(self):
+        return f"{self.subject} ({self.status})"
+
+    @property
+    def recipients(self):
+        return [address.strip() for address in self.to.split(',') if address.strip()]
 # Create your models here.
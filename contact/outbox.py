@@ -0,0 +1,174 @@
+"""
+Persistent email outbox.
+
+Requests only insert ``OutboxEmail`` rows; ``manage.py send_outbox`` delivers
+them through Django's configured email backend, retrying failures with
+exponential backoff. In digest mode contact notifications are merged so a
+burst of messages produces one email per ``DIGEST_SIZE`` messages or per
+``DIGEST_WINDOW`` seconds.
+"""
+import logging
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'BATCH_SIZE': 50,
+    'MAX_ATTEMPTS': 5,
+    'RETRY_BACKOFF': 60,
+    'RETRY_BACKOFF_MAX': 60 * 60,
+    'DIGEST': False,
+    'DIGEST_SIZE': 20,
+    'DIGEST_WINDOW': 5 * 60,
+    # How long a worker may hold claimed rows before another worker can retry them.
+    'LEASE': 5 * 60,
+}
+
+
+def outbox_setting(name):
+    return getattr(settings, 'CONTACT_OUTBOX', {}).get(name, DEFAULTS[name])
+
+
+def enqueue(subject, body, to, contact_message=None, digestible=False, from_email=None):
+    return OutboxEmail.objects.create(
+        contact_message=contact_message,
+        subject=subject,
+        body=body,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        to=','.join(to),
+        digestible=digestible,
+    )
+
+
+def enqueue_contact_notification(contact_message):
+    subject = f"New Contact Message:{contact_message.subject}"
+    body = (
+        "New contact message received:\n"
+        f"Name: {contact_message.name}\n"
+        f"Email : {contact_message.email}\n"
+        f"phone : {contact_message.phone or 'Not provided'}\n"
+        f"Subject: {contact_message.subject}\n"
+        "Message:\n"
+        f"{contact_message.message}\n"
+    )
+    return enqueue(subject, body, [settings.ADMIN_EMAIL], contact_message=contact_message, digestible=True)
+
+
+def retry_delay(attempts):
+    delay = outbox_setting('RETRY_BACKOFF') * 2 ** max(attempts - 1, 0)
+    return timedelta(seconds=min(delay, outbox_setting('RETRY_BACKOFF_MAX')))
+
+
+def claim(queryset, now, limit):
+    """Lease up to ``limit`` due rows from ``queryset`` to this worker."""
+    due = queryset.filter(status='pending', next_attempt_at__lte=now).filter(
+        Q(locked_until__isnull=True) | Q(locked_until__lt=now)
+    )
+    ids = list(due.order_by('next_attempt_at', 'id').values_list('id', flat=True)[:limit])
+    if not ids:
+        return []
+    lease = now + timedelta(seconds=outbox_setting('LEASE'))
+    token = uuid.uuid4().hex
+    with transaction.atomic():
+        # Re-check the lease in the UPDATE so two workers never claim a row twice.
+        OutboxEmail.objects.filter(pk__in=ids).filter(
+            Q(locked_until__isnull=True) | Q(locked_until__lt=now)
+        ).update(locked_until=lease, claimed_by=token)
+        return list(OutboxEmail.objects.filter(pk__in=ids, claimed_by=token))
+
+
+def mark_sent(emails, now):
+    OutboxEmail.objects.filter(pk__in=[e.pk for e in emails]).update(
+        status='sent', sent_at=now, locked_until=None, last_error=''
+    )
+
+
+def mark_failed(emails, now, error):
+    max_attempts = outbox_setting('MAX_ATTEMPTS')
+    for email in emails:
+        email.attempts += 1
+        email.last_error = error
+        email.locked_until = None
+        if email.attempts >= max_attempts:
+            email.status = 'failed'
+            logger.error("Giving up on outbox email %s after %s attempts: %s", email.pk, email.attempts, error)
+        else:
+            email.next_attempt_at = now + retry_delay(email.attempts)
+            logger.warning("Outbox email %s failed (attempt %s): %s", email.pk, email.attempts, error)
+    OutboxEmail.objects.bulk_update(emails, ['attempts', 'last_error', 'locked_until', 'status', 'next_attempt_at'])
+
+
+def build_digest(emails):
+    subject = f"{len(emails)} new contact message{'s' if len(emails) > 1 else ''}"
+    separator = "\n" + "-" * 40 + "\n"
+    body = separator.join(email.body for email in emails)
+    return EmailMessage(subject, body, emails[0].from_email, emails[0].recipients)
+
+
+def digest_ready(now):
+    pending = OutboxEmail.objects.filter(status='pending', digestible=True, next_attempt_at__lte=now)
+    if pending.count() >= outbox_setting('DIGEST_SIZE'):
+        return True
+    oldest = pending.order_by('created_at').values_list('created_at', flat=True).first()
+    return oldest is not None and oldest <= now - timedelta(seconds=outbox_setting('DIGEST_WINDOW'))
+
+
+def process_outbox(now=None, connection=None):
+    """
+    Send one batch of due emails and return ``(sent, failed)`` counts, where
+    each digest counts as one email.
+    """
+    now = now or timezone.now()
+    batch_size = outbox_setting('BATCH_SIZE')
+    queryset = OutboxEmail.objects.all()
+    groups = []
+
+    if outbox_setting('DIGEST'):
+        queryset = queryset.filter(digestible=False)
+        if digest_ready(now):
+            digestible = OutboxEmail.objects.filter(digestible=True)
+            claimed = claim(digestible, now, batch_size * outbox_setting('DIGEST_SIZE'))
+            size = outbox_setting('DIGEST_SIZE')
+            groups.extend(
+                (build_digest(claimed[i:i + size]), claimed[i:i + size])
+                for i in range(0, len(claimed), size)
+            )
+
+    for email in claim(queryset, now, batch_size):
+        message = EmailMessage(email.subject, email.body, email.from_email, email.recipients)
+        groups.append((message, [email]))
+
+    if not groups:
+        return 0, 0
+
+    sent = failed = 0
+    connection = connection or get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as e:
+        for _, emails in groups:
+            mark_failed(emails, now, repr(e))
+        return 0, len(groups)
+    try:
+        for message, emails in groups:
+            message.connection = connection
+            try:
+                message.send()
+            except Exception as e:
+                mark_failed(emails, now, repr(e))
+                failed += 1
+            else:
+                mark_sent(emails, now)
+                sent += 1
+    finally:
+        connection.close()
+    return sent, failed
@@ -4,7 +4,7 @@ from .models import ContactMessage
 class ConctactMessageSerializer(serializers.ModelSerializer):
     class Meta:
         model = ContactMessage
-        fiels = ['id', 'name', 'email', 'subject', 'message', 'phone', 'status', 'is_read', 'created_at']
+        fields = ['id', 'name', 'email', 'subject', 'message', 'phone', 'status', 'is_read', 'created_at']
         read_only_fields = ['id', 'status', 'is_read', 'created_at']
     def validate_email(self, value):
         """validate email format"""
@@ -1,3 +1,151 @@
-from django.test import TestCase
+import csv
+import io
+import json
+from datetime import timedelta
 
-# Create your tests here.
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from users.models import User
+from .models import ContactMessage, OutboxEmail
+from .outbox import enqueue_contact_notification, process_outbox
+
+
+class FailingBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise ConnectionRefusedError("SMTP server unavailable")
+
+
+def outbox_settings(**overrides):
+    return {
+        'BATCH_SIZE': 50,
+        'MAX_ATTEMPTS': 3,
+        'RETRY_BACKOFF': 60,
+        'RETRY_BACKOFF_MAX': 3600,
+        'DIGEST': False,
+        'DIGEST_SIZE': 3,
+        'DIGEST_WINDOW': 300,
+        **overrides,
+    }
+
+
+@override_settings(
+    EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+    CONTACT_OUTBOX=outbox_settings(),
+)
+class OutboxTests(TestCase):
+    def create_message(self, n=1):
+        return ContactMessage.objects.create(
+            name=f"Sender {n}", email='sender@example.com', subject=f"Hello {n}", message='A long enough message.'
+        )
+
+    def test_request_queues_instead_of_sending(self):
+        response = APIClient().post(reverse('contact-create'), {
+            'name': 'Sender', 'email': 'Sender@Example.com', 'subject': 'Hi', 'message': 'A long enough message.',
+        })
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(len(mail.outbox), 0)
+        email = OutboxEmail.objects.get()
+        self.assertEqual(email.status, 'pending')
+        self.assertEqual(email.recipients, ['admin@example.com'])
+
+        self.assertEqual(process_outbox(), (1, 0))
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn('A long enough message.', mail.outbox[0].body)
+        self.assertEqual(OutboxEmail.objects.get().status, 'sent')
+
+    @override_settings(EMAIL_BACKEND='contact.tests.FailingBackend')
+    def test_failures_back_off_and_give_up(self):
+        enqueue_contact_notification(self.create_message())
+        now = timezone.now()
+
+        self.assertEqual(process_outbox(now=now), (0, 1))
+        email = OutboxEmail.objects.get()
+        self.assertEqual((email.status, email.attempts), ('pending', 1))
+        self.assertEqual(email.next_attempt_at, now + timedelta(seconds=60))
+        self.assertIn('SMTP server unavailable', email.last_error)
+
+        # Not due yet.
+        self.assertEqual(process_outbox(now=now + timedelta(seconds=30)), (0, 0))
+
+        process_outbox(now=now + timedelta(seconds=60))
+        email.refresh_from_db()
+        self.assertEqual(email.next_attempt_at, now + timedelta(seconds=60 + 120))
+
+        process_outbox(now=now + timedelta(seconds=180))
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), ('failed', 3))
+
+    @override_settings(CONTACT_OUTBOX=outbox_settings(DIGEST=True))
+    def test_digest_by_size(self):
+        for n in range(7):
+            enqueue_contact_notification(self.create_message(n))
+        self.assertEqual(process_outbox(), (3, 0))
+        self.assertEqual([m.subject for m in mail.outbox], [
+            '3 new contact messages', '3 new contact messages', '1 new contact message',
+        ])
+        self.assertFalse(OutboxEmail.objects.filter(status='pending').exists())
+
+    @override_settings(CONTACT_OUTBOX=outbox_settings(DIGEST=True))
+    def test_digest_waits_for_the_window(self):
+        enqueue_contact_notification(self.create_message())
+        self.assertEqual(process_outbox(), (0, 0))
+        self.assertEqual(process_outbox(now=timezone.now() + timedelta(seconds=301)), (1, 0))
+        self.assertEqual(len(mail.outbox), 1)
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_superuser(email='admin@example.com', password='secret', full_name='Admin')
+        self.client.force_authenticate(self.admin)
+        for n, status in enumerate(['new', 'read', 'new']):
+            ContactMessage.objects.create(
+                name=f"Sender {n}", email='s@example.com', subject=f"Hello {n}",
+                message='=HYPERLINK("x")' if n == 0 else 'Plain, "quoted"\nmultiline', status=status,
+            )
+        ContactMessage.objects.filter(name='Sender 2').update(created_at=timezone.now() - timedelta(days=10))
+
+    def export(self, export_format, **params):
+        response = self.client.get(reverse('contact-export', kwargs={'export_format': export_format}), params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_csv(self):
+        rows = list(csv.reader(io.StringIO(self.export('csv'))))
+        self.assertEqual(rows[0][:3], ['id', 'name', 'email'])
+        self.assertEqual([row[1] for row in rows[1:]], ['Sender 2', 'Sender 0', 'Sender 1'])
+        self.assertEqual(rows[2][5], '\'=HYPERLINK("x")')
+        self.assertEqual(rows[3][5], 'Plain, "quoted"\nmultiline')
+
+    def test_ndjson_with_filters(self):
+        since = (timezone.now() - timedelta(days=1)).date().isoformat()
+        lines = self.export('ndjson', status='new', since=since).splitlines()
+        self.assertEqual([json.loads(line)['name'] for line in lines], ['Sender 0'])
+
+    def test_bad_input(self):
+        url = reverse('contact-export', kwargs={'export_format': 'csv'})
+        self.assertEqual(self.client.get(url, {'status': 'bogus'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'until': 'yesterday'}).status_code, 400)
+        self.assertEqual(self.client.get(reverse('contact-export', kwargs={'export_format': 'xml'})).status_code, 404)
+
+    def test_admins_only(self):
+        self.client.force_authenticate(None)
+        response = self.client.get(reverse('contact-export', kwargs={'export_format': 'csv'}))
+        self.assertEqual(response.status_code, 401)
+
+    def test_admin_action(self):
+        self.client.logout()
+        self.client = Client()
+        self.client.force_login(self.admin)
+        response = self.client.post(reverse('admin:contact_contactmessage_changelist'), {
+            'action': 'export_ndjson',
+            '_selected_action': list(ContactMessage.objects.values_list('pk', flat=True)),
+        })
+        self.assertTrue(response.streaming)
+        self.assertEqual(len(b''.join(response.streaming_content).splitlines()), 3)
@@ -2,11 +2,13 @@ from django.urls import path
 from .views import (
     ContactMessageCreateView,
     ContactMessageListView,
-    ContactMessageDetailView
+    ContactMessageDetailView,
+    ContactMessageExportView,
 )
 
 urlpatterns = [
     path('', ContactMessageCreateView.as_view(), name='contact-create'),
     path('messages/', ContactMessageListView.as_view(), name='contact-list'),
     path('messages/<int:pk>/', ContactMessageDetailView.as_view(), name='contact-detail'),
+    path('messages/export.<str:export_format>', ContactMessageExportView.as_view(), name='contact-export'),
 ]
\ No newline at end of file
@@ -1,12 +1,16 @@
 from django.shortcuts import render
 from rest_framework import generics, permissions, status
+from rest_framework.exceptions import NotFound, ParseError
 from rest_framework.response import Response
-from django.core.mail  import send_mail
-from django.conf import settings
+from rest_framework.views import APIView
+from django.db import transaction
+from core.metrics import SerializerTimingMixin
+from .export import FORMATS, export_response, filter_messages
 from .models import ContactMessage
+from .outbox import enqueue_contact_notification
 from .serializers import ConctactMessageSerializer
 
-class ContactMessageCreateView(generics.CreateAPIView):
+class ContactMessageCreateView(SerializerTimingMixin, generics.CreateAPIView):
     serializer_class = ConctactMessageSerializer
     permission_classes = [permissions.AllowAny]
     
@@ -14,45 +18,45 @@ class ContactMessageCreateView(generics.CreateAPIView):
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        contact_message = serializer.save()
-
-        try:
-            self.send_notification_email(contact_message)
-        except Exception as e:
-            print(f"Email sending failed: {e}")
+        with transaction.atomic():
+            contact_message = serializer.save()
+            # Delivered by `manage.py send_outbox`, outside the request.
+            enqueue_contact_notification(contact_message)
         return Response({
             'message': 'Thank you for contacting us!We will get back to you soon',
             'data': serializer.data
 
         }, status=status.HTTP_201_CREATED)
-    def send_notification_email(self, contact_message):
-        subject = f"New Contact Message:{contact_message.subject}"
-        message = f"""
-        New contact message received:
-        Name: {contact_message.name}
-        Email : {contact_message.email}
-        phone : {contact_message.phone or 'Not provided'}
-        Subject: {contact_message.subject}
-    Message: 
-    {contact_message.message}
-    """
-        
-        send_mail(
-            subject,
-            message,
-            settings.DEFAULT_FROM_EMAIL,
-            [settings.ADMIN_EMAIL],
-            fail_silently=False
 
-        )
-
-class ContactMessageListView(generics.ListAPIView):
+class ContactMessageListView(SerializerTimingMixin, generics.ListAPIView):
     queryset = ContactMessage.objects.all()
     serializer_class = ConctactMessageSerializer
     permission_classes = [permissions.IsAdminUser]
-class ContactMessageDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ContactMessageDetailView(SerializerTimingMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = ContactMessage.objects.all()
     serializer_class = ConctactMessageSerializer
     permission_classes = [permissions.IsAdminUser]
+
+
+class ContactMessageExportView(APIView):
+    """
+    Stream every message as CSV or NDJSON, optionally filtered by
+    ``?status=``, ``?since=`` and ``?until=`` (ISO dates or datetimes).
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, export_format):
+        if export_format not in FORMATS:
+            raise NotFound(f"Unsupported export format '{export_format}'.")
+        try:
+            queryset = filter_messages(
+                ContactMessage.objects.all(),
+                status=request.query_params.get('status'),
+                since=request.query_params.get('since'),
+                until=request.query_params.get('until'),
+            )
+        except ValueError as e:
+            raise ParseError(str(e))
+        return export_response(queryset, export_format)
     
 # Create your views here.
@@ -0,0 +1,147 @@
+"""
+Async read path for the public endpoints, used by the ASGI deployment.
+
+DRF views are synchronous, so under ASGI each request would be handed to a
+worker thread. An ``AsyncReadView`` serves the common case natively instead:
+an anonymous JSON ``GET`` carrying only the query parameters listed in
+``async_params`` has its validators, page and payload fetched with the async
+ORM and is rendered with ``ORJSONRenderer``. The DRF view in ``drf_view``
+still owns the queryset, filters, serializer, validators and cache tags, so
+both paths return the same bytes and share ``response_cache`` entries.
+
+Everything else (writes, authenticated or browsable requests, MessagePack,
+FK filters that would validate against the database, errors) is passed to
+``drf_view`` unchanged.
+"""
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import ObjectDoesNotExist
+from django.http import Http404, HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import APIException
+
+from .db import use_primary
+from .renderers import ORJSONRenderer
+from .response_cache import (
+    CachedResponseMixin,
+    build_response,
+    cache_key,
+    is_cacheable_request,
+    response_cache,
+)
+
+
+class AsyncReadView(View):
+    drf_view = None
+    async_params = frozenset()
+    fallback = None
+
+    # Only the renderer the async path produces; the others go to DRF.
+    media_types = ['application/json', 'text/html', 'application/msgpack']
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        fallback = sync_to_async(cls.drf_view.as_view())
+        return csrf_exempt(super().as_view(fallback=fallback, **initkwargs))
+
+    def can_serve(self, request):
+        accept = request.META.get('HTTP_ACCEPT', '')
+        return (
+            request.method in ('GET', 'HEAD')
+            and 'HTTP_AUTHORIZATION' not in request.META
+            and set(request.GET) <= self.async_params
+            and request.get_preferred_type(self.media_types) == 'application/json'
+            and 'indent' not in accept
+        )
+
+    async def dispatch(self, request, *args, **kwargs):
+        if not self.can_serve(request):
+            return await self.fallback(request, *args, **kwargs)
+        return await self.get(request, *args, **kwargs)
+
+    async def get(self, request, *args, **kwargs):
+        try:
+            return await self.serve(request, *args, **kwargs)
+        except (APIException, Http404, ObjectDoesNotExist):
+            # Let DRF build the error response exactly as it always has.
+            return await self.fallback(request, *args, **kwargs)
+
+    def get_drf_view(self, request, *args, **kwargs):
+        drf = self.drf_view(args=args, kwargs=kwargs)
+        drf.request = drf.initialize_request(request, *args, **kwargs)
+        # Only requests without credentials get here; resolving the user
+        # through the authenticators would run their cache lookups on the
+        # event loop.
+        drf.request.user, drf.request.auth = AnonymousUser(), None
+        drf.format_kwarg = None
+        drf.headers = drf.default_response_headers
+        drf.check_permissions(drf.request)
+        return drf
+
+    async def serve(self, request, *args, **kwargs):
+        drf = self.get_drf_view(request, *args, **kwargs)
+        cacheable = bool(getattr(drf, 'cache_tags', None)) and is_cacheable_request(request)
+        if cacheable:
+            key = cache_key(request)
+            entry = await response_cache.aget(key)
+            if entry is not None:
+                if type(drf).cache_hit is not CachedResponseMixin.cache_hit:
+                    await sync_to_async(drf.cache_hit)(request, entry.meta)
+                return build_response(request, entry)
+            tags = drf.get_cache_tags()
+            versions = await response_cache.atag_versions(tags)
+
+        if cacheable:
+            # The entry is stored under the versions just read; build it from the primary.
+            with use_primary():
+                response = await drf.aconditional_response(drf.request, self.render, drf)
+        else:
+            response = await drf.aconditional_response(drf.request, self.render, drf)
+        # As APIView.finalize_response does.
+        headers = dict(drf.headers)
+        vary = headers.pop('Vary', None)
+        if vary is not None:
+            patch_vary_headers(response, [value.strip() for value in vary.split(',')])
+        for name, value in headers.items():
+            response[name] = value
+        if cacheable and response.status_code == 200:
+            response_cache.set(key, response, tags, versions, drf.get_cache_meta())
+            response['X-Cache'] = 'MISS'
+        return response
+
+    async def render(self, request, drf):
+        data, status = await self.get_data(drf)
+        renderer = ORJSONRenderer()
+        return HttpResponse(renderer.render(data), status=status, content_type=renderer.media_type)
+
+    async def get_data(self, drf):
+        """Return ``(data, status)`` for the response body."""
+        raise NotImplementedError
+
+
+class AsyncListView(AsyncReadView):
+    async_params = frozenset({'cursor', 'page_size'})
+
+    async def get_data(self, drf):
+        queryset = drf.filter_queryset(drf.get_queryset())
+        if drf.paginator is None:
+            rows = [row async for row in queryset]
+            return drf.get_serializer(rows, many=True).data, 200
+        page = await drf.paginator.apaginate_queryset(queryset, drf.request, view=drf)
+        data = drf.get_serializer(page, many=True).data
+        return drf.paginator.get_paginated_response(data).data, 200
+
+
+class AsyncDetailView(AsyncReadView):
+    async def get_object(self, drf):
+        queryset = drf.filter_queryset(drf.get_queryset())
+        lookup_url_kwarg = drf.lookup_url_kwarg or drf.lookup_field
+        instance = await queryset.aget(**{drf.lookup_field: drf.kwargs[lookup_url_kwarg]})
+        drf.check_object_permissions(drf.request, instance)
+        return instance
+
+    async def get_data(self, drf):
+        instance = drf.object = await self.get_object(drf)
+        return drf.get_serializer(instance).data, 200
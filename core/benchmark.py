@@ -0,0 +1,202 @@
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connection, connections
+from django.test import override_settings
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+
+@contextmanager
+def benchmark_database():
+    """
+    Run the block against a throwaway, fully migrated SQLite file and a
+    throwaway ``MEDIA_ROOT``.
+
+    A file (rather than the in-memory test database) is used so that
+    concurrent worker threads contend on the same write lock a real
+    deployment would. Files the seeded rows produce (feeds and sitemaps
+    for published posts) are written synchronously into the temporary
+    ``MEDIA_ROOT``, so none outlive the database.
+    """
+    handle, path = tempfile.mkstemp(prefix='benchmark-', suffix='.sqlite3')
+    os.close(handle)
+    test_settings = connection.settings_dict.setdefault('TEST', {})
+    previous_test_name = test_settings.get('NAME')
+    test_settings['NAME'] = path
+    old_name = connection.settings_dict['NAME']
+
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        with tempfile.TemporaryDirectory(prefix='benchmark-media-') as media_root, override_settings(
+            MEDIA_ROOT=media_root,
+            BLOG_SYNDICATION={**getattr(settings, 'BLOG_SYNDICATION', {}), 'ASYNC': False},
+        ):
+            yield path
+    finally:
+        connections.close_all()
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+        test_settings['NAME'] = previous_test_name
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def seed_posts(count):
+    """
+    Fill the benchmark database with ``count`` posts and their authors,
+    comments and the portfolio sections from ``core.synthetic_data``; return
+    the published posts, most read first.
+    """
+    from blog.models import Post
+
+    from .synthetic_data import Counts, generate
+
+    generate(Counts(users=max(10, count // 10), posts=count, comments=count * 20, contact_messages=0, projects=0))
+    return Post.objects.filter(status='published').order_by('-views_count', 'pk')
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def run_concurrently(func, threads, iterations):
+    """
+    Call ``func(worker_index, iteration)`` ``iterations`` times in each of
+    ``threads`` threads and return throughput and latency figures.
+    """
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(threads)
+
+    def worker(index):
+        local = []
+        barrier.wait()
+        try:
+            for iteration in range(iterations):
+                started = time.perf_counter()
+                try:
+                    func(index, iteration)
+                except Exception as e:
+                    with lock:
+                        errors.append(repr(e))
+                    continue
+                local.append(time.perf_counter() - started)
+        finally:
+            connections.close_all()
+            with lock:
+                latencies.extend(local)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return summarize(latencies, errors, elapsed)
+
+
+async def run_async_concurrently(func, tasks, iterations):
+    """
+    ``run_concurrently`` for coroutines: await ``func(task_index, iteration)``
+    ``iterations`` times in each of ``tasks`` tasks on the running loop.
+    """
+    latencies = []
+    errors = []
+
+    async def task(index):
+        for iteration in range(iterations):
+            started = time.perf_counter()
+            try:
+                await func(index, iteration)
+            except Exception as e:
+                errors.append(repr(e))
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(task(i) for i in range(tasks)))
+    elapsed = time.perf_counter() - started
+    await sync_to_async(connections.close_all)()
+    return summarize(latencies, errors, elapsed)
+
+
+def summarize(latencies, errors, elapsed):
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'seconds': elapsed,
+        'throughput': len(latencies) / elapsed if elapsed else 0.0,
+        'mean_ms': statistics.fmean(latencies) * 1000 if latencies else 0.0,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_results(path, results, **parameters):
+    """Write ``{name: summary}`` to ``path`` as JSON, with the commit and run parameters."""
+    document = {
+        'commit': git_revision(),
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'parameters': parameters,
+        'results': results,
+    }
+    with open(path, 'w') as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+    return document
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+COMPARED = ('throughput', 'p50_ms', 'p95_ms', 'p99_ms')
+
+
+def compare(baseline, results, tolerance=0.1):
+    """
+    Relative change of each ``COMPARED`` figure against ``baseline`` (a
+    ``save_results`` document), as ``{name: {figure: (before, after, change,
+    regressed)}}``. A figure regresses when it moves the wrong way by more
+    than ``tolerance``: throughput down, latency up.
+    """
+    changes = {}
+    for name, summary in results.items():
+        before = baseline['results'].get(name)
+        if before is None:
+            continue
+        figures = {}
+        for figure in COMPARED:
+            old, new = before[figure], summary[figure]
+            change = (new - old) / old if old else 0.0
+            worse = -change if figure == 'throughput' else change
+            figures[figure] = (old, new, change, worse > tolerance)
+        changes[name] = figures
+    return changes
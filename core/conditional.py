@@ -0,0 +1,101 @@
+"""
+Conditional GET support (ETag / Last-Modified) for read-only API views.
+
+Validators come from a cheap aggregate over the rows a response is built
+from: ``MAX(<timestamp>)`` plus ``COUNT(*)``, which also changes when rows
+are deleted or leave the filter. A matching ``If-None-Match`` or
+``If-Modified-Since`` is answered with ``304 Not Modified`` before the view
+fetches or serializes anything; views that count reads do so in
+``not_modified``.
+"""
+import hashlib
+
+from asgiref.sync import sync_to_async
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+
+class ConditionalGetMixin:
+    """
+    Add to list and detail generic views. ``last_modified_field`` names the
+    timestamp column to aggregate; views whose representation also depends
+    on other rows (nested comments, post counts) extend
+    ``get_validator_querysets``.
+    """
+    last_modified_field = 'updated_at'
+
+    def get_validator_querysets(self):
+        """Return ``(queryset, timestamp_field)`` pairs the response depends on."""
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_url_kwarg in self.kwargs:
+            queryset = queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        return [(queryset, self.last_modified_field)]
+
+    def get_validators(self, request):
+        aggregates = [
+            queryset.order_by().values('pk').aggregate(modified=Max(field), count=Count('pk'), pk=Max('pk'))
+            for queryset, field in self.get_validator_querysets()
+        ]
+        return self.build_validators(request, aggregates)
+
+    async def aget_validators(self, request):
+        """``get_validators`` for async views."""
+        aggregates = [
+            await queryset.order_by().values('pk').aaggregate(modified=Max(field), count=Count('pk'), pk=Max('pk'))
+            for queryset, field in self.get_validator_querysets()
+        ]
+        return self.build_validators(request, aggregates)
+
+    def build_validators(self, request, aggregates):
+        # Kept for ``not_modified``; on a detail view the first ``pk`` is the object's.
+        self.validator_aggregates = aggregates
+        parts = [request.get_full_path(), str(getattr(request.user, 'pk', None))]
+        last_modified = None
+        for values in aggregates:
+            parts.append(f"{values['modified']}:{values['count']}")
+            if values['modified'] and (last_modified is None or values['modified'] > last_modified):
+                last_modified = values['modified']
+        etag = quote_etag(hashlib.md5('|'.join(parts).encode()).hexdigest())
+        return etag, last_modified
+
+    def get(self, request, *args, **kwargs):
+        return self.conditional_response(request, super().get, *args, **kwargs)
+
+    def not_modified(self, request):
+        """
+        Called instead of the handler when the client's copy is current;
+        ``self.validator_aggregates`` holds the aggregates the answer used.
+        """
+
+    def conditional_response(self, request, handler, *args, **kwargs):
+        """Answer 304 when the client's copy is current, otherwise call ``handler``."""
+        etag, last_modified = self.get_validators(request)
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        elif response.status_code == 304:
+            self.not_modified(request)
+        return self.set_validators(response, etag, timestamp)
+
+    async def aconditional_response(self, request, handler, *args, **kwargs):
+        """``conditional_response`` for async views; ``handler`` is awaited."""
+        etag, last_modified = await self.aget_validators(request)
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = await handler(request, *args, **kwargs)
+        elif response.status_code == 304 and type(self).not_modified is not ConditionalGetMixin.not_modified:
+            await sync_to_async(self.not_modified)(request)
+        return self.set_validators(response, etag, timestamp)
+
+    def set_validators(self, response, etag, timestamp):
+        if response.status_code in (200, 304):
+            if etag:
+                response['ETag'] = etag
+            if timestamp is not None:
+                response['Last-Modified'] = http_date(timestamp)
+            patch_vary_headers(response, ('Accept', 'Authorization'))
+        return response
@@ -0,0 +1,107 @@
+"""
+Database tuning and read-replica routing.
+
+``sqlite_options`` builds the ``OPTIONS`` for a SQLite alias: WAL journaling
+and the pragmas below are applied by ``init_command`` on every new
+connection, and replicas are opened ``query_only``.
+
+``ReplicaRouter`` sends reads to one of ``DATABASE_REPLICAS`` (aliases in
+``DATABASES`` holding a copy of ``default``) and everything else to
+``default``. Reads stay on ``default`` inside a transaction, inside
+``use_primary()`` and for the rest of a request with an unsafe method
+(``PrimaryForWritesMiddleware``), so a client always reads what it has just
+written.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+PRAGMAS = {
+    'journal_mode': 'WAL',
+    # Durable across crashes with WAL; only a power loss can drop the last commits.
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'cache_size': -64 * 1024,  # KiB, i.e. 64 MiB per connection
+    'mmap_size': 256 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+_use_primary = ContextVar('use_primary', default=False)
+
+
+def sqlite_options(replica=False, **pragmas):
+    pragmas = {**PRAGMAS, **pragmas}
+    options = {}
+    if replica:
+        # The journal mode is stored in the file, so a copy keeps the primary's.
+        del pragmas['journal_mode']
+        pragmas['query_only'] = 1
+    else:
+        # Take the write lock at BEGIN so concurrent writers wait on
+        # busy_timeout instead of failing to upgrade a read lock.
+        options['transaction_mode'] = 'IMMEDIATE'
+    options['init_command'] = ''.join(f"PRAGMA {name}={value};" for name, value in pragmas.items())
+    return options
+
+
+@contextmanager
+def use_primary():
+    """Route reads in this block (and the tasks it starts) to ``default``."""
+    token = _use_primary.set(True)
+    try:
+        yield
+    finally:
+        _use_primary.reset(token)
+
+
+class ReplicaRouter:
+    def replicas(self):
+        return getattr(settings, 'DATABASE_REPLICAS', [])
+
+    def db_for_read(self, model, **hints):
+        replicas = self.replicas()
+        if not replicas or _use_primary.get() or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Every alias holds the same rows.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in self.replicas()
+
+
+class PrimaryForWritesMiddleware:
+    """Serve every query of a POST/PUT/PATCH/DELETE request from ``default``."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if request.method in SAFE_METHODS:
+            return self.get_response(request)
+        with use_primary():
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        if request.method in SAFE_METHODS:
+            return await self.get_response(request)
+        with use_primary():
+            return await self.get_response(request)
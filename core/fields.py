@@ -0,0 +1,32 @@
+from rest_framework import serializers
+
+from .images import FORMATS, derivative_name, derivative_widths
+
+
+class ImageSrcsetField(serializers.Field):
+    """
+    Read-only companion to an ImageField that lists the resized derivatives
+    as ``srcset`` strings, one per format, alongside the original URL.
+    Only URLs are built here; missing files are rendered on first request.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        if not value or not value.name:
+            return None
+        request = self.context.get('request')
+
+        def url(name):
+            location = value.storage.url(name)
+            return request.build_absolute_uri(location) if request is not None else location
+
+        representation = {'original': url(value.name)}
+        for ext in FORMATS:
+            representation[ext] = ', '.join(
+                f"{url(derivative_name(value.name, width, ext))} {width}w"
+                for width in derivative_widths()
+            )
+        return representation
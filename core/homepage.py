@@ -0,0 +1,78 @@
+"""
+Precomputed payload for the homepage.
+
+Every section the frontend needs on first paint is serialized once into a
+snapshot stored in the default cache. ``core.signals`` drops it after any
+of the underlying models is saved or deleted and the next request rebuilds
+it (from the primary), so a homepage request normally costs a single cache
+read.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+from .db import use_primary
+from .models import (
+    SiteSettings,
+    Skill,
+    Service,
+    Testimonial,
+    Experience,
+    Education,
+    SocialLink,
+)
+from .serializers import (
+    SiteSettingsSerializer,
+    SkillSerializer,
+    ServiceSerializer,
+    TestimonialSerializer,
+    ExperienceSerializer,
+    EducationSerializer,
+    SocialLinkSerializer,
+)
+from .site_settings import get_site_settings
+
+HOMEPAGE_CACHE_KEY = 'core:homepage'
+HOMEPAGE_GENERATION_KEY = 'core:homepage:generation'
+
+HOMEPAGE_MODELS = (SiteSettings, Skill, Service, Testimonial, Experience, Education, SocialLink)
+
+
+def build_homepage():
+    site_settings = get_site_settings()
+    return {
+        'site_settings': SiteSettingsSerializer(site_settings).data if site_settings else None,
+        'skills': SkillSerializer(Skill.objects.filter(is_featured=True), many=True).data,
+        'services': ServiceSerializer(Service.objects.filter(is_active=True), many=True).data,
+        'testimonials': TestimonialSerializer(
+            Testimonial.objects.filter(is_approved=True), many=True
+        ).data,
+        'experience': ExperienceSerializer(Experience.objects.all(), many=True).data,
+        'education': EducationSerializer(Education.objects.all(), many=True).data,
+        'social_links': SocialLinkSerializer(SocialLink.objects.filter(is_visible=True), many=True).data,
+    }
+
+
+def cache_timeout():
+    # Durations in the experience and education sections are relative to
+    # today, so the snapshot also expires on its own.
+    return getattr(settings, 'CORE_HOMEPAGE_CACHE_TIMEOUT', 60 * 60)
+
+
+def invalidate_homepage():
+    try:
+        cache.incr(HOMEPAGE_GENERATION_KEY)
+    except ValueError:
+        cache.set(HOMEPAGE_GENERATION_KEY, 1, None)
+    cache.delete(HOMEPAGE_CACHE_KEY)
+
+
+def get_homepage():
+    snapshot = cache.get(HOMEPAGE_CACHE_KEY)
+    if snapshot is None:
+        generation = cache.get(HOMEPAGE_GENERATION_KEY, 0)
+        with use_primary():
+            snapshot = build_homepage()
+        # Don't store a snapshot built from data that changed while we read it.
+        if cache.get(HOMEPAGE_GENERATION_KEY, 0) == generation:
+            cache.set(HOMEPAGE_CACHE_KEY, snapshot, cache_timeout())
+    return snapshot
@@ -0,0 +1,174 @@
+"""
+Resized WebP/JPEG derivatives for every ImageField in the project.
+
+After an upload is committed the original is handed to a process pool that
+writes ``derivatives/<original name>.<width>w.<webp|jpg>`` next to it in
+``MEDIA_ROOT``. Serializers advertise those files through
+``core.fields.ImageSrcsetField`` without touching storage. A derivative
+that does not exist yet (older uploads, a crashed worker) is rendered on its
+first request by ``core.views.image_derivative``; in production the web
+server should serve ``MEDIA_ROOT`` directly and fall back to Django only for
+missing files.
+"""
+import atexit
+import logging
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import models, transaction
+from django.db.models.signals import post_init, post_save
+
+logger = logging.getLogger(__name__)
+
+DERIVATIVE_PREFIX = 'derivatives/'
+FORMATS = {
+    'webp': ('WEBP', 'image/webp'),
+    'jpg': ('JPEG', 'image/jpeg'),
+}
+DERIVATIVE_RE = re.compile(r'^(?P<source>.+)\.(?P<width>\d+)w\.(?P<ext>webp|jpg)$')
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def derivative_widths():
+    return tuple(getattr(settings, 'IMAGE_DERIVATIVE_WIDTHS', (320, 640, 1024, 1600)))
+
+
+def derivative_name(name, width, ext):
+    return f"{DERIVATIVE_PREFIX}{name}.{width}w.{ext}"
+
+
+def parse_derivative_name(name):
+    """Return ``(source_name, width, ext)`` for a valid derivative name, else None."""
+    if not name.startswith(DERIVATIVE_PREFIX):
+        return None
+    match = DERIVATIVE_RE.match(name[len(DERIVATIVE_PREFIX):])
+    if not match or int(match['width']) not in derivative_widths():
+        return None
+    return match['source'], int(match['width']), match['ext']
+
+
+def render(source_path, targets):
+    """
+    Write each ``(width, ext, target_path)`` derivative of ``source_path``.
+    Runs in a worker process, so it only deals with local paths.
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(source_path) as original:
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+        for width, ext, target_path in targets:
+            resized = image.copy()
+            if resized.width > width:
+                resized.thumbnail((width, round(resized.height * width / resized.width)), Image.LANCZOS)
+            image_format = FORMATS[ext][0]
+            if image_format == 'JPEG' and resized.mode != 'RGB':
+                resized = resized.convert('RGB')
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            partial = f"{target_path}.{os.getpid()}.part"
+            resized.save(partial, image_format, quality=82, optimize=True)
+            os.replace(partial, target_path)
+    return len(targets)
+
+
+def missing_targets(name, storage=default_storage, widths=None, exts=None):
+    targets = []
+    for width in widths or derivative_widths():
+        for ext in exts or FORMATS:
+            target = derivative_name(name, width, ext)
+            if not storage.exists(target):
+                targets.append((width, ext, storage.path(target)))
+    return targets
+
+
+def generate_derivatives(name, storage=default_storage, widths=None, exts=None):
+    """Render the missing derivatives of ``name`` in this process."""
+    targets = missing_targets(name, storage, widths, exts)
+    if targets:
+        render(storage.path(name), targets)
+    return len(targets)
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=getattr(settings, 'IMAGE_DERIVATIVE_WORKERS', 2))
+        return _executor
+
+
+def schedule_derivatives(name, storage=default_storage):
+    """Queue derivative generation for ``name`` on the process pool."""
+    try:
+        targets = missing_targets(name, storage)
+        source_path = storage.path(name)
+    except NotImplementedError:
+        # Remote storage: nothing local to hand to the pool; derivatives
+        # are rendered lazily when first requested.
+        return None
+    if not targets:
+        return None
+    if not getattr(settings, 'IMAGE_DERIVATIVE_ASYNC', True):
+        return render(source_path, targets)
+    future = get_executor().submit(render, source_path, targets)
+    future.add_done_callback(_log_failure(name))
+    return future
+
+
+def _log_failure(name):
+    def callback(future):
+        if future.exception() is not None:
+            logger.warning("Generating derivatives for %s failed: %r", name, future.exception())
+    return callback
+
+
+def _image_fields(model):
+    return [field for field in model._meta.fields if isinstance(field, models.ImageField)]
+
+
+def _loaded_name(instance, field):
+    # Read from __dict__ so deferred fields are not fetched.
+    value = instance.__dict__.get(field.attname)
+    return getattr(value, 'name', value) or None
+
+
+def _remember_loaded_images(sender, instance, **kwargs):
+    instance._loaded_images = {field.attname: _loaded_name(instance, field) for field in _image_fields(sender)}
+
+
+def _image_saved(sender, instance, update_fields=None, raw=False, **kwargs):
+    if raw:
+        return
+    loaded = instance.__dict__.setdefault('_loaded_images', {})
+    for field in _image_fields(sender):
+        if update_fields is not None and field.name not in update_fields:
+            continue
+        file = getattr(instance, field.attname)
+        # Checking for the derivatives costs a storage lookup per width and
+        # format, so only do it when a different file was saved.
+        if file and file.name and file.name != loaded.get(field.attname):
+            transaction.on_commit(lambda name=file.name, storage=file.storage: schedule_derivatives(name, storage))
+        loaded[field.attname] = file.name if file else None
+
+
+def connect_image_fields():
+    """Generate derivatives after saves of any model that has an ImageField."""
+    for model in apps.get_models():
+        if _image_fields(model):
+            dispatch_uid = f'image-derivatives-{model._meta.label}'
+            post_init.connect(_remember_loaded_images, sender=model, dispatch_uid=dispatch_uid)
+            post_save.connect(_image_saved, sender=model, dispatch_uid=dispatch_uid)
+
+
+@atexit.register
+def _shutdown_executor():
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,123 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from blog.view_counter import view_counter
+from core.benchmark import benchmark_database, compare, load_results, run_concurrently, save_results, seed_posts
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test the public read endpoints against a throwaway database "
+        "seeded by core.synthetic_data and report throughput and p50/p95/p99 "
+        "latency per endpoint. --output saves the figures as JSON; --compare "
+        "checks them against an earlier run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8, help="Concurrent client threads")
+        parser.add_argument('--requests', type=int, default=400, help="Requests per endpoint")
+        parser.add_argument('--posts', type=int, default=200)
+        parser.add_argument('--endpoint', action='append', dest='endpoints', help="Only these endpoints (repeatable)")
+        parser.add_argument('--output', help="Write the results to this JSON file")
+        parser.add_argument('--compare', help="JSON results of an earlier run to compare against")
+        parser.add_argument(
+            '--tolerance', type=float, default=0.1,
+            help="Relative change tolerated before --compare reports a regression",
+        )
+        parser.add_argument(
+            '--fail-on-regression', action='store_true', help="Exit with an error if --compare finds a regression",
+        )
+        parser.add_argument(
+            '--response-cache', action='store_true',
+            help="Leave the response cache on (by default every request reaches the database)",
+        )
+
+    def handle(self, *args, **options):
+        threads = options['threads']
+        iterations = max(1, options['requests'] // threads)
+        baseline = load_results(options['compare']) if options['compare'] else None
+        cache = {} if options['response_cache'] else {'RESPONSE_CACHE': {'ENABLED': False}}
+
+        results = {}
+        overrides = {'BLOG_VIEW_COUNT_FLUSH_INTERVAL': 3600, 'QUERY_WATCH': {'ENABLED': False}, **cache}
+        with benchmark_database(), override_settings(**overrides):
+            endpoints = self.create_data(options['posts'])
+            if options['endpoints']:
+                unknown = set(options['endpoints']) - set(endpoints)
+                if unknown:
+                    raise CommandError(f"Unknown endpoints: {', '.join(sorted(unknown))}")
+                endpoints = {name: endpoints[name] for name in options['endpoints']}
+
+            clients = [Client() for _ in range(threads)]
+            for name, urls in endpoints.items():
+                def fetch(worker, iteration, urls=urls):
+                    response = clients[worker].get(urls[(worker * 7 + iteration) % len(urls)])
+                    if response.status_code != 200:
+                        raise RuntimeError(f"HTTP {response.status_code}")
+
+                view_counter.clear()
+                # One untimed pass so every endpoint starts with warm connections.
+                run_concurrently(fetch, threads, 1)
+                results[name] = run_concurrently(fetch, threads, iterations)
+                self.report(name, results[name])
+            view_counter.clear()
+
+        if options['output']:
+            save_results(
+                options['output'], results, threads=threads, requests=options['requests'],
+                posts=options['posts'], response_cache=options['response_cache'],
+            )
+            self.stdout.write(f"Results written to {options['output']}")
+        if baseline is not None:
+            regressions = self.report_comparison(baseline, results, options['tolerance'])
+            if regressions and options['fail_on_regression']:
+                raise CommandError(f"{regressions} figures regressed against {options['compare']}")
+
+    def report(self, name, result):
+        self.stdout.write(
+            f"{name:>17}: {result['throughput']:8.1f} req/s  "
+            f"p50 {result['p50_ms']:7.2f} ms  p95 {result['p95_ms']:7.2f} ms  "
+            f"p99 {result['p99_ms']:7.2f} ms  errors {result['errors']}"
+        )
+
+    def report_comparison(self, baseline, results, tolerance):
+        self.stdout.write(f"\nAgainst {baseline.get('commit') or 'baseline'} ({baseline.get('created')}):")
+        regressions = 0
+        for name, figures in compare(baseline, results, tolerance).items():
+            cells = []
+            for figure, (old, new, change, regressed) in figures.items():
+                regressions += regressed
+                cells.append(f"{figure} {old:.1f} -> {new:.1f} ({change:+.0%}){' !' if regressed else ''}")
+            line = f"{name:>17}: " + '  '.join(cells)
+            self.stdout.write(self.style.ERROR(line) if any(f[3] for f in figures.values()) else line)
+        return regressions
+
+    def create_data(self, count):
+        published = seed_posts(count)
+        # The most read and most commented posts, as real traffic would hit them.
+        posts = list(published.values_list('slug', flat=True)[:50])
+        commented = list(
+            published.annotate(comment_count=Count('comments')).order_by('-comment_count', 'pk')
+            .values_list('pk', flat=True)[:20]
+        )
+
+        return {
+            'post-list': [reverse('post-list-create')],
+            'post-detail': [reverse('post-detail', kwargs={'slug': slug}) for slug in posts],
+            'featured-posts': [reverse('featured-posts')],
+            'categories': [reverse('category-list')],
+            'tags': [reverse('tag-list')],
+            'comments': [reverse('comment-list-create', kwargs={'post_id': pk}) for pk in commented],
+            'feed': [reverse('feed', kwargs={'name': 'rss.xml'})],
+            'sitemap': [reverse('sitemap-shard', kwargs={'shard': 1})],
+            'homepage': [reverse('homepage')],
+            'site-settings': [reverse('site-settings')],
+            'skills': [reverse('skill-list')],
+            'services': [reverse('service-list')],
+            'testimonials': [reverse('testimonial-list-create')],
+            'experience': [reverse('experience-list')],
+            'education': [reverse('education-list')],
+            'social-links': [reverse('social-link-list')],
+        }
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.query_plans import UnsupportedDatabase, check_query_plans
+
+
+class Command(BaseCommand):
+    help = (
+        "Run EXPLAIN QUERY PLAN on the first-page query of every list view and "
+        "fail when a plan scans a whole table or sorts in a temporary B-tree."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+        parser.add_argument('--verbose-plans', action='store_true', help="Print every plan, not just failures")
+
+    def handle(self, *args, **options):
+        try:
+            results = check_query_plans(using=options['database'])
+        except UnsupportedDatabase as e:
+            raise CommandError(str(e))
+        failed = [result for result in results if not result.ok]
+        for result in results:
+            if result.ok and not options['verbose_plans']:
+                continue
+            style = self.style.SUCCESS if result.ok else self.style.ERROR
+            self.stdout.write(style(f"{'ok' if result.ok else 'FAIL':>4}  {result.label}"))
+            for line in result.plan:
+                self.stdout.write(f"      {line}")
+            for problem in result.problems:
+                self.stdout.write(self.style.ERROR(f"      -> {problem}"))
+        if failed:
+            raise CommandError(f"{len(failed)} of {len(results)} query plans need an index.")
+        self.stdout.write(self.style.SUCCESS(f"All {len(results)} query plans use indexes."))
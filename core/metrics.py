@@ -0,0 +1,299 @@
+"""
+Per-request performance metrics in Prometheus text format.
+
+``MetricsMiddleware`` records, per resolved view name, method and status:
+request latency and response size histograms, SQL query count and time
+(through an ``execute_wrapper`` installed on each connection as it is
+created) and time spent in serializers' ``to_representation`` (for views
+using ``SerializerTimingMixin``). Each thread aggregates into its own
+shard, so recording takes no lock; ``render`` merges the shards when the
+metrics endpoint is scraped.
+
+The endpoint is for a Prometheus scraper, not for users: it accepts the
+static bearer token ``METRICS['TOKEN']`` or a client address in
+``METRICS['ALLOWED_IPS']`` (addresses or networks).
+"""
+import bisect
+import ipaddress
+import threading
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.crypto import constant_time_compare
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+DEFAULTS = {
+    # Unset: no token is accepted.
+    'TOKEN': None,
+    'ALLOWED_IPS': ('127.0.0.1', '::1'),
+}
+
+_current = ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    """What the current request has spent so far."""
+
+    __slots__ = ('queries', 'query_seconds', 'serializer_seconds', 'serializer_depth')
+
+    def __init__(self):
+        self.queries = 0
+        self.query_seconds = 0.0
+        self.serializer_seconds = 0.0
+        self.serializer_depth = 0
+
+
+def metrics_setting(name):
+    return getattr(settings, 'METRICS', {}).get(name, DEFAULTS[name])
+
+
+def valid_token(token):
+    expected = metrics_setting('TOKEN')
+    return bool(expected) and constant_time_compare(token, expected)
+
+
+def allowed_address(address):
+    """Whether ``address`` (REMOTE_ADDR) is in ``ALLOWED_IPS``."""
+    try:
+        address = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(address in ipaddress.ip_network(allowed, strict=False) for allowed in metrics_setting('ALLOWED_IPS'))
+
+
+def count_query(execute, sql, params, many, context):
+    request_metrics = _current.get()
+    if request_metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        request_metrics.query_seconds += time.perf_counter() - started
+        request_metrics.queries += 1
+
+
+def install_query_counter(sender, connection, **kwargs):
+    """``connection_created`` receiver: count this connection's queries from now on."""
+    if count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_query)
+
+
+class Histogram:
+    __slots__ = ('bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def merge(self, other):
+        for i, count in enumerate(other.counts):
+            self.counts[i] += count
+        self.sum += other.sum
+        self.count += other.count
+
+
+class Series:
+    __slots__ = ('latency', 'size', 'queries', 'query_seconds', 'serializer_seconds')
+
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.size = Histogram(SIZE_BUCKETS)
+        self.queries = Histogram(QUERY_BUCKETS)
+        self.query_seconds = 0.0
+        self.serializer_seconds = 0.0
+
+    def merge(self, other):
+        for name in ('latency', 'size', 'queries'):
+            getattr(self, name).merge(getattr(other, name))
+        self.query_seconds += other.query_seconds
+        self.serializer_seconds += other.serializer_seconds
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards = []
+
+    def _shard(self):
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append(shard)
+            return shard
+
+    def observe(self, labels, seconds, size, request_metrics):
+        shard = self._shard()
+        series = shard.get(labels)
+        if series is None:
+            series = shard[labels] = Series()
+        series.latency.observe(seconds)
+        if size is not None:
+            series.size.observe(size)
+        series.queries.observe(request_metrics.queries)
+        series.query_seconds += request_metrics.query_seconds
+        series.serializer_seconds += request_metrics.serializer_seconds
+
+    def snapshot(self):
+        """Merge every thread's shard into ``{labels: Series}``."""
+        with self._lock:
+            shards = list(self._shards)
+        merged = {}
+        for shard in shards:
+            for labels, series in list(shard.items()):
+                merged.setdefault(labels, Series()).merge(series)
+        return merged
+
+    def clear(self):
+        with self._lock:
+            for shard in self._shards:
+                shard.clear()
+
+
+registry = MetricsRegistry()
+
+
+class MetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = time.perf_counter()
+        request_metrics = RequestMetrics()
+        token = _current.set(request_metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.record(request, response, time.perf_counter() - started, request_metrics)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        request_metrics = RequestMetrics()
+        token = _current.set(request_metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.record(request, response, time.perf_counter() - started, request_metrics)
+        return response
+
+    def record(self, request, response, seconds, request_metrics):
+        match = request.resolver_match
+        view = (match.view_name if match else None) or 'unresolved'
+        size = None if response.streaming else len(response.content)
+        registry.observe((view, request.method, str(response.status_code)), seconds, size, request_metrics)
+
+
+_timed_serializers = {}
+
+
+def timed_serializer(serializer_class):
+    """A subclass of ``serializer_class`` adding its ``to_representation`` time to the current request."""
+    timed = _timed_serializers.get(serializer_class)
+    if timed is not None:
+        return timed
+
+    def to_representation(self, instance):
+        request_metrics = _current.get()
+        if request_metrics is None:
+            return super(timed, self).to_representation(instance)
+        # Nested serializers (e.g. embedded comments) are counted once, in the outermost.
+        request_metrics.serializer_depth += 1
+        started = time.perf_counter()
+        try:
+            return super(timed, self).to_representation(instance)
+        finally:
+            request_metrics.serializer_depth -= 1
+            if not request_metrics.serializer_depth:
+                request_metrics.serializer_seconds += time.perf_counter() - started
+
+    # Same name, so query_watch and error messages still point at the real serializer.
+    timed = type(serializer_class.__name__, (serializer_class,), {
+        '__module__': serializer_class.__module__,
+        '__qualname__': serializer_class.__qualname__,
+        'to_representation': to_representation,
+    })
+    _timed_serializers[serializer_class] = timed
+    return timed
+
+
+class SerializerTimingMixin:
+    """Generic view mixin: record the time its serializer spends producing data."""
+
+    def get_serializer(self, *args, **kwargs):
+        serializer_class = timed_serializer(self.get_serializer_class())
+        kwargs.setdefault('context', self.get_serializer_context())
+        return serializer_class(*args, **kwargs)
+
+
+LABELS = ('view', 'method', 'status')
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(labels, **extra):
+    pairs = [*zip(LABELS, labels), *extra.items()]
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _histogram(lines, name, help_text, items):
+    lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for labels, histogram in items:
+        cumulative = 0
+        for bound, count in zip(list(histogram.bounds) + ['+Inf'], histogram.counts):
+            cumulative += count
+            lines.append(f"{name}_bucket{_labels(labels, le=bound)} {cumulative}")
+        lines.append(f"{name}_sum{_labels(labels)} {histogram.sum}")
+        lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+
+
+def _counter(lines, name, help_text, items):
+    lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+    lines += [f"{name}{_labels(labels)} {value}" for labels, value in items]
+
+
+def render(extra_gauges=None):
+    """The registry (plus ``{metric name: value}`` gauges) in Prometheus text format."""
+    series = sorted(registry.snapshot().items())
+    lines = []
+    _histogram(lines, 'portfolio_http_request_duration_seconds', "Request latency.",
+               [(labels, s.latency) for labels, s in series])
+    _histogram(lines, 'portfolio_http_response_size_bytes', "Response body size (streaming responses excluded).",
+               [(labels, s.size) for labels, s in series])
+    _histogram(lines, 'portfolio_db_queries_per_request', "SQL queries per request.",
+               [(labels, s.queries) for labels, s in series])
+    _counter(lines, 'portfolio_db_query_duration_seconds_total', "Time spent in SQL queries.",
+             [(labels, s.query_seconds) for labels, s in series])
+    _counter(lines, 'portfolio_serializer_duration_seconds_total', "Time spent in serializers' to_representation.",
+             [(labels, s.serializer_seconds) for labels, s in series])
+    for name, value in (extra_gauges or {}).items():
+        lines += [f"# TYPE {name} gauge", f"{name} {value}"]
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,162 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:00
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Education',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('institution', models.CharField(help_text='School/University name', max_length=200)),
+                ('degree', models.CharField(choices=[('high_school', 'High School'), ('associate', 'Associate Degree'), ('bachelor', 'Bachelor Degree'), ('master', 'Master Degree'), ('phd', 'PhD'), ('certification', 'Certification'), ('bootcamp', 'Bootcamp'), ('other', 'Other')], max_length=20)),
+                ('field_of_study', models.CharField(help_text='e.g., Computer Science', max_length=100)),
+                ('location', models.CharField(blank=True, max_length=100)),
+                ('institution_logo', models.ImageField(blank=True, null=True, upload_to='education/')),
+                ('description', models.TextField(blank=True, help_text='Achievements, coursework, etc.')),
+                ('gpa', models.DecimalField(blank=True, decimal_places=2, help_text='e.g., 3.85', max_digits=3, null=True)),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField(blank=True, help_text='Leave blank if in progress', null=True)),
+                ('is_current', models.BooleanField(default=False, help_text='Currently studying')),
+                ('order', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'Education',
+                'ordering': ['-start_date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Experience',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('company', models.CharField(max_length=100)),
+                ('position', models.CharField(help_text='Job title', max_length=100)),
+                ('employment_type', models.CharField(choices=[('full_time', 'Full Time'), ('part_time', 'Part Time'), ('contract', 'Contract'), ('freelance', 'Freelance'), ('internship', 'Internship')], default='full_time', max_length=20)),
+                ('location', models.CharField(blank=True, max_length=100)),
+                ('company_url', models.URLField(blank=True)),
+                ('company_logo', models.ImageField(blank=True, null=True, upload_to='experience/')),
+                ('description', models.TextField(help_text='Responsibilities and achievements')),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField(blank=True, help_text='Leave blank if current job', null=True)),
+                ('is_current', models.BooleanField(default=False, help_text='Currently working here')),
+                ('order', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'Experiences',
+                'ordering': ['-start_date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Service',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('title', models.CharField(max_length=100)),
+                ('description', models.TextField()),
+                ('icon', models.DecimalField(blank=True, decimal_places=2, help_text='optional', max_digits=10, null=True)),
+                ('order', models.IntegerField(default=0)),
+                ('is_active', models.BooleanField(default=True)),
+            ],
+            options={
+                'ordering': ['order', 'title'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SiteSettings',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('site_name', models.CharField(default='My Portfolio', max_length=100)),
+                ('site_title', models.CharField(help_text='Browser tab title', max_length=200)),
+                ('tagline', models.CharField(help_text='short description/slogan', max_length=200)),
+                ('bio', models.TextField(help_text='short bio for homepage')),
+                ('about_text', models.TextField(help_text='Detailed about text')),
+                ('profile_image', models.ImageField(blank=True, null=True, upload_to='profile')),
+                ('contact_email', models.EmailField(max_length=254)),
+                ('phone', models.CharField(blank=True, max_length=20)),
+                ('location', models.CharField(blank=True, help_text='City, Country', max_length=100)),
+                ('resume_file', models.FileField(blank=True, null=True, upload_to='resume/')),
+                ('github_url', models.URLField(blank=True)),
+                ('linkedin_url', models.URLField(blank=True)),
+                ('twitter_url', models.URLField(blank=True)),
+                ('instagram_url', models.URLField(blank=True)),
+                ('meta_description', models.CharField(blank=True, max_length=160)),
+                ('meta_keywords', models.CharField(blank=True, max_length=255)),
+                ('footer_text', models.CharField(default='@ 2024 all rights reserved', max_length=200)),
+                ('is_active', models.BooleanField(default=True)),
+            ],
+            options={
+                'verbose_name': 'Site Settings',
+                'verbose_name_plural': 'Site Settings',
+            },
+        ),
+        migrations.CreateModel(
+            name='Skill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(max_length=100)),
+                ('category', models.CharField(choices=[('frontend', 'Frontend'), ('backend', 'Backend'), ('database', 'Database'), ('devops', 'DevOps'), ('tools', 'Tools'), ('other', 'Other')], max_length=20)),
+                ('proficiency', models.CharField(choices=[('beginner', 'Beginner'), ('intermediate', 'Intermediate'), ('advanced', 'Advanced'), ('expert', 'Expert')], default='intermediate', max_length=20)),
+                ('icon', models.CharField(blank=True, help_text='CSS class or emoji', max_length=50)),
+                ('description', models.TextField(blank=True)),
+                ('order', models.IntegerField(default=0, help_text='Lower numbers appear first')),
+                ('is_featured', models.BooleanField(default=False, help_text='show on homepage')),
+            ],
+            options={
+                'ordering': ['order', 'name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SocialLink',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('platform', models.CharField(choices=[('github', 'GitHub'), ('linkedin', 'LinkedIn'), ('twitter', 'Twitter'), ('instagram', 'Instagram'), ('facebook', 'Facebook'), ('youtube', 'YouTube'), ('medium', 'Medium'), ('dev', 'Dev.to'), ('stackoverflow', 'Stack Overflow'), ('dribbble', 'Dribbble'), ('behance', 'Behance'), ('other', 'Other')], max_length=20)),
+                ('url', models.URLField()),
+                ('icon', models.CharField(blank=True, help_text='CSS class or emoji', max_length=50)),
+                ('order', models.IntegerField(default=0)),
+                ('is_visible', models.BooleanField(default=True)),
+            ],
+            options={
+                'ordering': ['order', 'platform'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Testimonial',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('client_name', models.CharField(max_length=100)),
+                ('client_position', models.CharField(help_text='e.g., CEO at TechCorp', max_length=100)),
+                ('client_company', models.CharField(blank=True, max_length=100)),
+                ('client_image', models.ImageField(blank=True, null=True, upload_to='testimonials/')),
+                ('content', models.TextField(help_text='The testimonial text')),
+                ('rating', models.PositiveIntegerField(default=5, help_text='Rating from 1 to 5 stars', validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(5)])),
+                ('project_related', models.CharField(blank=True, help_text='Which project this relates to', max_length=200)),
+                ('is_featured', models.BooleanField(default=False)),
+                ('is_approved', models.BooleanField(default=True, help_text='Admin approval')),
+                ('order', models.IntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-is_featured', 'order', '-created_at'],
+            },
+        ),
+    ]
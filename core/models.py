@@ -18,7 +18,7 @@ class SiteSettings(TimeStampedModel):
 
     site_name= models.CharField(max_length=100, default="My Portfolio")
     site_title = models.CharField(max_length=200, help_text="Browser tab title")
-    tagline = models.CharField(max_length=200, help_test="short description/slogan")
+    tagline = models.CharField(max_length=200, help_text="short description/slogan")
 
 
     bio = models.TextField(help_text="short bio for homepage")
@@ -86,6 +86,7 @@ class Skill(TimeStampedModel):
 
     class Meta:
         ordering = ['order', 'name']
+        indexes = [models.Index(fields=['order', 'name'], name='core_skill_order_idx')]
     def __str__(self):
         return f"{self.name} ({self.get_category_display()})"
 
@@ -100,6 +101,9 @@ class Service(TimeStampedModel):
 
     class Meta:
         ordering = ['order', 'title']
+        indexes = [
+            models.Index(fields=['order', 'title'], condition=models.Q(is_active=True), name='core_service_active_idx'),
+        ]
     def __str__(self):
         return self.title
 class Testimonial(TimeStampedModel):
@@ -124,6 +128,13 @@ class Testimonial(TimeStampedModel):
     
     class Meta:
         ordering = ['-is_featured', 'order', '-created_at']
+        indexes = [
+            models.Index(
+                fields=['-is_featured', 'order', '-created_at', '-id'],
+                condition=models.Q(is_approved=True),
+                name='core_testimonial_list_idx',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.client_name} - {self.rating}⭐"
@@ -154,6 +165,7 @@ class Experience(TimeStampedModel):
     
     class Meta:
         ordering = ['-start_date']
+        indexes = [models.Index(fields=['-start_date', '-id'], name='core_experience_start_idx')]
         verbose_name_plural = "Experiences"
     
     def __str__(self):
@@ -196,6 +208,7 @@ class Education(TimeStampedModel):
     
     class Meta:
         ordering = ['-start_date']
+        indexes = [models.Index(fields=['-start_date', '-id'], name='core_education_start_idx')]
         verbose_name_plural = "Education"
     
     def __str__(self):
@@ -235,6 +248,9 @@ class SocialLink(TimeStampedModel):
     
     class Meta:
         ordering = ['order', 'platform']
+        indexes = [
+            models.Index(fields=['order', 'platform'], condition=models.Q(is_visible=True), name='core_sociallink_visible_idx'),
+        ]
     
     def __str__(self):
         return f"{self.get_platform_display()}"
@@ -0,0 +1,214 @@
+import base64
+import datetime
+import json
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def _encode_value(value):
+    # Full precision: DjangoJSONEncoder would truncate datetimes to milliseconds.
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    return str(value)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination keyed on the full ordering of the queryset.
+
+    The cursor stores the ordering values of the last row on the page (plus
+    the primary key as a tie-breaker), and the next page is fetched with a
+    ``WHERE (a, b, pk) < (...)`` style condition, so deep pages cost the same
+    as the first one. NULLs sort as the smallest value, matching SQLite.
+
+    The ordering is taken from the view's ``OrderingFilter`` if it has one,
+    then ``view.ordering``, then the model's ``Meta.ordering``. Views may set
+    ``page_size`` and ``max_page_size`` to override the defaults.
+    """
+    page_size = 20
+    max_page_size = 100
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset, position, reverse = self.page_queryset(queryset, request, view)
+        self.base_url = request.build_absolute_uri()
+        return self.set_page(list(queryset), position, reverse)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """``paginate_queryset`` for async views, fetching through the async ORM."""
+        queryset, position, reverse = self.page_queryset(queryset, request, view)
+        self.base_url = request.build_absolute_uri()
+        return self.set_page([row async for row in queryset], position, reverse)
+
+    def page_queryset(self, queryset, request, view):
+        """Return the unevaluated page query (one row more than the page) and the cursor."""
+        self.request = request
+        self.page_size = self.get_page_size(request, view)
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.fields = [self.resolve_field(queryset.model, name) for name, _ in self.ordering]
+
+        position, reverse = self.decode_cursor(request)
+        queryset = queryset.order_by(*self.order_by(reverse))
+        if position is not None:
+            queryset = queryset.filter(self.position_filter(position, reverse))
+        return queryset[:self.page_size + 1], position, reverse
+
+    def set_page(self, rows, position, reverse):
+        has_more = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_page_size(self, request, view):
+        page_size = getattr(view, 'page_size', self.page_size)
+        max_page_size = getattr(view, 'max_page_size', self.max_page_size)
+        if self.page_size_query_param in request.query_params:
+            try:
+                requested = int(request.query_params[self.page_size_query_param])
+            except (TypeError, ValueError):
+                requested = 0
+            if requested > 0:
+                page_size = requested
+        return min(page_size, max_page_size)
+
+    def get_ordering(self, request, queryset, view):
+        """Return the ordering as ``(field_name, descending)`` pairs ending in pk."""
+        ordering = None
+        for backend in getattr(view, 'filter_backends', []):
+            if issubclass(backend, OrderingFilter):
+                ordering = backend().get_ordering(request, queryset, view)
+                break
+        if not ordering:
+            ordering = getattr(view, 'ordering', None) or queryset.model._meta.ordering or []
+        if isinstance(ordering, str):
+            ordering = [ordering]
+
+        pairs = []
+        pk_name = queryset.model._meta.pk.name
+        for term in ordering:
+            name = term.lstrip('-')
+            if name == 'pk':
+                name = pk_name
+            pairs.append((name, term.startswith('-')))
+        if pk_name not in [name for name, _ in pairs]:
+            pairs.append((pk_name, pairs[0][1] if pairs else True))
+        return pairs
+
+    def resolve_field(self, model, name):
+        try:
+            return model._meta.get_field(name)
+        except FieldDoesNotExist:
+            raise AssertionError(
+                f"{type(self).__name__} can only order by concrete fields of "
+                f"{model.__name__}; got '{name}'."
+            )
+
+    def order_by(self, reverse):
+        expressions = []
+        for (name, descending), field in zip(self.ordering, self.fields):
+            if descending != reverse:
+                expression = F(name).desc(nulls_last=True if field.null else None)
+            else:
+                expression = F(name).asc(nulls_first=True if field.null else None)
+            expressions.append(expression)
+        return expressions
+
+    def position_filter(self, position, reverse):
+        """Rows strictly after ``position`` in the (possibly reversed) ordering."""
+        condition = Q(pk__in=[])
+        equal_so_far = Q()
+        for (name, descending), value in zip(self.ordering, position):
+            if value is None:
+                # NULL is the smallest value: nothing is below it.
+                below = None
+                above = Q(**{f'{name}__isnull': False})
+                equal = Q(**{f'{name}__isnull': True})
+            else:
+                below = Q(**{f'{name}__lt': value}) | Q(**{f'{name}__isnull': True})
+                above = Q(**{f'{name}__gt': value})
+                equal = Q(**{name: value})
+            after = below if descending != reverse else above
+            if after is not None:
+                condition |= equal_so_far & after
+            equal_so_far &= equal
+        return condition
+
+    def get_position(self, instance):
+        return [getattr(instance, field.attname) for field in self.fields]
+
+    def encode_cursor(self, position, reverse):
+        payload = json.dumps({'p': position, 'r': int(reverse)}, default=_encode_value, separators=(',', ':'))
+        cursor = base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+            raw_position = payload['p']
+            if len(raw_position) != len(self.fields):
+                raise ValueError
+            position = [
+                None if value is None else field.to_python(value)
+                for field, value in zip(self.fields, raw_position)
+            ]
+            return position, bool(payload.get('r'))
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def link_after(self, instance, url, view=None):
+        """
+        Link to the rows following ``instance`` on the listing at ``url``,
+        for payloads that embed the first page of another endpoint.
+        """
+        self.base_url = url
+        self.ordering = self.get_ordering(None, type(instance)._default_manager.none(), view)
+        self.fields = [self.resolve_field(type(instance), name) for name, _ in self.ordering]
+        return self.encode_cursor(self.get_position(instance), reverse=False)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.get_position(self.page[-1]), reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.get_position(self.page[0]), reverse=True)
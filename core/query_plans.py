@@ -0,0 +1,157 @@
+"""
+``EXPLAIN QUERY PLAN`` checks for the list endpoints.
+
+Every DRF list view in the URLconf is instantiated for a GET request, as an
+anonymous client and as a stand-in staff user, and the query it would run
+for its first page, filters and keyset ordering included, is explained. The
+authenticated variant is only reported when it differs from the anonymous
+one (e.g. posts without the ``status='published'`` filter). A plan that reads a whole table (``SCAN <table>``
+without an index) or sorts in a temporary B-tree means a missing index.
+
+``QUERY_STRINGS`` adds filtered variants of a view, ``EXTRA_QUERIES``
+covers hot querysets that are not list views and ``SKIP`` lists views that
+do not read their rows through the list queryset.
+"""
+import re
+from dataclasses import dataclass, field
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.db import DatabaseError, connections
+from django.test import RequestFactory
+from django.urls import URLPattern, URLResolver, get_resolver
+from rest_framework.exceptions import APIException
+from rest_framework.mixins import ListModelMixin
+
+SCAN = re.compile(r'\bSCAN (\S+)')
+
+# List views whose rows do not come from their list queryset, by URL name.
+SKIP = {
+    'post-search': "ranked by the FTS index (blog.search)",
+}
+
+# Filtered variants worth checking, by URL name.
+QUERY_STRINGS = {
+    'post-list-create': ['is_featured=true'],
+    'testimonial-list-create': ['featured=true'],
+}
+
+
+def contact_export_by_status():
+    from contact.export import filter_messages, ordered
+    from contact.models import ContactMessage
+    return ordered(filter_messages(ContactMessage.objects.all(), status='new'))
+
+
+EXTRA_QUERIES = {
+    'contact export ?status=new': contact_export_by_status,
+}
+
+
+class UnsupportedDatabase(Exception):
+    """The database has no ``EXPLAIN QUERY PLAN`` output to check."""
+
+
+@dataclass
+class PlanResult:
+    label: str
+    plan: list
+    problems: list = field(default_factory=list)
+
+    @property
+    def ok(self):
+        return not self.problems
+
+
+def plan_problems(lines):
+    problems = []
+    for line in lines:
+        line = line.strip()
+        match = SCAN.search(line)
+        if 'USE TEMP B-TREE' in line:
+            problems.append(f"temporary sort: {line}")
+        elif match and match.group(1) != 'CONSTANT' and ' USING ' not in line:
+            problems.append(f"full scan of {match.group(1)}: {line}")
+    return problems
+
+
+def list_views(resolver=None, prefix=''):
+    """Yield ``(url name, route, view class, kwargs)`` for each list view."""
+    resolver = resolver or get_resolver()
+    for pattern in resolver.url_patterns:
+        route = prefix + str(pattern.pattern)
+        if isinstance(pattern, URLResolver):
+            yield from list_views(pattern, route)
+            continue
+        if not isinstance(pattern, URLPattern):
+            continue
+        view_class = getattr(pattern.callback, 'view_class', None)
+        if view_class is None or not issubclass(view_class, ListModelMixin):
+            continue
+        converters = getattr(pattern.pattern, 'converters', {})
+        kwargs = {name: converter.to_python('1') for name, converter in converters.items()}
+        yield pattern.name, route, view_class, kwargs
+
+
+def view_queryset(view_class, kwargs, query_string='', user=None):
+    """
+    The first-page queryset ``view_class`` would run for a GET by ``user``
+    (anonymous by default), or None when the view denies that user.
+    """
+    user = user or AnonymousUser()
+    view = view_class(args=(), kwargs=kwargs, format_kwarg=None)
+    request = RequestFactory().get('/', QUERY_STRING=query_string)
+    request.user = user
+    view.request = view.initialize_request(request)
+    view.request.user = user
+    try:
+        view.check_permissions(view.request)
+    except APIException:
+        return None
+    queryset = view.filter_queryset(view.get_queryset())
+    if view.paginator is not None and hasattr(view.paginator, 'page_queryset'):
+        queryset, _, _ = view.paginator.page_queryset(queryset, view.request, view)
+    return queryset
+
+
+def view_querysets(view_class, kwargs, query_string=''):
+    """Yield ``(variant, queryset)`` for the anonymous and authenticated GETs that differ."""
+    seen = set()
+    for variant, user in (('', AnonymousUser()), (' (authenticated)', get_user_model()(pk=1, is_staff=True))):
+        queryset = view_queryset(view_class, kwargs, query_string, user)
+        if queryset is None:
+            continue
+        sql = str(queryset.query)
+        if sql not in seen:
+            seen.add(sql)
+            yield variant, queryset
+    if not seen:
+        raise PermissionError(f"{view_class.__name__} denies every user")
+
+
+def check_query_plans(using='default'):
+    """
+    Return a ``PlanResult`` per list view, user and filtered variant and
+    extra query. Raises ``UnsupportedDatabase`` unless ``using`` is SQLite.
+    """
+    if connections[using].vendor != 'sqlite':
+        raise UnsupportedDatabase(f"plans are only checked on SQLite, not {connections[using].vendor}")
+    checks = []
+    for name, route, view_class, kwargs in list_views():
+        if name in SKIP:
+            continue
+        for query_string in [''] + QUERY_STRINGS.get(name, []):
+            label = f"{name or view_class.__name__} /{route}" + (f"?{query_string}" if query_string else '')
+            for variant, queryset in view_querysets(view_class, kwargs, query_string):
+                checks.append((label + variant, lambda queryset=queryset: queryset))
+    checks.extend(EXTRA_QUERIES.items())
+
+    results = []
+    for label, build in checks:
+        try:
+            plan = build().using(using).explain().splitlines()
+        except DatabaseError as e:
+            results.append(PlanResult(label, [], [f"cannot explain: {e}"]))
+            continue
+        results.append(PlanResult(label, plan, plan_problems(plan)))
+    return results
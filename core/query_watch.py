@@ -0,0 +1,204 @@
+"""
+N+1 and slow-query detection for development and tests.
+
+``watch_queries()`` puts an ``execute_wrapper`` on every connection for the
+duration of a block. Queries are grouped by shape (the SQL with its
+placeholders, ``IN`` lists collapsed), and a shape that runs at least
+``REPEAT_THRESHOLD`` times in one block is reported: that is a relation
+being followed once per row. Each query is attributed to the serializer
+field being rendered when it ran (``PostListSerializer.author_name``), so
+the report points at the field to ``select_related`` or prefetch.
+Queries slower than ``SLOW_QUERY_MS`` are logged as they happen.
+
+``url_paths()`` lists every URL in the URLconf, so a test can request each
+of them inside ``watch_queries(raise_errors=True)``.
+
+``QueryWatchMiddleware`` watches every request when ``QUERY_WATCH['ENABLED']``
+is set (by default, when ``DEBUG`` is); with ``RAISE`` the request fails
+with ``RepeatedQueries`` instead of logging. Tests use ``watch_queries``
+directly, see ``core.tests.QueryWatchTests``.
+"""
+import logging
+import re
+import sys
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.urls import URLPattern, URLResolver, get_resolver
+from rest_framework.serializers import BaseSerializer
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    # None follows DEBUG (which the test runner turns off).
+    'ENABLED': None,
+    'REPEAT_THRESHOLD': 5,
+    'SLOW_QUERY_MS': 100,
+    'RAISE': False,
+}
+
+IN_LIST = re.compile(r'\(%s(?:, %s)+\)')
+CONVERTER = re.compile(r'<(?:\w+:)?(\w+)>')
+
+
+def watch_setting(name):
+    return getattr(settings, 'QUERY_WATCH', {}).get(name, DEFAULTS[name])
+
+
+class RepeatedQueries(AssertionError):
+    pass
+
+
+def query_shape(sql):
+    return IN_LIST.sub('(%s, ...)', sql)
+
+
+def query_origin():
+    """``Serializer.field`` being rendered by the innermost serializer on the stack."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        if frame.f_code.co_name == 'to_representation':
+            serializer = frame.f_locals.get('self')
+            current = frame.f_locals.get('field')
+            if isinstance(serializer, BaseSerializer) and current is not None:
+                return f"{type(serializer).__name__}.{current.field_name}"
+        frame = frame.f_back
+    return None
+
+
+@dataclass
+class QueryGroup:
+    alias: str
+    sql: str
+    count: int = 0
+    seconds: float = 0.0
+    origins: Counter = field(default_factory=Counter)
+
+    def describe(self):
+        origins = ', '.join(origin for origin, _ in self.origins.most_common()) or 'outside serializers'
+        return f"{self.count} x [{self.alias}] {self.sql} ({self.seconds * 1000:.1f} ms, from {origins})"
+
+
+class QueryWatch:
+    def __init__(self, label='', repeat_threshold=None, slow_query_ms=None):
+        self.label = label
+        self.repeat_threshold = repeat_threshold or watch_setting('REPEAT_THRESHOLD')
+        self.slow_query_ms = slow_query_ms if slow_query_ms is not None else watch_setting('SLOW_QUERY_MS')
+        self.groups = {}
+        self.total = 0
+
+    def wrapper(self, alias):
+        def execute_wrapper(execute, sql, params, many, context):
+            started = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                self.record(alias, sql, time.perf_counter() - started)
+        return execute_wrapper
+
+    def record(self, alias, sql, seconds):
+        origin = query_origin()
+        shape = query_shape(sql)
+        group = self.groups.get((alias, shape))
+        if group is None:
+            group = self.groups[(alias, shape)] = QueryGroup(alias, shape)
+        group.count += 1
+        group.seconds += seconds
+        if origin is not None:
+            group.origins[origin] += 1
+        self.total += 1
+        if seconds * 1000 >= self.slow_query_ms:
+            logger.warning(
+                "Slow query (%.1f ms) in %s%s: %s",
+                seconds * 1000, self.get_label(), f" at {origin}" if origin else '', sql,
+            )
+
+    def get_label(self):
+        return self.label() if callable(self.label) else self.label
+
+    def repeated(self):
+        return sorted(
+            (group for group in self.groups.values() if group.count >= self.repeat_threshold),
+            key=lambda group: -group.count,
+        )
+
+    def report(self, raise_errors=False):
+        repeated = self.repeated()
+        if not repeated:
+            return
+        message = f"Repeated queries in {self.get_label()}:\n" + '\n'.join(
+            f"  {group.describe()}" for group in repeated
+        )
+        if raise_errors:
+            raise RepeatedQueries(message)
+        logger.warning(message)
+
+
+@contextmanager
+def watch_queries(label='', repeat_threshold=None, slow_query_ms=None, raise_errors=False):
+    """
+    Watch the queries run in the block; on exit, log (or raise
+    ``RepeatedQueries`` for) shapes repeated ``repeat_threshold`` times.
+    """
+    watch = QueryWatch(label, repeat_threshold, slow_query_ms)
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(watch.wrapper(connection.alias)))
+        yield watch
+    watch.report(raise_errors)
+
+
+def url_paths(kwargs, resolver=None, prefix='', exclude=('admin',)):
+    """
+    Yield ``(url name, path)`` for every URL pattern, outside the namespaces
+    in ``exclude``. Parameters come from ``kwargs[url name]``, falling back to
+    ``kwargs[parameter name]``; a pattern with a parameter in neither raises
+    ``KeyError``, so a new URL cannot go unchecked.
+    """
+    resolver = resolver or get_resolver()
+    for pattern in resolver.url_patterns:
+        route = prefix + str(pattern.pattern)
+        if isinstance(pattern, URLResolver):
+            if pattern.namespace not in exclude:
+                yield from url_paths(kwargs, pattern, route, exclude)
+        elif isinstance(pattern, URLPattern):
+            values = {**kwargs, **kwargs.get(pattern.name, {})}
+            missing = [name for name in CONVERTER.findall(route) if name not in values]
+            if missing:
+                raise KeyError(f"no value for {', '.join(missing)} in {pattern.name or route}")
+            yield pattern.name, '/' + CONVERTER.sub(lambda match: str(values[match.group(1)]), route)
+
+
+class QueryWatchMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        enabled = watch_setting('ENABLED')
+        if not (settings.DEBUG if enabled is None else enabled):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def label(self, request):
+        def label():
+            match = request.resolver_match
+            return f"{request.method} {request.path} ({match.view_name if match else 'unresolved'})"
+        return label
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with watch_queries(self.label(request), raise_errors=watch_setting('RAISE')):
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        with watch_queries(self.label(request), raise_errors=watch_setting('RAISE')):
+            return await self.get_response(request)
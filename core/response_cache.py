@@ -0,0 +1,251 @@
+"""
+Response cache for anonymous, safe requests.
+
+Rendered responses are kept in a size-bounded, per-process LRU. Every entry
+is tagged with the data it was built from (``post-list``, ``post:<slug>``,
+``core:skills`` ...). Each tag has a version number in the shared Django
+cache, and an entry is only served while all of its tags still have the
+versions it was stored under. ``purge()`` bumps versions, so a save in one
+worker invalidates exactly the matching entries in every worker. Entries
+are built from the primary, never from a replica that may predate the purge.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+
+from .db import use_primary
+
+TAG_KEY_PREFIX = 'response-cache:tag:'
+
+DEFAULTS = {
+    'ENABLED': True,
+    'MAX_ENTRIES': 1000,
+    'MAX_BYTES': 32 * 1024 * 1024,
+    # Upper bound on staleness for data that changes without a signal
+    # (queryset.update(), buffered view counts).
+    'TIMEOUT': 300,
+}
+
+STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Vary', 'Allow', 'Cache-Control')
+
+
+def cache_setting(name):
+    return getattr(settings, 'RESPONSE_CACHE', {}).get(name, DEFAULTS[name])
+
+
+class CachedResponse:
+    __slots__ = ('content', 'status', 'headers', 'tags', 'versions', 'expires', 'meta')
+
+    def __init__(self, content, status, headers, tags, versions, expires, meta=None):
+        self.content = content
+        self.status = status
+        self.headers = headers
+        self.tags = tags
+        self.versions = versions
+        self.expires = expires
+        self.meta = meta
+
+
+class ResponseCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._tag_index = {}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def tag_versions(self, tags):
+        keys = [TAG_KEY_PREFIX + tag for tag in tags]
+        found = cache.get_many(keys)
+        return {tag: found.get(TAG_KEY_PREFIX + tag, 0) for tag in tags}
+
+    async def atag_versions(self, tags):
+        """``tag_versions`` for async views."""
+        keys = [TAG_KEY_PREFIX + tag for tag in tags]
+        found = await cache.aget_many(keys)
+        return {tag: found.get(TAG_KEY_PREFIX + tag, 0) for tag in tags}
+
+    def get(self, key):
+        entry, live = self._lookup(key)
+        return self._checked(key, entry, live and self.tag_versions(entry.tags) == entry.versions)
+
+    async def aget(self, key):
+        """``get`` for async views."""
+        entry, live = self._lookup(key)
+        return self._checked(key, entry, live and await self.atag_versions(entry.tags) == entry.versions)
+
+    def _lookup(self, key):
+        """Return the entry under ``key`` (or None) and whether it has not expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        return entry, entry is not None and entry.expires > time.monotonic()
+
+    def _checked(self, key, entry, current):
+        if current:
+            with self._lock:
+                self.hits += 1
+            return entry
+        with self._lock:
+            if entry is not None:
+                self.invalidations += 1
+                self._remove(key)
+            self.misses += 1
+        return None
+
+    def set(self, key, response, tags, versions, meta=None):
+        content = response.content
+        entry = CachedResponse(
+            content=content,
+            status=response.status_code,
+            headers={name: response[name] for name in STORED_HEADERS if response.has_header(name)},
+            tags=tuple(tags),
+            versions=versions,
+            expires=time.monotonic() + cache_setting('TIMEOUT'),
+            meta=meta,
+        )
+        max_bytes = cache_setting('MAX_BYTES')
+        if len(content) > max_bytes:
+            return
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = entry
+            self._bytes += len(content)
+            for tag in entry.tags:
+                self._tag_index.setdefault(tag, set()).add(key)
+            max_entries = cache_setting('MAX_ENTRIES')
+            while len(self._entries) > max_entries or self._bytes > max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= len(entry.content)
+        for tag in entry.tags:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
+
+    def purge(self, *tags):
+        """Invalidate every entry carrying any of ``tags``, in all processes."""
+        for tag in tags:
+            try:
+                cache.incr(TAG_KEY_PREFIX + tag)
+            except ValueError:
+                cache.add(TAG_KEY_PREFIX + tag, 1, None)
+        with self._lock:
+            for tag in tags:
+                for key in list(self._tag_index.get(tag, ())):
+                    self._remove(key)
+                    self.invalidations += 1
+
+    def purge_on_commit(self, *tags):
+        # Purge now so this process stops serving the old data, and again
+        # after commit so a response built from pre-commit rows by another
+        # request in the meantime is not kept either.
+        self.purge(*tags)
+        transaction.on_commit(lambda: self.purge(*tags))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tag_index.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
+
+
+response_cache = ResponseCache()
+
+
+def is_cacheable_request(request):
+    return (
+        cache_setting('ENABLED')
+        and request.method in ('GET', 'HEAD')
+        and 'HTTP_AUTHORIZATION' not in request.META
+        and settings.SESSION_COOKIE_NAME not in request.COOKIES
+    )
+
+
+def cache_key(request):
+    return f"{request.method}:{request.get_full_path()}:{request.META.get('HTTP_ACCEPT', '')}"
+
+
+def build_response(request, entry):
+    etag = entry.headers.get('ETag')
+    last_modified = parse_http_date_safe(entry.headers['Last-Modified']) if 'Last-Modified' in entry.headers else None
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = HttpResponse(entry.content, status=entry.status)
+    for name, value in entry.headers.items():
+        response[name] = value
+    response['X-Cache'] = 'HIT'
+    return response
+
+
+class CachedResponseMixin:
+    """
+    Serve anonymous GETs from ``response_cache``. ``cache_tags`` entries are
+    formatted with the URL kwargs, e.g. ``'post:{slug}'``. Views with side
+    effects per request store what they need in ``get_cache_meta`` and
+    replay it in ``cache_hit``.
+    """
+    cache_tags = ()
+
+    def get_cache_tags(self):
+        return [tag.format(**self.kwargs) for tag in self.cache_tags]
+
+    def get_cache_meta(self):
+        return None
+
+    def cache_hit(self, request, meta):
+        pass
+
+    def dispatch(self, request, *args, **kwargs):
+        if not self.cache_tags or not is_cacheable_request(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        key = cache_key(request)
+        entry = response_cache.get(key)
+        if entry is not None:
+            self.cache_hit(request, entry.meta)
+            return build_response(request, entry)
+
+        self.kwargs = kwargs
+        tags = self.get_cache_tags()
+        # Read versions before building so a purge that lands mid-request
+        # leaves the entry already invalid.
+        versions = response_cache.tag_versions(tags)
+        with use_primary():
+            response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == 200 and not response.streaming:
+            if hasattr(response, 'render'):
+                response.render()
+            response_cache.set(key, response, tags, versions, self.get_cache_meta())
+            response['X-Cache'] = 'MISS'
+        return response
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from .fields import ImageSrcsetField
 from .models import(
     SiteSettings,
     Skill,
@@ -12,11 +13,13 @@ from .models import(
 
 
 class SiteSettingsSerializer(serializers.ModelSerializer):
+     profile_image_srcset = ImageSrcsetField(source='profile_image')
+
      class Meta:
         model = SiteSettings
         fields = [
             'id', 'site_name', 'site_title', 'tagline',
-            'bio', 'about_text', 'profile_image',
+            'bio', 'about_text', 'profile_image', 'profile_image_srcset',
             'contact_email', 'phone', 'location',
             'resume_file',
             'github_url', 'linkedin_url', 'twitter_url', 'instagram_url',
@@ -37,7 +40,7 @@ class SkillSerializer(serializers.ModelSerializer):
             'id', 'name', 'category', 'category_display',
             'proficiency', 'proficiency_display',
             'icon', 'description', 'order', 'is_featured',
-            'created_at', 'update_at'
+            'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
     
@@ -51,7 +54,7 @@ class ServiceSerializer(serializers.ModelSerializer):
         model = Service
         fields = [
             'id', 'title', 'description', 'icon',
-            'price', 'order', 'is_active',
+            'order', 'is_active',
             'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
@@ -61,11 +64,13 @@ class TestimonialSerializer(serializers.ModelSerializer):
     """
     Serializer for client testimonials with rating validation.
     """
+    client_image_srcset = ImageSrcsetField(source='client_image')
+
     class Meta:
         model = Testimonial
         fields = [
             'id', 'client_name', 'client_position', 'client_company',
-            'client_image', 'content', 'rating', 'project_related',
+            'client_image', 'client_image_srcset', 'content', 'rating', 'project_related',
             'is_featured', 'is_approved', 'order',
             'created_at', 'updated_at'
         ]
@@ -76,13 +81,14 @@ class TestimonialSerializer(serializers.ModelSerializer):
 class ExperienceSerializer(serializers.ModelSerializer):
 
         employment_type_display = serializers.CharField(source='get_employment_type_display', read_only=True)
+        company_logo_srcset = ImageSrcsetField(source='company_logo')
         duration = serializers.SerializerMethodField()
 
         class Meta:
             model =  Experience
             fields = [
             'id', 'company', 'position', 'employment_type', 'employment_type_display',
-            'location', 'company_url', 'company_logo',
+            'location', 'company_url', 'company_logo', 'company_logo_srcset',
             'description', 'start_date', 'end_date', 'is_current',
             'duration', 'order',
             'created_at', 'updated_at'
@@ -133,13 +139,14 @@ class EducationSerializer(serializers.ModelSerializer):
 
     
     degree_display = serializers.CharField(source='get_degree_display', read_only=True)
+    institution_logo_srcset = ImageSrcsetField(source='institution_logo')
     duration = serializers.SerializerMethodField()
     
     class Meta:
         model = Education
         fields = [
             'id', 'institution', 'degree', 'degree_display',
-            'field_of_study', 'location', 'institution_logo',
+            'field_of_study', 'location', 'institution_logo', 'institution_logo_srcset',
             'description', 'gpa', 'start_date', 'end_date',
             'is_current', 'duration', 'order',
             'created_at', 'updated_at'
@@ -201,7 +208,7 @@ class SocialLinkSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'platform', 'platform_display',
             'url', 'icon', 'order', 'is_visible',
-            'created_at', 'upldated_at'
+            'created_at', 'updated_at'
 
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
@@ -0,0 +1,54 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from . import homepage
+from .models import Education, Experience, Service, SiteSettings, Skill, SocialLink, Testimonial
+from .response_cache import response_cache
+from .site_settings import site_settings_cache
+
+
+def refresh_homepage(sender, raw=False, **kwargs):
+    if raw:
+        return
+    # Only drop the snapshot once the change is visible to other connections.
+    transaction.on_commit(homepage.invalidate_homepage)
+
+
+for model in homepage.HOMEPAGE_MODELS:
+    post_save.connect(refresh_homepage, sender=model, dispatch_uid=f'homepage-save-{model.__name__}')
+    post_delete.connect(refresh_homepage, sender=model, dispatch_uid=f'homepage-delete-{model.__name__}')
+
+
+def invalidate_site_settings(sender, raw=False, **kwargs):
+    if raw:
+        return
+    site_settings_cache.clear()
+    transaction.on_commit(site_settings_cache.invalidate)
+
+
+post_save.connect(invalidate_site_settings, sender=SiteSettings, dispatch_uid='site-settings-save')
+post_delete.connect(invalidate_site_settings, sender=SiteSettings, dispatch_uid='site-settings-delete')
+
+
+# Response cache tag for each model's list; detail views use "<tag>:<pk>".
+CACHE_TAGS = {
+    SiteSettings: 'core:site-settings',
+    Skill: 'core:skills',
+    Service: 'core:services',
+    Testimonial: 'core:testimonials',
+    Experience: 'core:experience',
+    Education: 'core:education',
+    SocialLink: 'core:social-links',
+}
+
+
+def purge_cached_responses(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    tag = CACHE_TAGS[sender]
+    response_cache.purge_on_commit(tag, f"{tag}:{instance.pk}")
+
+
+for model in CACHE_TAGS:
+    post_save.connect(purge_cached_responses, sender=model, dispatch_uid=f'response-cache-save-{model.__name__}')
+    post_delete.connect(purge_cached_responses, sender=model, dispatch_uid=f'response-cache-delete-{model.__name__}')
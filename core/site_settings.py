@@ -0,0 +1,92 @@
+"""
+Process-local accessor for the SiteSettings singleton.
+
+Each worker keeps the row in memory together with the version stamp it was
+loaded under. The current stamp lives in the shared cache and is replaced
+whenever the row is saved or deleted, so a stale worker notices with a
+single cache read and reloads on its next access. Reloads read from the
+primary: a lagging replica would put the old row back under the new stamp.
+"""
+import threading
+import uuid
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+from .models import SiteSettings
+
+VERSION_KEY = 'core:site_settings:version'
+
+_MISSING = object()
+
+
+class SiteSettingsCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._value = _MISSING
+
+    def current_version(self):
+        version = cache.get(VERSION_KEY)
+        if version is None:
+            # Stamp lost (cache restart or eviction): start a new one so
+            # every worker reloads once.
+            cache.add(VERSION_KEY, uuid.uuid4().hex, None)
+            version = cache.get(VERSION_KEY)
+        return version
+
+    async def acurrent_version(self):
+        """``current_version`` for async views; the cache is not read on the event loop."""
+        version = await cache.aget(VERSION_KEY)
+        if version is None:
+            await cache.aadd(VERSION_KEY, uuid.uuid4().hex, None)
+            version = await cache.aget(VERSION_KEY)
+        return version
+
+    def get(self):
+        """
+        Return the SiteSettings row, or None when it does not exist yet. The
+        instance is shared between threads and must be treated as read-only.
+        """
+        version = self.current_version()
+        with self._lock:
+            if self._value is not _MISSING and self._version == version:
+                return self._value
+        value = SiteSettings.objects.using(DEFAULT_DB_ALIAS).first()
+        with self._lock:
+            self._value = value
+            self._version = version
+        return value
+
+    async def aget(self):
+        """``get`` for async views."""
+        version = await self.acurrent_version()
+        with self._lock:
+            if self._value is not _MISSING and self._version == version:
+                return self._value
+        value = await SiteSettings.objects.using(DEFAULT_DB_ALIAS).afirst()
+        with self._lock:
+            self._value = value
+            self._version = version
+        return value
+
+    def invalidate(self):
+        """Publish a new version stamp and drop this process's copy."""
+        cache.set(VERSION_KEY, uuid.uuid4().hex, None)
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._value = _MISSING
+            self._version = None
+
+
+site_settings_cache = SiteSettingsCache()
+
+
+def get_site_settings():
+    return site_settings_cache.get()
+
+
+async def aget_site_settings():
+    return await site_settings_cache.aget()
@@ -0,0 +1,439 @@
+"""
+Deterministic synthetic data for performance work.
+
+``generate(counts, seed)`` fills every app with realistic volume: users,
+posts with a long-tailed tag and category distribution, threaded comments
+concentrated on popular posts, contact messages, projects and the core
+portfolio sections. The same seed always produces the same rows.
+
+Rows are written in batches, each in its own transaction: with
+``bulk_create`` (the tag links straight into the M2M through table), and
+comments, by far the largest table, as plain tuples through
+``insert_rows``. Primary keys are assigned up front, so comment paths can
+be built without reading anything back. None of this runs ``save()`` or
+the signals, so the generator does their work itself, as
+``blog.importer`` does: slugs, excerpts, comment paths and depths, the
+search index, the denormalized post counts, the cache purges and the feeds
+and sitemap.
+``auto_now``/``auto_now_add`` are switched off while it runs so timestamps
+come from the seed too.
+"""
+import datetime
+import random
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils.text import slugify
+
+from blog import post_counts, search, syndication
+from blog.importer import lookup_or_create
+from blog.models import Category, Comment, Post, Tag
+from contact.models import ContactMessage
+from projects.models import Project
+from users.models import User
+
+from . import homepage
+from .models import Education, Experience, Service, SiteSettings, Skill, SocialLink, Testimonial
+from .response_cache import response_cache
+from .signals import CACHE_TAGS
+from .site_settings import site_settings_cache
+
+WORDS = (
+    "django python query index cache latency throughput request response database "
+    "migration serializer view model template deploy server client thread async "
+    "worker queue batch stream page cursor search token session static media "
+    "build test release feature design pattern system service api schema field "
+    "the a of and to in is for on with that this it as be by from at we you our"
+).split()
+
+TAGS = (
+    "python django javascript react css devops docker sql sqlite postgres "
+    "performance testing security api design career tutorial rust go "
+    "kubernetes linux git caching async typescript vue htmx celery redis"
+).split()
+
+CATEGORIES = (
+    "Engineering", "Tutorials", "Career", "Projects", "Opinion",
+    "Performance", "Tools", "Notes", "Releases", "Talks",
+)
+
+# Shared by every synthetic account; hashed once with a fixed salt.
+PASSWORD = 'synthetic'
+EMAIL_DOMAIN = 'synthetic.example.com'
+
+EPOCH = datetime.datetime(2022, 1, 1, tzinfo=datetime.timezone.utc)
+SPAN = datetime.timedelta(days=3 * 365)
+
+STREAM_WORDS = 100_000
+
+STATUSES = (('published', 80), ('draft', 15), ('archived', 5))
+REPLY_RATE = 0.35
+APPROVED_RATE = 0.9
+
+
+class AlreadyGenerated(Exception):
+    pass
+
+
+@dataclass
+class Counts:
+    users: int = 200
+    posts: int = 5000
+    comments: int = 50000
+    contact_messages: int = 2000
+    projects: int = 300
+    # Rows of each core section (skills, services, testimonials, ...).
+    core: int = 20
+
+
+def zipf_weights(n, exponent=1.1):
+    """Weights for a long tail: a few very popular items, most rarely used."""
+    return [1 / (rank ** exponent) for rank in range(1, n + 1)]
+
+
+def next_pk(model):
+    return (model.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+
+
+def ordered_lookup_or_create(model, names):
+    """``lookup_or_create``, creating missing rows in ``names`` order so their pks do not vary between runs."""
+    existing = set(model.objects.filter(name__in=names).values_list('name', flat=True))
+    model.objects.bulk_create(
+        [model(name=name, slug=slugify(name), created_at=EPOCH) for name in names if name not in existing],
+        ignore_conflicts=True,
+    )
+    return lookup_or_create(model, names)
+
+
+def insert_rows(model, names, rows):
+    """
+    ``executemany`` one INSERT for ``rows``, tuples of database-ready values
+    for the fields in ``names``. For the high-volume tables, where building
+    a model instance per row and compiling each ``bulk_create`` batch costs
+    more than the write itself.
+    """
+    opts = model._meta
+    quote = connection.ops.quote_name
+    columns = ', '.join(quote(opts.get_field(name).column) for name in names)
+    placeholders = ', '.join(['%s'] * len(names))
+    with connection.cursor() as cursor:
+        cursor.executemany(f"INSERT INTO {quote(opts.db_table)} ({columns}) VALUES ({placeholders})", rows)
+
+
+def batched(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """Let ``bulk_create`` keep the ``auto_now``/``auto_now_add`` values set on the instances."""
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    flags = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in flags:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Generator:
+    def __init__(self, counts, seed=0, batch_size=20000, progress=None):
+        self.counts = counts
+        self.seed = seed
+        self.batch_size = batch_size
+        self.progress = progress or (lambda label, done: None)
+        self.random = random.Random(seed)
+        # Text is sliced from one long seeded word stream: a join per
+        # sentence instead of a random draw per word.
+        self.stream = self.random.choices(WORDS, k=STREAM_WORDS)
+
+    def text(self, words):
+        start = self.random.randrange(STREAM_WORDS - words)
+        return ' '.join(self.stream[start:start + words]).capitalize() + '.'
+
+    def paragraphs(self, count, words=60):
+        return '\n\n'.join(self.text(words) for _ in range(count))
+
+    def moment(self, after=None):
+        start = after or EPOCH
+        end = EPOCH + SPAN
+        if start >= end:
+            return start
+        return start + (end - start) * self.random.random() ** 2
+
+    def insert(self, model, objs, label=None):
+        """``bulk_create`` ``objs`` in batches, one transaction each; return how many."""
+        done = 0
+        for batch in batched(objs, self.batch_size):
+            with transaction.atomic():
+                model.objects.bulk_create(batch, batch_size=self.batch_size)
+            done += len(batch)
+            self.progress(label or model._meta.verbose_name_plural, done)
+        return done
+
+    def generate(self):
+        if User.objects.filter(email=self.email(1)).exists():
+            raise AlreadyGenerated(f"seed {self.seed} has already been generated")
+        with explicit_timestamps(User, Tag, Category, Post, Comment, ContactMessage, *CACHE_TAGS):
+            users = self.create_users()
+            post_count, published = self.create_posts(users)
+            created = {
+                'users': len(users),
+                'posts': post_count,
+                'comments': self.create_comments(users, published),
+                'contact_messages': self.create_contact_messages(),
+                'projects': self.create_projects(users),
+                'core': self.create_core(),
+            }
+        self.purge_caches()
+        return created
+
+    def email(self, n):
+        return f"user{n}.s{self.seed}@{EMAIL_DOMAIN}"
+
+    def create_users(self):
+        password = make_password(PASSWORD, salt=f'synthetic{self.seed}')
+        first = next_pk(User)
+        users = []
+        for n in range(1, self.counts.users + 1):
+            joined = self.moment()
+            users.append(User(
+                pk=first + n - 1,
+                email=self.email(n),
+                full_name=f"{self.random.choice(WORDS).title()} {self.random.choice(WORDS).title()}",
+                password=password,
+                is_active=self.random.random() < 0.95,
+                date_joined=joined,
+            ))
+        self.insert(User, users)
+        return [(user.pk, user.date_joined) for user in users]
+
+    def create_posts(self, users):
+        """Insert the posts and their tag links; return the count and ``[(pk, published_at)]`` of published ones."""
+        if not users or not self.counts.posts:
+            return 0, []
+        tags = ordered_lookup_or_create(Tag, TAGS)
+        categories = ordered_lookup_or_create(Category, CATEGORIES)
+        tag_ids = [tags[name].pk for name in TAGS]
+        category_ids = [categories[name].pk for name in CATEGORIES]
+        tag_weights = zipf_weights(len(tag_ids))
+        category_weights = zipf_weights(len(category_ids), 0.8)
+        # Most posts come from a handful of authors.
+        authors = users[:max(1, len(users) // 10)]
+        statuses, status_weights = zip(*STATUSES)
+
+        first = next_pk(Post)
+        published = []
+        links = []
+        counted_tags, counted_categories = set(), set()
+
+        def posts():
+            for n in range(self.counts.posts):
+                pk = first + n
+                author_id, joined = self.random.choice(authors)
+                created = self.moment(after=joined)
+                status = self.random.choices(statuses, status_weights)[0]
+                title = self.text(self.random.randint(4, 9))[:-1]
+                category_id = self.random.choices(category_ids, category_weights)[0] if self.random.random() < 0.9 else None
+                post_tags = set(self.random.choices(tag_ids, tag_weights, k=self.random.randint(1, 5)))
+                content = self.paragraphs(self.random.randint(2, 8))
+                post = Post(
+                    pk=pk,
+                    author_id=author_id,
+                    title=title,
+                    # The pk keeps slugs unique however the titles repeat.
+                    slug=f"{slugify(title)[:180]}-{pk}",
+                    # What Post.save would have filled in.
+                    excerpt=content[:297] + '...',
+                    content=content,
+                    category_id=category_id,
+                    status=status,
+                    is_featured=self.random.random() < 0.03,
+                    views_count=int(self.random.paretovariate(1.2) * 10),
+                    published_at=created if status != 'draft' else None,
+                    created_at=created,
+                    updated_at=created,
+                )
+                links.extend(Post.tags.through(post_id=pk, tag_id=tag_id) for tag_id in post_tags)
+                if status == post_counts.PUBLISHED:
+                    published.append((pk, created))
+                    counted_tags.update(post_tags)
+                    counted_categories.add(category_id)
+                yield post
+
+        done = 0
+        for batch in batched(posts(), self.batch_size):
+            with transaction.atomic():
+                Post.objects.bulk_create(batch, batch_size=self.batch_size)
+                Post.tags.through.objects.bulk_create(links, batch_size=self.batch_size)
+                if search.is_available():
+                    search.index_posts(post.pk for post in batch)
+            links.clear()
+            done += len(batch)
+            self.progress('posts', done)
+
+        with transaction.atomic():
+            post_counts.recount(tag_ids=counted_tags, category_ids=counted_categories - {None})
+        return done, published
+
+    def create_comments(self, users, posts):
+        """Threaded comments on published posts, most of them on the popular ones."""
+        if not posts or not self.counts.comments:
+            return 0
+        # Popularity is independent of age: shuffle before weighting.
+        ranked = list(posts)
+        self.random.shuffle(ranked)
+        per_post = Counter(self.random.choices(
+            range(len(ranked)), zipf_weights(len(ranked), 0.9), k=self.counts.comments
+        ))
+        first = next_pk(Comment)
+        segment = Comment.path_segment
+        random_, choice, text = self.random.random, self.random.choice, self.text
+        columns = (
+            'id', 'post', 'parent', 'author', 'name', 'email', 'content', 'is_approved', 'path', 'depth', 'created_at',
+        )
+
+        def rows():
+            pk = first
+            for index, count in sorted(per_post.items()):
+                post_id, published_at = ranked[index]
+                thread = []
+                for created in sorted(self.moment(after=published_at) for _ in range(count)):
+                    parent = choice(thread) if thread and random_() < REPLY_RATE else None
+                    if parent is None or parent[2] >= Comment.MAX_DEPTH:
+                        parent_id, path, depth = None, segment(pk), 0
+                    else:
+                        parent_id, path, depth = parent[0], f"{parent[1]}/{segment(pk)}", parent[2] + 1
+                    if random_() < 0.5:
+                        author_id = choice(users)[0]
+                        name, email = 'Reader', f"reader{author_id}@{EMAIL_DOMAIN}"
+                    else:
+                        author_id = None
+                        name, email = 'Guest', f"guest{pk}@{EMAIL_DOMAIN}"
+                    thread.append((pk, path, depth))
+                    yield (
+                        pk, post_id, parent_id, author_id, name, email, text(self.random.randint(5, 40)),
+                        # Stored as naive UTC, as the SQLite backend does.
+                        random_() < APPROVED_RATE, path, depth, str(created.replace(tzinfo=None)),
+                    )
+                    pk += 1
+
+        done = 0
+        for batch in batched(rows(), self.batch_size):
+            with transaction.atomic():
+                insert_rows(Comment, columns, batch)
+            done += len(batch)
+            self.progress('comments', done)
+        return done
+
+    def create_contact_messages(self):
+        statuses = [value for value, _ in ContactMessage.STATUS_CHOICES]
+
+        def messages():
+            for n in range(self.counts.contact_messages):
+                created = self.moment()
+                status = self.random.choice(statuses)
+                yield ContactMessage(
+                    name=f"{self.random.choice(WORDS).title()} Visitor",
+                    email=f"visitor{n}.s{self.seed}@{EMAIL_DOMAIN}",
+                    subject=self.text(self.random.randint(3, 8))[:200],
+                    message=self.paragraphs(self.random.randint(1, 3)),
+                    status=status,
+                    is_read=status != 'new',
+                    created_at=created,
+                    updated_at=created,
+                )
+
+        return self.insert(ContactMessage, messages(), 'contact messages')
+
+    def create_projects(self, users):
+        if not users:
+            return 0
+        return self.insert(Project, (
+            Project(
+                owner_id=self.random.choice(users)[0],
+                title=self.text(self.random.randint(2, 5))[:-1],
+                description=self.paragraphs(1),
+                link=f"https://example.com/projects/{n}" if self.random.random() < 0.6 else None,
+            )
+            for n in range(self.counts.projects)
+        ), 'projects')
+
+    def create_core(self):
+        n = self.counts.core
+        stamps = [self.moment() for _ in range(n)]
+
+        def timestamps(i):
+            return {'created_at': stamps[i], 'updated_at': stamps[i]}
+
+        def start(i):
+            return (EPOCH - datetime.timedelta(days=365 * (i + 1))).date()
+
+        created = 0
+        if not SiteSettings.objects.exists():
+            stamp = self.moment()
+            created += self.insert(SiteSettings, [SiteSettings(
+                site_title='Synthetic portfolio', tagline=self.text(6), bio=self.text(30),
+                about_text=self.paragraphs(3), contact_email=f"owner@{EMAIL_DOMAIN}",
+                created_at=stamp, updated_at=stamp,
+            )])
+        categories = [value for value, _ in Skill.CATEGORY_CHOICES]
+        levels = [value for value, _ in Skill.PROFICIENCY_CHOICES]
+        created += self.insert(Skill, (Skill(
+            name=f"{self.random.choice(TAGS).title()} {i}", category=self.random.choice(categories),
+            proficiency=self.random.choice(levels), order=i, is_featured=i < 6, **timestamps(i),
+        ) for i in range(n)))
+        created += self.insert(Service, (Service(
+            title=self.text(3)[:-1], description=self.text(25), order=i,
+            is_active=self.random.random() < 0.8, **timestamps(i),
+        ) for i in range(n)))
+        created += self.insert(Testimonial, (Testimonial(
+            client_name=f"{self.random.choice(WORDS).title()} Client", client_position='CTO',
+            content=self.text(30), rating=self.random.randint(3, 5), is_featured=i < 3,
+            is_approved=self.random.random() < 0.9, order=i, **timestamps(i),
+        ) for i in range(n)))
+        created += self.insert(Experience, (Experience(
+            company=f"{self.random.choice(WORDS).title()} Ltd", position='Engineer',
+            description=self.paragraphs(1), start_date=start(i), end_date=start(i - 1) if i else None,
+            is_current=not i, order=i, **timestamps(i),
+        ) for i in range(n)))
+        degrees = [value for value, _ in Education.DEGREE_TYPE_CHOICES]
+        created += self.insert(Education, (Education(
+            institution=f"{self.random.choice(WORDS).title()} University", degree=self.random.choice(degrees),
+            field_of_study='Computer Science', start_date=start(i), end_date=start(i - 1) if i else None,
+            order=i, **timestamps(i),
+        ) for i in range(n)))
+        platforms = [value for value, _ in SocialLink.PLATFORM_CHOICES]
+        created += self.insert(SocialLink, (SocialLink(
+            platform=platforms[i % len(platforms)], url=f"https://example.com/{self.seed}/{i}",
+            order=i, is_visible=self.random.random() < 0.9, **timestamps(i),
+        ) for i in range(n)))
+        return created
+
+    def purge_caches(self):
+        response_cache.purge('post-list', 'post-detail', 'tag-list', 'category-list', 'authors', *CACHE_TAGS.values())
+        homepage.invalidate_homepage()
+        site_settings_cache.invalidate()
+        # Most feeds and shards change; rewrite them all once, after commit.
+        transaction.on_commit(syndication.rebuild)
+
+
+def generate(counts=None, seed=0, batch_size=20000, progress=None):
+    """Generate ``counts`` (a ``Counts``) rows from ``seed``; return the number created per kind."""
+    return Generator(counts or Counts(), seed, batch_size, progress).generate()
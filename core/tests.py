@@ -1,3 +1,645 @@
-from django.test import TestCase
+import asyncio
+import io
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import uuid
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock, skipIf
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.core.management import CommandError, call_command
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import OperationalError, connection, connections, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework import serializers
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+
+from blog import post_counts
+from blog.models import Category, Comment, Post, Tag
+from blog.search import search_posts
+from blog.view_counter import view_counter
+from contact.models import ContactMessage
+from projects.models import Project
+from users.authentication import CachedJWTAuthentication
+from users.tokens import VersionedRefreshToken
+
+from . import homepage, metrics
+from .benchmark import compare, load_results, save_results
+from .db import PrimaryForWritesMiddleware, sqlite_options, use_primary
+from .images import derivative_name
+from .models import Education, Experience, Service, SiteSettings, Skill, SocialLink, Testimonial
+from .query_plans import UnsupportedDatabase, check_query_plans, plan_problems
+from .query_watch import RepeatedQueries, url_paths, watch_queries
+from .renderers import ORJSONRenderer, msgpack
+from .response_cache import ResponseCache, response_cache
+from .serializers import TestimonialSerializer
+from .site_settings import SiteSettingsCache, get_site_settings, site_settings_cache
+from .homepage import get_homepage
+from .synthetic_data import AlreadyGenerated, Counts, generate
+
+
+class HomepageTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        Skill.objects.create(name='Django', category='backend', is_featured=True)
+        Skill.objects.create(name='Excel', category='tools')
+        SocialLink.objects.create(platform='github', url='https://github.com/example')
+
+    def test_sections_are_served_from_one_snapshot(self):
+        data = self.client.get(reverse('homepage')).json()
+        self.assertIsNone(data['site_settings'])
+        self.assertEqual([s['name'] for s in data['skills']], ['Django'])
+        self.assertEqual(len(data['social_links']), 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(reverse('homepage')).json(), data)
+
+    def test_saving_a_section_model_rebuilds_the_snapshot(self):
+        self.client.get(reverse('homepage'))
+        with self.captureOnCommitCallbacks(execute=True):
+            Skill.objects.create(name='SQLite', category='database', is_featured=True)
+        data = self.client.get(reverse('homepage')).json()
+        self.assertEqual([s['name'] for s in data['skills']], ['Django', 'SQLite'])
+
+
+class SiteSettingsCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        site_settings_cache.clear()
+        self.settings = SiteSettings.objects.create(
+            site_title='Portfolio',
+            tagline='Hello',
+            bio='Bio',
+            about_text='About',
+            contact_email='me@example.com',
+        )
+
+    def test_reads_are_served_from_memory(self):
+        self.assertEqual(get_site_settings(), self.settings)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_site_settings(), self.settings)
+
+    def test_other_workers_reload_after_a_change(self):
+        other_worker = SiteSettingsCache()
+        self.assertEqual(other_worker.get().site_name, 'My Portfolio')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.settings.site_name = 'Renamed'
+            self.settings.save()
+        self.assertEqual(other_worker.get().site_name, 'Renamed')
+
+    def test_view_uses_the_cached_row(self):
+        get_site_settings()
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('site-settings'))
+        self.assertEqual(response.json()['site_title'], 'Portfolio')
+
+    @override_settings(ROOT_URLCONF='portfolio.urls_asgi', RESPONSE_CACHE={'ENABLED': False})
+    async def test_async_view_uses_the_cached_row(self):
+        await site_settings_cache.aget()
+        response = await self.async_client.get(reverse('site-settings'))
+        self.assertEqual(response.json()['site_title'], 'Portfolio')
+        response = await self.async_client.get(reverse('site-settings'), headers={'If-None-Match': response['ETag']})
+        self.assertEqual(response.status_code, 304)
+
+
+@override_settings(IMAGE_DERIVATIVE_ASYNC=False, IMAGE_DERIVATIVE_WIDTHS=(100, 400))
+class ImageDerivativeTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        override = override_settings(MEDIA_ROOT=media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def upload(self):
+        buffer = io.BytesIO()
+        Image.new('RGB', (800, 600), 'teal').save(buffer, 'PNG')
+        with self.captureOnCommitCallbacks(execute=True):
+            return Testimonial.objects.create(
+                client_name='Client',
+                client_position='CTO',
+                content='Great work',
+                client_image=SimpleUploadedFile('client.png', buffer.getvalue()),
+            )
+
+    def test_derivatives_are_generated_after_upload(self):
+        testimonial = self.upload()
+        name = testimonial.client_image.name
+        with default_storage.open(derivative_name(name, 100, 'webp')) as f:
+            self.assertEqual(Image.open(f).size, (100, 75))
+        self.assertTrue(default_storage.exists(derivative_name(name, 400, 'jpg')))
+
+        srcset = TestimonialSerializer(testimonial).data['client_image_srcset']
+        self.assertEqual(srcset['original'], f"/media/{name}")
+        self.assertEqual(
+            srcset['webp'],
+            f"/media/derivatives/{name}.100w.webp 100w, /media/derivatives/{name}.400w.webp 400w",
+        )
+
+    def test_missing_derivative_is_rendered_on_first_request(self):
+        name = self.upload().client_image.name
+        derivative = derivative_name(name, 400, 'webp')
+        default_storage.delete(derivative)
+        response = self.client.get(f"/media/{derivative}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/webp')
+        self.assertTrue(default_storage.exists(derivative))
+
+    def test_unknown_sizes_are_rejected(self):
+        name = self.upload().client_image.name
+        response = self.client.get(f"/media/derivatives/{name}.123w.webp")
+        self.assertEqual(response.status_code, 404)
+
+    def test_unreadable_source_is_not_found(self):
+        name = default_storage.save('testimonials/broken.png', io.BytesIO(b'not an image'))
+        with self.assertLogs('core.views', 'WARNING'):
+            response = self.client.get(f"/media/{derivative_name(name, 400, 'webp')}")
+        self.assertEqual(response.status_code, 404)
+
+    def test_saves_without_a_new_file_skip_the_derivative_check(self):
+        testimonial = self.upload()
+        with mock.patch('core.images.schedule_derivatives') as schedule:
+            with self.captureOnCommitCallbacks(execute=True):
+                testimonial.content = 'Still great'
+                testimonial.save()
+                Testimonial.objects.get(pk=testimonial.pk).save()
+            schedule.assert_not_called()
+
+            buffer = io.BytesIO()
+            Image.new('RGB', (10, 10), 'red').save(buffer, 'PNG')
+            testimonial.client_image = SimpleUploadedFile('other.png', buffer.getvalue())
+            with self.captureOnCommitCallbacks(execute=True):
+                testimonial.save()
+        schedule.assert_called_once_with(testimonial.client_image.name, testimonial.client_image.storage)
+
+
+class RendererTests(TestCase):
+    def setUp(self):
+        Education.objects.create(
+            institution='University', degree='bachelor', field_of_study='CS',
+            gpa=Decimal('3.85'), start_date=date(2015, 9, 1), end_date=date(2019, 6, 1),
+        )
+
+    def test_native_types(self):
+        body = ORJSONRenderer().render({
+            'gpa': Decimal('3.85'),
+            'id': uuid.UUID(int=1),
+            'at': datetime(2024, 1, 2, 3, 4, 5, tzinfo=dt_timezone.utc),
+        })
+        self.assertEqual(
+            body,
+            b'{"gpa":"3.85","id":"00000000-0000-0000-0000-000000000001","at":"2024-01-02T03:04:05Z"}',
+        )
+
+    def test_json_is_the_default(self):
+        response = self.client.get(reverse('education-list'))
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(response.json()['results'][0]['gpa'], '3.85')
+
+    @skipIf(msgpack is None, "msgpack is not installed")
+    def test_messagepack_negotiation(self):
+        response = self.client.get(reverse('education-list'), HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        self.assertEqual(msgpack.unpackb(response.content)['results'][0]['gpa'], '3.85')
+
+
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        response_cache.clear()
+        self.addCleanup(response_cache.clear)
+        self.client = APIClient()
+
+    def test_saving_a_skill_purges_skill_responses(self):
+        skill = Skill.objects.create(name='Python', category='backend', proficiency='expert')
+        list_url = reverse('skill-list')
+        detail_url = reverse('skill-detail', kwargs={'pk': skill.pk})
+        self.client.get(list_url)
+        self.client.get(detail_url)
+        self.assertEqual(self.client.get(detail_url)['X-Cache'], 'HIT')
+        skill.name = 'Django'
+        skill.save()
+        self.assertEqual(self.client.get(list_url).json()['results'][0]['name'], 'Django')
+        self.assertEqual(self.client.get(detail_url)['X-Cache'], 'MISS')
+
+    @override_settings(ROOT_URLCONF='portfolio.urls_asgi')
+    async def test_async_views_keep_cache_reads_off_the_event_loop(self):
+        await SiteSettings.objects.acreate(
+            site_title='Portfolio', tagline='Hello', bio='Bio', about_text='About', contact_email='me@example.com'
+        )
+        await Skill.objects.acreate(name='Python', category='backend', proficiency='expert')
+        site_settings_cache.clear()
+        on_loop = []
+
+        def watch(method):
+            def wrapper(self, *args, **kwargs):
+                try:
+                    asyncio.get_running_loop()
+                    on_loop.append(method.__name__)
+                except RuntimeError:
+                    pass
+                return method(self, *args, **kwargs)
+            return wrapper
+
+        backend = type(caches['default'])
+        patches = [mock.patch.object(backend, name, watch(getattr(backend, name))) for name in ('get', 'get_many', 'add')]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        for url in (reverse('site-settings'), reverse('skill-list')):
+            for expected in ('MISS', 'HIT'):
+                response = await self.async_client.get(url)
+                self.assertEqual(response['X-Cache'], expected)
+        self.assertEqual(on_loop, [])
+
+    @override_settings(RESPONSE_CACHE={'MAX_ENTRIES': 2})
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = ResponseCache()
+        for key in 'abc':
+            cache.set(key, HttpResponse(key), ['t'], cache.tag_versions(['t']))
+        self.assertIsNone(cache.get('a'))
+        self.assertIsNotNone(cache.get('c'))
+        stats = cache.stats()
+        self.assertEqual((stats['entries'], stats['evictions'], stats['hits'], stats['misses']), (2, 1, 1, 1))
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaRoutingTests(TransactionTestCase):
+    """Reads against a SQLite file copied from the test database."""
+
+    def setUp(self):
+        Skill.objects.create(name='Python', category='backend', proficiency='expert')
+        handle, self.replica_path = tempfile.mkstemp(suffix='.sqlite3')
+        os.close(handle)
+        self.addCleanup(os.remove, self.replica_path)
+        self.copy_to_replica()
+        connections.settings['replica'] = {
+            **connections.settings['default'], 'NAME': self.replica_path, 'OPTIONS': sqlite_options(replica=True),
+        }
+        self.addCleanup(connections.settings.pop, 'replica')
+        self.addCleanup(connections.__delitem__, 'replica')
+        self.addCleanup(lambda: connections['replica'].close())
+        # Allow the alias for this test only, so teardown does not flush it.
+        allow = mock.patch.object(type(self), 'databases', {'default', 'replica'})
+        allow.start()
+        self.addCleanup(allow.stop)
+        # Written after the copy: only visible on the primary.
+        Skill.objects.create(name='Django', category='backend', proficiency='advanced')
+
+    def copy_to_replica(self):
+        if 'replica' in connections:
+            connections['replica'].close()
+        connection.ensure_connection()
+        with sqlite3.connect(self.replica_path) as replica:
+            connection.connection.backup(replica)
+        replica.close()
+
+    def names(self):
+        return sorted(Skill.objects.values_list('name', flat=True))
+
+    def test_reads_use_the_replica_unless_pinned(self):
+        self.assertEqual(self.names(), ['Python'])
+        with use_primary():
+            self.assertEqual(self.names(), ['Django', 'Python'])
+        with transaction.atomic():
+            self.assertEqual(self.names(), ['Django', 'Python'])
+        Skill.objects.filter(name='Python').update(is_featured=True)
+        self.assertFalse(Skill.objects.filter(is_featured=True).exists())
+        with self.assertRaises(OperationalError):
+            connections['replica'].cursor().execute("DELETE FROM core_skill")
+
+    def listed_skills(self):
+        return sorted(skill['name'] for skill in self.client.get(reverse('skill-list')).json()['results'])
+
+    def test_caches_refill_from_the_primary(self):
+        cache.clear()
+        site_settings_cache.clear()
+        response_cache.clear()
+        self.addCleanup(response_cache.clear)
+        user = get_user_model().objects.create_user(
+            email='reader@example.com', password='secret', full_name='Reader', is_active=True
+        )
+        token = VersionedRefreshToken.for_user(user).access_token
+        self.copy_to_replica()
+        authentication = CachedJWTAuthentication()
+        self.assertIsNone(get_site_settings())
+        self.assertEqual(get_homepage()['skills'], [])
+        self.assertEqual(authentication.get_user(token).pk, user.pk)
+        self.assertEqual(self.listed_skills(), ['Django', 'Python'])
+
+        # Changes the lagging replica has not seen; each one invalidates a cache.
+        user.is_active = False
+        user.save()
+        SiteSettings.objects.create(site_name='Portfolio', tagline='Hello', contact_email='me@example.com')
+        Skill.objects.filter(name='Django').update(is_featured=True)
+        homepage.invalidate_homepage()
+        Skill.objects.create(name='Rust', category='backend')
+        self.assertFalse(Skill.objects.filter(is_featured=True).exists())
+
+        self.assertEqual(get_site_settings().site_name, 'Portfolio')
+        self.assertEqual([skill['name'] for skill in get_homepage()['skills']], ['Django'])
+        with self.assertRaises(AuthenticationFailed):
+            authentication.get_user(token)
+        self.assertEqual(self.listed_skills(), ['Django', 'Python', 'Rust'])
+
+    def test_unsafe_requests_read_from_the_primary(self):
+        middleware = PrimaryForWritesMiddleware(lambda request: HttpResponse(', '.join(self.names())))
+        factory = RequestFactory()
+        self.assertEqual(middleware(factory.get('/')).content, b'Python')
+        self.assertEqual(middleware(factory.post('/')).content, b'Django, Python')
+
+
+class QueryPlanTests(TestCase):
+    def test_every_list_view_uses_an_index(self):
+        out = io.StringIO()
+        call_command('check_query_plans', stdout=out)
+        self.assertIn('query plans use indexes', out.getvalue())
+
+    def test_authenticated_variants_are_checked_when_they_differ(self):
+        labels = [result.label for result in check_query_plans()]
+        self.assertIn('post-list-create /api/blog/posts/ (authenticated)', labels)
+        self.assertIn('post-list-create /api/blog/posts/?is_featured=true (authenticated)', labels)
+        self.assertNotIn('skill-list /api/core/skills/ (authenticated)', labels)
+
+    def test_other_databases_are_unsupported(self):
+        with mock.patch.object(connection, 'vendor', 'postgresql'):
+            with self.assertRaises(UnsupportedDatabase):
+                check_query_plans()
+            with self.assertRaisesMessage(CommandError, 'only checked on SQLite'):
+                call_command('check_query_plans')
+
+    def test_scans_and_temporary_sorts_are_reported(self):
+        problems = plan_problems([
+            '2 0 0 SCAN core_skill',
+            '3 0 0 SCAN core_skill USING INDEX core_skill_order_idx',
+            '4 0 0 SEARCH blog_post USING INDEX blog_post_status_pub_idx (status=?)',
+            '5 0 0 USE TEMP B-TREE FOR ORDER BY',
+        ])
+        self.assertEqual(len(problems), 2)
+        self.assertIn('full scan of core_skill', problems[0])
+        self.assertIn('temporary sort', problems[1])
+
+
+@override_settings(RESPONSE_CACHE={'ENABLED': False})
+class MetricsTests(TestCase):
+    def setUp(self):
+        metrics.registry.clear()
+        self.addCleanup(metrics.registry.clear)
+        self.client = APIClient()
+        Skill.objects.create(name='Python', category='backend', proficiency='expert')
+
+    def scrape(self, **extra):
+        # The test client connects from 127.0.0.1, which is allow-listed by default.
+        response = self.client.get(reverse('metrics'), **extra)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        return response.content.decode()
+
+    def test_requests_are_recorded_per_view(self):
+        for _ in range(2):
+            self.client.get(reverse('skill-list'))
+        self.client.get('/api/missing/')
+        text = self.scrape()
+        labels = '{view="skill-list",method="GET",status="200"}'
+        self.assertIn(f'portfolio_http_request_duration_seconds_count{labels} 2', text)
+        self.assertIn('portfolio_http_request_duration_seconds_bucket{view="skill-list",method="GET",'
+                      'status="200",le="+Inf"} 2', text)
+        self.assertIn('{view="unresolved",method="GET",status="404"} 1', text)
+        queries = [line for line in text.splitlines() if line.startswith(f'portfolio_db_queries_per_request_sum{labels}')]
+        self.assertGreater(float(queries[0].split()[-1]), 0)
+        serializer = [line for line in text.splitlines() if line.startswith(f'portfolio_serializer_duration_seconds_total{labels}')]
+        self.assertGreater(float(serializer[0].split()[-1]), 0)
+        self.assertIn('portfolio_response_cache_hits ', text)
+        self.assertIn('portfolio_user_cache_hit_rate ', text)
+
+    @override_settings(METRICS={'TOKEN': 'scrape-me', 'ALLOWED_IPS': []})
+    def test_token_or_allowed_address_only(self):
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 401)
+        wrong = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer nope')
+        self.assertEqual(wrong.status_code, 401)
+        self.assertEqual(wrong['WWW-Authenticate'], 'Bearer realm="metrics"')
+        self.scrape(HTTP_AUTHORIZATION='Bearer scrape-me')
+
+        # Staff JWTs are not scraper credentials.
+        staff = get_user_model().objects.create_user(
+            email='staff@example.com', password='secret', full_name='Staff', is_staff=True
+        )
+        access = VersionedRefreshToken.for_user(staff).access_token
+        self.assertEqual(self.client.get(reverse('metrics'), HTTP_AUTHORIZATION=f'Bearer {access}').status_code, 401)
+
+        with override_settings(METRICS={'ALLOWED_IPS': ['10.0.0.0/8']}):
+            self.scrape(REMOTE_ADDR='10.1.2.3')
+            self.assertEqual(self.client.get(reverse('metrics'), REMOTE_ADDR='192.168.0.1').status_code, 401)
+            # No token configured: none is accepted.
+            self.assertEqual(
+                self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer ', REMOTE_ADDR='192.168.0.1').status_code,
+                401,
+            )
+
+    def test_threads_record_into_their_own_shards(self):
+        request_metrics = metrics.RequestMetrics()
+        request_metrics.queries = 3
+        labels = ('skill-list', 'GET', '200')
+        worker = threading.Thread(target=metrics.registry.observe, args=(labels, 0.02, 512, request_metrics))
+        worker.start()
+        worker.join()
+        metrics.registry.observe(labels, 0.2, 512, request_metrics)
+        series = metrics.registry.snapshot()[labels]
+        self.assertEqual(series.latency.count, 2)
+        self.assertEqual(series.queries.sum, 6)
+
+
+@override_settings(RESPONSE_CACHE={'ENABLED': False}, BLOG_VIEW_COUNT_FLUSH_THRESHOLD=10 ** 6)
+class QueryWatchTests(TestCase):
+    ROWS = 6
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        override = override_settings(MEDIA_ROOT=media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.addCleanup(view_counter.clear)
+        self.client = APIClient()
+        self.staff = get_user_model().objects.create_user(
+            email='staff@example.com', password='secret', full_name='Staff', is_staff=True, is_active=True
+        )
+        SiteSettings.objects.create(site_name='Portfolio', tagline='Hello', contact_email='me@example.com')
+        for n in range(self.ROWS):
+            post = Post.objects.create(
+                author=self.staff, category=Category.objects.create(name=f"Category {n}"),
+                title=f"Post {n}", content="Body", status='published', is_featured=True,
+            )
+            post.tags.add(Tag.objects.create(name=f"tag-{n}"))
+            root = Comment.objects.create(post=post, name='Reader', email='r@example.com', content='Hi', is_approved=True)
+            Comment.objects.create(post=post, parent=root, name='Reader', email='r@example.com', content='Hi', is_approved=True)
+            Project.objects.create(owner=self.staff, title=f"Project {n}", description='Project')
+            Skill.objects.create(name=f"Skill {n}", category='backend', is_featured=True)
+            Service.objects.create(title=f"Service {n}", description='Service')
+            Testimonial.objects.create(client_name=f"Client {n}", client_position='CEO', content='Great', is_featured=True)
+            Experience.objects.create(company=f"Company {n}", position='Engineer', description='Work', start_date=date(2020, 1, n + 1))
+            Education.objects.create(institution=f"School {n}", degree='bachelor', field_of_study='CS', start_date=date(2010, 1, n + 1))
+            SocialLink.objects.create(platform='github', url=f"https://github.com/example{n}")
+            ContactMessage.objects.create(name='Visitor', email='v@example.com', subject=f"Hello {n}", message='Hi')
+        self.kwargs = {
+            'pk': 1,
+            'slug': post.slug,
+            'post_id': post.pk,
+            'export_format': 'csv',
+            'name': 'missing.webp',
+            'shard': 1,
+            'feed': {'name': 'rss.xml'},
+            **{name: {'pk': model.objects.first().pk} for name, model in (
+                ('project-detail', Project), ('skill-detail', Skill), ('service-detail', Service),
+                ('testimonial-detail', Testimonial), ('experience-detail', Experience),
+                ('education-detail', Education), ('social-link-detail', SocialLink),
+                ('contact-detail', ContactMessage),
+            )},
+        }
+
+    def test_no_url_repeats_a_query_per_row(self):
+        for user in (None, self.staff):
+            self.client.force_authenticate(user)
+            for name, path in [*url_paths(self.kwargs), ('post-search', '/api/blog/posts/search/?q=post')]:
+                with self.subTest(name=name, path=path, staff=user is not None):
+                    with watch_queries(path, raise_errors=True):
+                        response = self.client.get(path)
+                        if response.streaming:
+                            b''.join(response.streaming_content)
+                    self.assertLess(response.status_code, 500)
+
+    def test_repeated_queries_name_the_serializer_field(self):
+        class SkillCountSerializer(serializers.ModelSerializer):
+            featured = serializers.SerializerMethodField()
+
+            class Meta:
+                model = Skill
+                fields = ['name', 'featured']
+
+            def get_featured(self, skill):
+                return Skill.objects.filter(pk=skill.pk, is_featured=True).exists()
+
+        with self.assertRaises(RepeatedQueries) as raised:
+            with watch_queries('skills', raise_errors=True):
+                SkillCountSerializer(Skill.objects.all(), many=True).data
+        message = str(raised.exception)
+        self.assertIn(f'{self.ROWS} x [default]', message)
+        self.assertIn('SkillCountSerializer.featured', message)
+
+    def test_slow_queries_are_logged(self):
+        with self.assertLogs('core.query_watch', 'WARNING') as logs:
+            with watch_queries('skills', slow_query_ms=0):
+                list(Skill.objects.all())
+        self.assertIn('Slow query', logs.output[0])
+        self.assertIn('in skills', logs.output[0])
+
+
+class BenchmarkResultsTests(TestCase):
+    def summary(self, throughput, p50, p99):
+        return {'throughput': throughput, 'p50_ms': p50, 'p95_ms': p50, 'p99_ms': p99}
+
+    def test_results_round_trip_and_compare(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'baseline.json')
+        save_results(path, {'tags': self.summary(100, 10, 20), 'skills': self.summary(100, 10, 20)}, threads=4)
+        baseline = load_results(path)
+        self.assertEqual(baseline['parameters'], {'threads': 4})
+
+        changes = compare(baseline, {
+            'tags': self.summary(80, 10.5, 30),
+            'skills': self.summary(120, 9, 15),
+            'new-endpoint': self.summary(1, 1, 1),
+        })
+        self.assertNotIn('new-endpoint', changes)
+        self.assertTrue(changes['tags']['throughput'][3])
+        self.assertFalse(changes['tags']['p50_ms'][3])
+        self.assertTrue(changes['tags']['p99_ms'][3])
+        self.assertFalse(any(regressed for *_, regressed in changes['skills'].values()))
+
+
+class BenchmarkIsolationTests(SimpleTestCase):
+    # benchmark_database() swaps the default database, so the commands run
+    # in a child process against a real (temporary) MEDIA_ROOT.
+    SCRIPT = """
+import sys
+import django
+from django.core.management import call_command
+from django.test import override_settings
+django.setup()
+with override_settings(MEDIA_ROOT=sys.argv[1]):
+    call_command('benchmark_post_detail', threads=1, requests=2, posts=3, stdout=sys.stderr)
+    call_command('benchmark_async_reads', threads=1, concurrency=2, requests=4, posts=3, stdout=sys.stderr)
+    call_command('benchmark_endpoints', threads=1, requests=1, posts=3, endpoints=['feed', 'sitemap'], stdout=sys.stderr)
+"""
+
+    def test_benchmarks_leave_media_root_alone(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        result = subprocess.run(
+            [sys.executable, '-c', self.SCRIPT, media_root],
+            cwd=settings.BASE_DIR,
+            env={**os.environ, 'DJANGO_SETTINGS_MODULE': 'portfolio.settings'},
+            capture_output=True,
+            text=True,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn('buffered', result.stderr)
+        self.assertEqual(os.listdir(media_root), [])
+
+
+class SyntheticDataTests(TestCase):
+    counts = Counts(users=20, posts=60, comments=400, contact_messages=10, projects=5, core=3)
+
+    def test_generated_rows_are_consistent(self):
+        created = generate(self.counts, seed=3, batch_size=50)
+        self.assertEqual(created['posts'], 60)
+        self.assertEqual(Comment.objects.count(), 400)
+        self.assertEqual(ContactMessage.objects.count(), 10)
+        self.assertEqual(Skill.objects.count(), 3)
+        self.assertEqual(SiteSettings.objects.count(), 1)
+
+        # What the skipped save() hooks and signals would have maintained.
+        self.assertEqual(post_counts.recount(), 0)
+        self.assertFalse(Post.objects.filter(slug='').exists())
+        self.assertFalse(Post.objects.filter(excerpt='').exists())
+        post = Post.objects.filter(status='published').first()
+        _, hits = search_posts(post.title, Post.objects.filter(pk=post.pk))
+        self.assertEqual(hits[0][0], post.pk)
+        for comment in Comment.objects.select_related('parent'):
+            if comment.parent is None:
+                self.assertEqual((comment.path, comment.depth), (Comment.path_segment(comment.pk), 0))
+            else:
+                self.assertEqual(comment.path, f"{comment.parent.path}/{Comment.path_segment(comment.pk)}")
+                self.assertEqual(comment.depth, comment.parent.depth + 1)
+                self.assertEqual(comment.post_id, comment.parent.post_id)
+
+        with self.assertRaises(AlreadyGenerated):
+            generate(self.counts, seed=3)
+
+    def test_same_seed_same_rows(self):
+        def snapshot():
+            return (
+                list(Post.objects.order_by('pk').values_list('slug', 'status', 'category__name', 'published_at')),
+                list(Post.tags.through.objects.order_by('post_id', 'tag__name').values_list('tag__name', flat=True)),
+                list(Comment.objects.order_by('pk').values_list('content', 'path', 'created_at')),
+            )
+
+        generate(self.counts, seed=5)
+        first = snapshot()
+        for model in (Comment, Post, get_user_model()):
+            model.objects.all().delete()
+        generate(self.counts, seed=5)
+        self.assertEqual(snapshot(), first)
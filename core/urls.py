@@ -0,0 +1,47 @@
+from django.urls import path
+from .views import (
+    HomepageView,
+    MetricsView,
+    SiteSettingsView,
+    SkillListView,
+    SkillDetailView,
+    ServiceListView,
+    SerivceDetailView,
+    TestimonialListCreateView,
+    TestimonialDetailView,
+    ExperienceListView,
+    ExperienceDetailView,
+    EducationListView,
+    EducationDetailView,
+    SocialLinkView,
+    SocialLinkDetailView,
+)
+
+urlpatterns = [
+    # Homepage
+    path('homepage/', HomepageView.as_view(), name='homepage'),
+    path('settings/', SiteSettingsView.as_view(), name='site-settings'),
+    path('metrics/', MetricsView.as_view(), name='metrics'),
+
+    # Skills
+    path('skills/', SkillListView.as_view(), name='skill-list'),
+    path('skills/<int:pk>/', SkillDetailView.as_view(), name='skill-detail'),
+
+    # Services
+    path('services/', ServiceListView.as_view(), name='service-list'),
+    path('services/<int:pk>/', SerivceDetailView.as_view(), name='service-detail'),
+
+    # Testimonials
+    path('testimonials/', TestimonialListCreateView.as_view(), name='testimonial-list-create'),
+    path('testimonials/<int:pk>/', TestimonialDetailView.as_view(), name='testimonial-detail'),
+
+    # Experience and education
+    path('experience/', ExperienceListView.as_view(), name='experience-list'),
+    path('experience/<int:pk>/', ExperienceDetailView.as_view(), name='experience-detail'),
+    path('education/', EducationListView.as_view(), name='education-list'),
+    path('education/<int:pk>/', EducationDetailView.as_view(), name='education-detail'),
+
+    # Social links
+    path('social-links/', SocialLinkView.as_view(), name='social-link-list'),
+    path('social-links/<int:pk>/', SocialLinkDetailView.as_view(), name='social-link-detail'),
+]
@@ -1,9 +1,20 @@
+import logging
+
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpResponse
 from django.shortcuts import render
+from django.utils.http import quote_etag
+from django.views.decorators.http import require_safe
+from PIL import UnidentifiedImageError
 from rest_framework import generics, permissions
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.response import Response
 from rest_framework.views import APIView
+
+from blog.view_counter import view_counter
+from users.authentication import user_cache
 from .models import (
-    SiteSettings,
     Skill,
     Service,
     Testimonial,
@@ -21,20 +32,115 @@ from .serializers import (
     SocialLinkSerializer,
     
 )
+from .async_views import AsyncListView, AsyncReadView
+from .conditional import ConditionalGetMixin
+from .homepage import get_homepage
+from .response_cache import CachedResponseMixin, response_cache
+from . import metrics
+from .metrics import SerializerTimingMixin
+from .images import FORMATS, generate_derivatives, parse_derivative_name
+from .site_settings import aget_site_settings, get_site_settings
+
+logger = logging.getLogger(__name__)
+
+
+@require_safe
+def image_derivative(request, name):
+    """
+    Serve a resized image, rendering it first if the background pipeline
+    has not produced it yet.
+    """
+    name = f"derivatives/{name}"
+    parsed = parse_derivative_name(name)
+    if parsed is None:
+        raise Http404("Unknown image size")
+    source, width, ext = parsed
+    if not default_storage.exists(name):
+        if not default_storage.exists(source):
+            raise Http404("Image not found")
+        try:
+            generate_derivatives(source, widths=[width], exts=[ext])
+        except (UnidentifiedImageError, OSError) as exc:
+            logger.warning("Rendering %s failed: %r", name, exc)
+            raise Http404("Image could not be rendered")
+    response = FileResponse(default_storage.open(name), content_type=FORMATS[ext][1])
+    response['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
 
-class SiteSettingsView(APIView):
 
+class HomepageView(APIView):
+    """Every homepage section in one payload, served from a cached snapshot."""
 
     permission_classes = [permissions.AllowAny]
 
     def get(self, request):
+        return Response(get_homepage())
+
+
+class MetricsTokenAuthentication(BaseAuthentication):
+    """``Authorization: Bearer <METRICS['TOKEN']>``; identifies the scraper, not a user."""
+
+    def authenticate(self, request):
+        header = get_authorization_header(request).split()
+        if not header or header[0].lower() != b'bearer':
+            return None
+        if len(header) != 2 or not metrics.valid_token(header[1].decode('latin-1')):
+            raise AuthenticationFailed("Invalid metrics token")
+        return None, 'metrics-token'
+
+    def authenticate_header(self, request):
+        return 'Bearer realm="metrics"'
+
+
+class CanScrapeMetrics(permissions.BasePermission):
+    def has_permission(self, request, view):
+        return request.auth == 'metrics-token' or metrics.allowed_address(request.META.get('REMOTE_ADDR', ''))
+
+
+class MetricsView(APIView):
+    """Request metrics and cache statistics for Prometheus; token or allow-listed address."""
+
+    authentication_classes = [MetricsTokenAuthentication]
+    permission_classes = [CanScrapeMetrics]
+
+    def get(self, request):
+        gauges = {}
+        for prefix, stats in (('response_cache', response_cache.stats()), ('user_cache', user_cache.stats())):
+            gauges.update((f"portfolio_{prefix}_{name}", value) for name, value in stats.items())
+        gauges['portfolio_view_counter_pending'] = view_counter.pending()
+        return HttpResponse(metrics.render(gauges), content_type=metrics.CONTENT_TYPE)
+
+
+class SiteSettingsView(CachedResponseMixin, ConditionalGetMixin, APIView):
+
+
+    permission_classes = [permissions.AllowAny]
+    cache_tags = ['core:site-settings']
+
+    def get_validators(self, request):
+        # Validate against the cached row so a 304 costs no query at all.
+        return self.settings_validators(get_site_settings())
+
+    async def aget_validators(self, request):
+        return self.settings_validators(await aget_site_settings())
+
+    @staticmethod
+    def settings_validators(settings):
+        if settings is None:
+            return None, None
+        return quote_etag(f"site-settings-{settings.pk}-{settings.updated_at.timestamp()}"), settings.updated_at
+
+    def get(self, request):
+        return self.conditional_response(request, self.get_settings)
+
+    def get_settings(self, request):
 
         try:
-            settings = SiteSettings.objects.first()
+            settings = get_site_settings()
             if settings:
                 serializer = SiteSettingsSerializer(settings)
                 return Response(serializer.data)
-            return response({
+            return Response({
                 'message': 'Site settings not configured yet'
 
             },status=404)
@@ -44,41 +150,45 @@ class SiteSettingsView(APIView):
 
             }, status=500)
         
-class SkillListView(generics.ListAPIView):
+class SkillListView(SerializerTimingMixin, CachedResponseMixin, ConditionalGetMixin, generics.ListAPIView):
     queryset = Skill.objects.all()
     serializer_class = SkillSerializer
     permission_classes = [permissions.AllowAny]
+    cache_tags = ['core:skills']
     def get_queryset(self):
         queryset =Skill.objects.all()
         category = self.request.query_params.get('category', None)
         if category:
             queryset = queryset.filter(category=category)
 
-
-            proficiency = self.request.query_params.get('preficiency', None)
-            if proficiency:
-                queryset = queryset.filter(proficiency=proficiency)
-            is_featured = self.request.query_params.get('featured', None)
-            if is_featured:
-                queryset = queryset.filter(is_featured=True)
-            return queryset
-class SkillDetailView(generics.RetrieveAPIView):
-    queryset = Skill.objects.all
+        proficiency = self.request.query_params.get('proficiency', None)
+        if proficiency:
+            queryset = queryset.filter(proficiency=proficiency)
+        is_featured = self.request.query_params.get('featured', None)
+        if is_featured:
+            queryset = queryset.filter(is_featured=True)
+        return queryset
+class SkillDetailView(SerializerTimingMixin, CachedResponseMixin, ConditionalGetMixin, generics.RetrieveAPIView):
+    queryset = Skill.objects.all()
     serializer_class = SkillSerializer
     permission_classes = [permissions.AllowAny]
-class ServiceListView(generics.ListAPIView):
+    cache_tags = ['core:skills:{pk}']
+class ServiceListView(SerializerTimingMixin, CachedResponseMixin, ConditionalGetMixin, generics.ListAPIView):
     queryset = Service.objects.filter(is_active=True)
     serializer_class = ServiceSerializer
     permission_classes = [permissions.AllowAny]
-class SerivceDetailView(generics.RetrieveAPIView):
+    cache_tags = ['core:services']
+class SerivceDetailView(SerializerTimingMixin, CachedResponseMixin, ConditionalGetMixin, generics.RetrieveAPIView):
     queryset = Service.objects.all()
     serializer_class = ServiceSerializer
     permission_classes = [permissions.AllowAny]
-class TestimonialSerializer(generics.ListCreateAPIView):
+    cache_tags = ['core:services:{pk}']
+class TestimonialListCreateView(SerializerTimingMixin, CachedResponseMixin, ConditionalGetMixin, generics.ListCreateAPIView):
 
-    queryset + Testimonial.objects.filter(is_approved=True)
+    queryset = Testimonial.objects.filter(is_approved=True)
     serializer_class = TestimonialSerializer
     permission_classes = [permissions.AllowAny]
+    cache_tags = ['core:testimonials']
     def get_queryset(self):
         queryset = Testimonial.objects.filter(is_approved=True)
 
@@ -86,16 +196,18 @@ class TestimonialSerializer(generics.ListCreateAPIView):
         if is_featured:
             queryset = queryset.filter(is_featured=True)
         return queryset
-class TestimonialDetailView(generics.RetrieveAPIView):
+class TestimonialDetailView(SerializerTimingMixin, CachedResponseMixin, ConditionalGetMixin, generics.RetrieveAPIView):
     queryset = Testimonial.objects.filter(is_approved=True)
     serializer_class = TestimonialSerializer
     permission_classes = [permissions.AllowAny]
-class ExperienceListView(generics.ListAPIView):
+    cache_tags = ['core:testimonials:{pk}']
+class ExperienceListView(SerializerTimingMixin, CachedResponseMixin, ConditionalGetMixin, generics.ListAPIView):
 
 
     queryset = Experience.objects.all()
     serializer_class = ExperienceSerializer
     permission_classes = [permissions.AllowAny]
+    cache_tags = ['core:experience']
 
     def get_queryset(self):
         queryset = Experience.objects.all()
@@ -108,45 +220,84 @@ class ExperienceListView(generics.ListAPIView):
         if is_current:
             queryset = queryset.filter(is_current=True)
         return queryset
-class ExperienceDetailView(generics.RetrieveAPIView):
+class ExperienceDetailView(SerializerTimingMixin, CachedResponseMixin, ConditionalGetMixin, generics.RetrieveAPIView):
 
     queryset = Experience.objects.all()
     serializer_class = ExperienceSerializer
     permission_classes = [permissions.AllowAny]
-class EducationListView(generics.ListAPIView):
+    cache_tags = ['core:experience:{pk}']
+class EducationListView(SerializerTimingMixin, CachedResponseMixin, ConditionalGetMixin, generics.ListAPIView):
 
 
     queryset = Education.objects.all()
     serializer_class = EducationSerializer
     permission_classes = [permissions.AllowAny]
+    cache_tags = ['core:education']
     def get_queryset(self):
         queryset = Education.objects.all()
 
-        degree = queryset.filter('degree', None)
+        degree = self.request.query_params.get('degree', None)
         if degree:
             queryset = queryset.filter(degree=degree)
         is_current  = self.request.query_params.get('current', None)
         if is_current:
             queryset = queryset.filter(is_current=True)
         return queryset
-class EducationDetailView(generics.RetrieveAPIView):
+class EducationDetailView(SerializerTimingMixin, CachedResponseMixin, ConditionalGetMixin, generics.RetrieveAPIView):
 
     queryset = Education.objects.all()
     serializer_class = EducationSerializer
     permission_classes = [permissions.AllowAny]
+    cache_tags = ['core:education:{pk}']
 
-class SocialLinkView(generics.ListAPIView):
+class SocialLinkView(SerializerTimingMixin, CachedResponseMixin, ConditionalGetMixin, generics.ListAPIView):
 
     queryset = SocialLink.objects.filter(is_visible=True)
     serializer_class = SocialLinkSerializer
     permission_classes = [permissions.AllowAny]
-class SocialLinkDetailView(generics.RetrieveAPIView):
+    cache_tags = ['core:social-links']
+class SocialLinkDetailView(SerializerTimingMixin, CachedResponseMixin, ConditionalGetMixin, generics.RetrieveAPIView):
     queryset = SocialLink.objects.all()
     serializer_class = SocialLinkSerializer
     permission_classes =[permissions.AllowAny]
+    cache_tags = ['core:social-links:{pk}']
+
+
+# Async read path (ASGI, see portfolio.urls_asgi).
+
+class SiteSettingsAsyncView(AsyncReadView):
+    drf_view = SiteSettingsView
+
+    async def get_data(self, drf):
+        settings = await aget_site_settings()
+        if settings is None:
+            return {'message': 'Site settings not configured yet'}, 404
+        return SiteSettingsSerializer(settings).data, 200
+
+
+class SkillListAsyncView(AsyncListView):
+    drf_view = SkillListView
+    async_params = AsyncListView.async_params | {'category', 'proficiency', 'featured'}
+
+
+class ServiceListAsyncView(AsyncListView):
+    drf_view = ServiceListView
+
+
+class TestimonialListAsyncView(AsyncListView):
+    drf_view = TestimonialListCreateView
+    async_params = AsyncListView.async_params | {'featured'}
+
 
+class ExperienceListAsyncView(AsyncListView):
+    drf_view = ExperienceListView
+    async_params = AsyncListView.async_params | {'type', 'current'}
 
 
+class EducationListAsyncView(AsyncListView):
+    drf_view = EducationListView
+    async_params = AsyncListView.async_params | {'degree', 'current'}
 
 
-# Create your views here.
+class SocialLinkAsyncView(AsyncListView):
+    drf_view = SocialLinkView
@@ -11,6 +11,11 @@ import os
 
 from django.core.asgi import get_asgi_application
 
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "portfolio.settings")
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "portfolio.settings_asgi")
 
 application = get_asgi_application()
+
+# Server processes also write buffered post views back on a timer.
+from blog.view_counter import view_counter  # noqa: E402
+
+view_counter.start_background_flush()
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import importlib.util
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -44,12 +45,17 @@ INSTALLED_APPS = [
     "projects",
     "blog",
     "core",
+    "contact",
 
 ]
 
 MIDDLEWARE = [
+    # First, so its latency covers the rest of the stack.
+    "core.metrics.MetricsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "core.db.PrimaryForWritesMiddleware",
+    "core.query_watch.QueryWatchMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -89,6 +95,72 @@ DATABASES = {
     }
 }
 
+# Reads go to one of DATABASE_REPLICAS (aliases in DATABASES) when any are
+# configured; see core.db and portfolio.settings_production.
+DATABASE_ROUTERS = ['core.db.ReplicaRouter']
+DATABASE_REPLICAS = []
+
+
+# Cache
+# Snapshots such as the homepage payload live here and are invalidated by
+# signals. Point this at a shared backend (Redis, Memcached) when running
+# several worker processes so invalidation reaches all of them.
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
+CORE_HOMEPAGE_CACHE_TIMEOUT = 60 * 60
+
+# Per-process LRU of rendered anonymous GET responses (core.response_cache).
+# Tag versions live in CACHES['default'], which must be shared between
+# workers for purges to reach all of them.
+RESPONSE_CACHE = {
+    'ENABLED': True,
+    'MAX_ENTRIES': 1000,
+    'MAX_BYTES': 32 * 1024 * 1024,
+    'TIMEOUT': 300,
+}
+
+# N+1 and slow-query logging (core.query_watch); ENABLED defaults to DEBUG.
+QUERY_WATCH = {
+    'REPEAT_THRESHOLD': 5,
+    'SLOW_QUERY_MS': 100,
+    'RAISE': False,
+}
+
+# Prometheus scrapes /api/core/metrics/ with `Authorization: Bearer TOKEN`
+# or from an address in ALLOWED_IPS (REMOTE_ADDR, so list the proxy when
+# behind one).
+METRICS = {
+    'TOKEN': None,
+    'ALLOWED_IPS': ['127.0.0.1', '::1'],
+}
+
+
+# Email
+# Contact notifications are queued in contact.OutboxEmail and delivered by
+# `manage.py send_outbox`, never inside the request.
+
+EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
+DEFAULT_FROM_EMAIL = "noreply@example.com"
+ADMIN_EMAIL = "admin@example.com"
+
+CONTACT_OUTBOX = {
+    "BATCH_SIZE": 50,
+    "MAX_ATTEMPTS": 5,
+    # Retry n waits RETRY_BACKOFF * 2 ** (n - 1) seconds, capped at RETRY_BACKOFF_MAX.
+    "RETRY_BACKOFF": 60,
+    "RETRY_BACKOFF_MAX": 60 * 60,
+    # Digest mode holds notifications until DIGEST_SIZE are waiting or the
+    # oldest has waited DIGEST_WINDOW seconds, then sends them as one email.
+    "DIGEST": False,
+    "DIGEST_SIZE": 20,
+    "DIGEST_WINDOW": 5 * 60,
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -132,12 +204,60 @@ STATIC_URL = "static/"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedJWTAuthentication',
     ),
+    # Keyset pagination; views can set page_size / max_page_size.
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.KeysetPagination',
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
+# MessagePack is served to clients sending `Accept: application/msgpack`
+# when the msgpack package is installed.
+if importlib.util.find_spec('msgpack') is not None:
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'].append('core.renderers.MessagePackRenderer')
+    REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'].append('core.renderers.MessagePackParser')
 AUTH_USER_MODEL = 'users.User'
+
+# Access tokens carry a token_version claim; CachedJWTAuthentication keeps up
+# to USER_AUTH_CACHE_MAX_ENTRIES resolved users per process.
+SIMPLE_JWT = {
+    'TOKEN_OBTAIN_SERIALIZER': 'users.tokens.TokenObtainPairSerializer',
+}
+USER_AUTH_CACHE_MAX_ENTRIES = 10000
+
+# Post views are buffered per process and written back as batched
+# F() updates every BLOG_VIEW_COUNT_FLUSH_INTERVAL seconds or
+# BLOG_VIEW_COUNT_FLUSH_THRESHOLD views, whichever comes first; server
+# processes (portfolio.wsgi/asgi) also flush on a timer when idle.
+BLOG_VIEW_COUNT_BUFFERED = True
+BLOG_VIEW_COUNT_FLUSH_INTERVAL = 5
+BLOG_VIEW_COUNT_FLUSH_THRESHOLD = 500
+
+# RSS/Atom feeds (site-wide, per category, per tag) and the sitemap are
+# static files under MEDIA_ROOT/syndication, rewritten by a background
+# thread after each commit that changes a published post (see
+# blog.syndication).
+BLOG_SYNDICATION = {
+    'SITE_URL': 'http://localhost:8000',
+    'TITLE': 'Blog',
+    'ITEMS': 20,
+    'SITEMAP_SHARD_SIZE': 10000,
+}
 import os
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Resized WebP/JPEG copies of every uploaded image, rendered by a process
+# pool after upload (see core.images).
+IMAGE_DERIVATIVE_WIDTHS = (320, 640, 1024, 1600)
+IMAGE_DERIVATIVE_WORKERS = 2
+IMAGE_DERIVATIVE_ASYNC = True
+
@@ -0,0 +1,13 @@
+"""
+ASGI deployment profile, e.g. ``uvicorn portfolio.asgi:application``.
+
+Same as ``portfolio.settings`` except that the public read endpoints are
+routed to their async views (``portfolio.urls_asgi``).
+"""
+from .settings import *  # noqa: F401,F403
+
+ROOT_URLCONF = 'portfolio.urls_asgi'
+
+# Persistent connections are not reliably reused or closed under ASGI; put a
+# pooler in front of the database instead.
+DATABASES['default']['CONN_MAX_AGE'] = 0  # noqa: F405
@@ -0,0 +1,40 @@
+"""
+Production database profile.
+
+SQLite runs in WAL mode with the pragmas from ``core.db.PRAGMAS``, and
+connections are kept open between requests. Read replicas are listed in
+``PORTFOLIO_DB_REPLICAS`` as comma separated SQLite paths, e.g. copies kept
+current with ``sqlite3_rsync`` or Litestream. They become the aliases
+``replica_1``, ``replica_2``, ... in ``DATABASE_REPLICAS``.
+
+``PORTFOLIO_SITE_URL`` is the public origin feed and sitemap links use.
+``PORTFOLIO_METRICS_TOKEN`` is the bearer token Prometheus scrapes with.
+"""
+import os
+
+from core.db import sqlite_options
+
+from .settings import *  # noqa: F401,F403
+
+DATABASES['default'].update(  # noqa: F405
+    NAME=os.environ.get('PORTFOLIO_DB_PATH', DATABASES['default']['NAME']),  # noqa: F405
+    CONN_MAX_AGE=600,
+    CONN_HEALTH_CHECKS=True,
+    OPTIONS=sqlite_options(),
+)
+
+for number, path in enumerate(filter(None, os.environ.get('PORTFOLIO_DB_REPLICAS', '').split(',')), 1):
+    DATABASES[f'replica_{number}'] = {  # noqa: F405
+        **DATABASES['default'],  # noqa: F405
+        'NAME': path.strip(),
+        'OPTIONS': sqlite_options(replica=True),
+        # The test runner points replicas at the test database.
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(f'replica_{number}')  # noqa: F405
+
+if os.environ.get('PORTFOLIO_SITE_URL'):
+    BLOG_SYNDICATION = {**BLOG_SYNDICATION, 'SITE_URL': os.environ['PORTFOLIO_SITE_URL']}  # noqa: F405
+
+if os.environ.get('PORTFOLIO_METRICS_TOKEN'):
+    METRICS = {**METRICS, 'TOKEN': os.environ['PORTFOLIO_METRICS_TOKEN']}  # noqa: F405
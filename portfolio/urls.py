@@ -15,8 +15,11 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
+from blog.views import feed, sitemap_shard, syndication_file
+from core.views import image_derivative
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
@@ -26,8 +29,17 @@ from rest_framework_simplejwt.views import (
 urlpatterns = [
     path("admin/", admin.site.urls),
     path('api/users/', include('users.urls')),
-    path('api/token/', TokenRefreshView.as_view(), name='token_obtain_pair'),
+    path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
 path('api/projects/', include('projects.urls')),
+    path('api/blog/', include('blog.urls')),
+    path('api/core/', include('core.urls')),
+    path('api/contact/', include('contact.urls')),
+    # Missing image derivatives are rendered on first request.
+    path(f"{settings.MEDIA_URL.lstrip('/')}derivatives/<path:name>", image_derivative, name='image-derivative'),
+    # Static blog feeds and sitemaps, regenerated when posts change.
+    path('sitemap.xml', syndication_file, {'name': 'sitemap.xml'}, name='sitemap'),
+    path('sitemap-posts-<int:shard>.xml', sitemap_shard, name='sitemap-shard'),
+    path('feeds/<path:name>', feed, name='feed'),
 
 ]
@@ -0,0 +1,47 @@
+"""
+URL configuration for the ASGI deployment (``portfolio.settings_asgi``).
+
+The public read endpoints are routed to their async views, which serve
+anonymous JSON GETs on the async ORM and hand every other request to the
+DRF view they wrap. Paths and names match ``portfolio.urls``, which handles
+everything else.
+"""
+from django.urls import include, path
+
+from blog.views import (
+    FeaturedPostsView,
+    MyPostsView,
+    PostDetailAsyncView,
+    PostListAsyncView,
+    PostSearchView,
+)
+from core.views import (
+    EducationListAsyncView,
+    ExperienceListAsyncView,
+    ServiceListAsyncView,
+    SiteSettingsAsyncView,
+    SkillListAsyncView,
+    SocialLinkAsyncView,
+    TestimonialListAsyncView,
+)
+
+urlpatterns = [
+    # Blog
+    path('api/blog/posts/', PostListAsyncView.as_view(), name='post-list-create'),
+    # Fixed paths before the slug route, which would otherwise match them.
+    path('api/blog/posts/my-posts/', MyPostsView.as_view(), name='my-posts'),
+    path('api/blog/posts/featured/', FeaturedPostsView.as_view(), name='featured-posts'),
+    path('api/blog/posts/search/', PostSearchView.as_view(), name='post-search'),
+    path('api/blog/posts/<slug:slug>/', PostDetailAsyncView.as_view(), name='post-detail'),
+
+    # Core
+    path('api/core/settings/', SiteSettingsAsyncView.as_view(), name='site-settings'),
+    path('api/core/skills/', SkillListAsyncView.as_view(), name='skill-list'),
+    path('api/core/services/', ServiceListAsyncView.as_view(), name='service-list'),
+    path('api/core/testimonials/', TestimonialListAsyncView.as_view(), name='testimonial-list-create'),
+    path('api/core/experience/', ExperienceListAsyncView.as_view(), name='experience-list'),
+    path('api/core/education/', EducationListAsyncView.as_view(), name='education-list'),
+    path('api/core/social-links/', SocialLinkAsyncView.as_view(), name='social-link-list'),
+
+    path('', include('portfolio.urls')),
+]
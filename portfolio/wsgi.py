@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "portfolio.settings")
 
 application = get_wsgi_application()
+
+# Server processes also write buffered post views back on a timer.
+from blog.view_counter import view_counter  # noqa: E402
+
+view_counter.start_background_flush()
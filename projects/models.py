@@ -2,7 +2,7 @@ from django.db import models
 from users.models import User
 
 class Project(models.Model):
-    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name=True)
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='projects')
     title = models.CharField(max_length=255)
     description = models.TextField()
     image = models.ImageField(upload_to='projects/', blank=True, null=True)
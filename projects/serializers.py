@@ -1,14 +1,16 @@
 from rest_framework import serializers
+from core.fields import ImageSrcsetField
 from .models import Project
 
 
 class ProjectSerializer(serializers.ModelSerializer):
+     image_srcset = ImageSrcsetField(source='image')
+
      class Meta:
           model=Project
-          fields = ['id', 'owner', 'title', 'description', 'link', 'image', 'date_create']
-          read_only_fields = ['id', 'owner', 'data_created']
+          fields = ['id', 'owner', 'title', 'description', 'link', 'image', 'image_srcset']
+          read_only_fields = ['id', 'owner']
 
-          def create(self, validated_data):
-               user = self.context['request'].user
-               project = project.objects.create(owner=user, **validated_data)
-               return project
\ No newline at end of file
+     def create(self, validated_data):
+          validated_data.setdefault('owner', self.context['request'].user)
+          return Project.objects.create(**validated_data)
@@ -1,9 +1,10 @@
 from django.shortcuts import render
 from rest_framework import generics, permissions
+from core.metrics import SerializerTimingMixin
 from .models import Project
 from .serializers import ProjectSerializer
 
-class ProjectListCreateView(generics.ListAPIView):
+class ProjectListCreateView(SerializerTimingMixin, generics.ListAPIView):
     serializer_class = ProjectSerializer
     permission_classes = [permissions.IsAuthenticated]
     def get_queryset(self):
@@ -11,9 +12,9 @@ class ProjectListCreateView(generics.ListAPIView):
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
 
-class ProjectDetailView(generics.RetrieveDestroyAPIView):
+class ProjectDetailView(SerializerTimingMixin, generics.RetrieveDestroyAPIView):
     serializer_class = ProjectSerializer
-    permission_classes = [permissions.isAuthenticated]
+    permission_classes = [permissions.IsAuthenticated]
     def get_queryset(self):
         return Project.objects.filter(owner=self.request.user)
 # Create your views here.
@@ -0,0 +1,134 @@
+"""
+JWT authentication that resolves users from a process-local cache.
+
+Entries are keyed by ``(user id, token_version claim)`` and kept in a
+bounded LRU. Each user also has a stamp in the shared cache that is replaced
+whenever the row is saved or deleted, so a worker notices deactivations,
+password changes and profile edits with a single cache read instead of a
+database query. Misses load the user from the primary, so a replica that
+has not caught up cannot re-cache a deactivated user as active.
+"""
+import copy
+import threading
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from core.db import use_primary
+from .tokens import TOKEN_VERSION_CLAIM
+
+STAMP_KEY_PREFIX = 'users:auth:'
+
+
+def stamp_key(user_id):
+    return f"{STAMP_KEY_PREFIX}{user_id}"
+
+
+class UserCache:
+    def __init__(self, max_entries=None):
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def max_entries(self):
+        if self._max_entries is not None:
+            return self._max_entries
+        return getattr(settings, 'USER_AUTH_CACHE_MAX_ENTRIES', 10000)
+
+    def current_stamp(self, user_id):
+        stamp = cache.get(stamp_key(user_id))
+        if stamp is None:
+            cache.add(stamp_key(user_id), uuid.uuid4().hex, None)
+            stamp = cache.get(stamp_key(user_id))
+        return stamp
+
+    def get(self, user_id, token_version):
+        """Return a private copy of the cached user, or None."""
+        key = (str(user_id), token_version)
+        stamp = self.current_stamp(user_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] == stamp:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                # Views may modify request.user; never hand out the shared instance.
+                return copy.copy(entry[0])
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+        return None
+
+    def set(self, user_id, token_version, user, stamp):
+        with self._lock:
+            self._entries[(str(user_id), token_version)] = (copy.copy(user), stamp)
+            self._entries.move_to_end((str(user_id), token_version))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, user_id):
+        """Publish a new stamp for ``user_id`` and drop this process's entries."""
+        cache.set(stamp_key(user_id), uuid.uuid4().hex, None)
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == str(user_id)]:
+                del self._entries[key]
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
+
+
+user_cache = UserCache()
+
+
+def invalidate_user(user_id):
+    user_cache.invalidate(user_id)
+    # Again once committed, in case another request re-cached the old row meanwhile.
+    transaction.on_commit(lambda: user_cache.invalidate(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken("Token contained no recognizable user identification")
+        # Tokens issued before the claim existed carry version 0.
+        token_version = validated_token.get(TOKEN_VERSION_CLAIM, 0)
+
+        user = user_cache.get(user_id, token_version)
+        if user is not None:
+            return user
+
+        # Read the stamp before the row so a concurrent change invalidates this entry.
+        stamp = user_cache.current_stamp(user_id)
+        with use_primary():
+            user = super().get_user(validated_token)
+        if user.token_version != token_version:
+            raise AuthenticationFailed("Token has been revoked", code='token_revoked')
+        user_cache.set(user_id, token_version, user, stamp)
+        return user
@@ -28,12 +28,19 @@ class User(AbstractBaseUser,PermissionsMixin):
     is_active = models.BooleanField(default=False)
     is_staff = models.BooleanField(default=False)
     date_joined = models.DateTimeField(auto_now_add=True)
+    # Bumped on password change to revoke outstanding JWTs (users.tokens).
+    token_version = models.PositiveIntegerField(default=0, editable=False)
 
     objects = Usermanager()
     
 
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['full_name']
+
+    def set_password(self, raw_password):
+        super().set_password(raw_password)
+        if self.pk is not None:
+            self.token_version += 1
       
     
 # Create your models here.
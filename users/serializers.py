@@ -1,12 +1,15 @@
 from rest_framework import serializers
 from .models import User
 from django.contrib.auth import authenticate
+from core.fields import ImageSrcsetField
 
 # 1️⃣ Serializer for reading user data
 class UserSerializer(serializers.ModelSerializer):
+    profile_picture_srcset = ImageSrcsetField(source='profile_picture')
+
     class Meta:
         model = User
-        fields = ['id', 'email', 'full_name', 'bio', 'profile_picture', 'date_joined']
+        fields = ['id', 'email', 'full_name', 'bio', 'profile_picture', 'profile_picture_srcset', 'date_joined']
 
 # 2️⃣ Serializer for registering a new user
 class RegisterSerializer(serializers.ModelSerializer):
@@ -43,8 +46,10 @@ class LoginSerializer(serializers.Serializer):
         data['user'] = user
         return data
 class UserProfileSerializer(serializers.ModelSerializer):
+    profile_picture_srcset = ImageSrcsetField(source='profile_picture')
+
     class Meta:
         model = User
-        fields = ['email', 'full_name', 'bio', 'profile_picture', 'date_joined']
+        fields = ['email', 'full_name', 'bio', 'profile_picture', 'profile_picture_srcset', 'date_joined']
         read_only_fields = ['email','date_joined']
         profile_picture = serializers.ImageField(required=False, allow_null=True)
\ No newline at end of file
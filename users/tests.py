@@ -1,3 +1,64 @@
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from .authentication import UserCache, user_cache
+from .models import User
+from .tokens import VersionedRefreshToken
+
+
+class CachedAuthenticationTests(TestCase):
+    def setUp(self):
+        user_cache.clear()
+        self.addCleanup(user_cache.clear)
+        self.user = User.objects.create_user(
+            email='reader@example.com', password='secret', full_name='Reader', is_active=True
+        )
+        self.client = APIClient()
+        self.url = reverse('user-profile')
+
+    def authenticate(self, user):
+        token = VersionedRefreshToken.for_user(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def test_repeat_requests_skip_the_user_query(self):
+        self.authenticate(self.user)
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        before = user_cache.stats()
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.json()['email'], 'reader@example.com')
+        self.assertEqual(user_cache.stats()['hits'], before['hits'] + 1)
+
+    def test_deactivation_takes_effect_immediately(self):
+        self.authenticate(self.user)
+        self.client.get(self.url)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_password_change_revokes_existing_tokens(self):
+        self.authenticate(self.user)
+        self.client.get(self.url)
+        self.user.set_password('new secret')
+        self.user.save()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+        self.authenticate(self.user)
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    def test_token_endpoint_issues_versioned_tokens(self):
+        response = self.client.post(
+            reverse('token_obtain_pair'), {'email': 'reader@example.com', 'password': 'secret'}
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.json()['access']}")
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    def test_cache_is_bounded(self):
+        cache = UserCache(max_entries=2)
+        for n in range(3):
+            cache.set(n, 0, self.user, cache.current_stamp(n))
+        self.assertIsNone(cache.get(0, 0))
+        self.assertIsNotNone(cache.get(2, 0))
+        stats = cache.stats()
+        self.assertEqual((stats['entries'], stats['evictions'], stats['hit_rate']), (2, 1, 0.5))
@@ -0,0 +1,18 @@
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer as BaseTokenObtainPairSerializer
+from rest_framework_simplejwt.tokens import RefreshToken
+
+# Copied into every access token; a token whose version no longer matches
+# User.token_version (bumped on password change) is rejected.
+TOKEN_VERSION_CLAIM = 'token_version'
+
+
+class VersionedRefreshToken(RefreshToken):
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token[TOKEN_VERSION_CLAIM] = user.token_version
+        return token
+
+
+class TokenObtainPairSerializer(BaseTokenObtainPairSerializer):
+    token_class = VersionedRefreshToken